@@ -0,0 +1,50 @@
+"""
+Bulk exam-readiness analysis.
+Scores a whole cohort's topic results (CSV, Parquet or Arrow IPC with columns
+student, subject, topic, accuracy, time_taken_avg, attempted) and writes one
+NDJSON readiness report per student.
+Run with: python analyze_readiness.py INPUT --exam-type neet [--format csv|parquet|arrow] [--output FILE]
+"""
+import sys
+import os
+import argparse
+import time
+
+# Ensure imports work
+sys.path.insert(0, os.path.dirname(__file__))
+
+from services.exam_readiness import BULK_FORMATS, EXAM_MAX_MARKS, analyze_bulk, detect_format, read_topic_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("input", help="topic scores file")
+    parser.add_argument("--exam-type", required=True, choices=sorted(EXAM_MAX_MARKS))
+    parser.add_argument("--format", choices=BULK_FORMATS, default=None, help="default: from the file extension")
+    parser.add_argument("--output", default=None, help="default: <input>.readiness.ndjson")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.input)
+    if fmt is None:
+        parser.error(f"cannot tell the format of {args.input}; pass --format")
+    output = args.output or f"{args.input}.readiness.ndjson"
+
+    started = time.perf_counter()
+    try:
+        df = read_topic_scores(args.input, fmt)
+    except ValueError as e:
+        parser.error(str(e))
+    loaded = time.perf_counter()
+    print(f"📥 Loaded {len(df):,} topic rows in {loaded - started:.2f}s")
+
+    students = 0
+    with open(output, "w", encoding="utf-8") as f:
+        for chunk in analyze_bulk(df, args.exam_type):
+            f.write(chunk)
+            students += chunk.count("\n")
+    elapsed = time.perf_counter() - loaded
+    print(f"✅ Wrote {students:,} readiness reports to {output} in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
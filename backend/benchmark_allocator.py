@@ -0,0 +1,98 @@
+"""
+Benchmark: greedy vs optimal plan allocator on random weighted topic sets and
+on many equal-weight topics, with the planner's limits (7 days, 120 min/day,
+3 topics/day, 20-60 min sessions), plus a 500 topics x 30 days scale case
+checked against the optimal allocator's 10 ms/plan target. Reports target
+deviation, minutes used, topics covered, days over budget and time per plan.
+Run with: python benchmark_allocator.py [--instances N] [--seed N]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from services.plan_allocator import ALLOCATORS
+from services.planner_service import (
+    DAILY_MINUTES, MAX_MINUTES_PER_SESSION, MAX_TOPICS_PER_DAY, MIN_MINUTES_PER_SESSION, TOTAL_DAYS,
+)
+
+SCALE_DAYS = 30
+SCALE_TOPICS = 500
+SCALE_TARGET_MS = 10.0
+
+
+def _limits(days: int) -> tuple:
+    return (days, DAILY_MINUTES, MAX_TOPICS_PER_DAY, MIN_MINUTES_PER_SESSION, MAX_MINUTES_PER_SESSION)
+
+
+def _targets(weights, days: int = TOTAL_DAYS):
+    total = sum(weights)
+    return [(f"topic-{i}", days * DAILY_MINUTES * w / total) for i, w in enumerate(weights)]
+
+
+def _families(instances: int, rng: random.Random):
+    """(name, days, cases) for each benchmark family."""
+    yield "random 1-40 topics", TOTAL_DAYS, [
+        _targets([0.05 + rng.random() for _ in range(rng.randint(1, 40))]) for _ in range(instances)
+    ]
+    for topics in (60, 100, 150):
+        yield f"{topics} equal topics", TOTAL_DAYS, [_targets([1.0] * topics)]
+    yield f"{SCALE_TOPICS} random topics x {SCALE_DAYS} days", SCALE_DAYS, [
+        _targets([0.05 + rng.random() for _ in range(SCALE_TOPICS)], SCALE_DAYS)
+        for _ in range(max(instances // 50, 5))
+    ]
+
+
+def _measure(allocate, days: int, cases) -> dict:
+    deviation = minutes = covered = over = 0.0
+    slowest = 0.0
+    started = time.perf_counter()
+    for targets in cases:
+        plan_started = time.perf_counter()
+        schedule = allocate(targets, *_limits(days))
+        slowest = max(slowest, time.perf_counter() - plan_started)
+        scheduled = {}
+        for day in schedule:
+            for slot in day:
+                scheduled[slot.topic] = scheduled.get(slot.topic, 0) + slot.minutes
+            over += sum(slot.minutes for slot in day) > DAILY_MINUTES
+        deviation += sum((scheduled.get(t, 0) - m) ** 2 / m for t, m in targets)
+        minutes += sum(scheduled.values())
+        covered += len(scheduled)
+    elapsed = time.perf_counter() - started
+    n = len(cases)
+    return {
+        "deviation": deviation / n,
+        "minutes": minutes / n,
+        "covered": covered / n,
+        "over": over / n,
+        "ms": elapsed / n * 1000,
+        "max_ms": slowest * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--instances", type=int, default=500, help="random topic sets")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"📐 Budget {TOTAL_DAYS} days x {DAILY_MINUTES} min, {MAX_TOPICS_PER_DAY} topics/day")
+    for family, days, cases in _families(args.instances, random.Random(args.seed)):
+        print(f"\n{family} ({len(cases)} plans)")
+        for name, allocate in ALLOCATORS.items():
+            r = _measure(allocate, days, cases)
+            print(
+                f"  {name:7s}: deviation {r['deviation']:8.1f}  minutes {r['minutes']:6.1f}  "
+                f"topics {r['covered']:5.1f}  days over budget {r['over']:4.2f}  {r['ms']:6.2f} ms/plan"
+            )
+            if days == SCALE_DAYS and name == "optimal":
+                verdict = "✅ within" if r["max_ms"] < SCALE_TARGET_MS else "⚠️  over"
+                print(f"  {verdict} the {SCALE_TARGET_MS:.0f} ms target (slowest plan {r['max_ms']:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
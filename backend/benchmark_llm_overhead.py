@@ -0,0 +1,163 @@
+"""
+Benchmark: per-call overhead of the coach's chat model, against a local
+stand-in for the OpenAI chat completions API (no network, no API key).
+Compares the original path (a ChatOpenAI built for every message), the same
+with a fresh HTTP client per message (how langchain-openai releases before
+the SDK-wide default client behaved), and the shared registry model with its
+pooled client, sequentially and under concurrency. Reports p50/p99 per call
+and the TCP connections the stand-in server accepted. The stand-in speaks
+plain HTTP, so TLS setup (which the pool also saves against the real API) is
+not part of the numbers.
+Run with: python benchmark_llm_overhead.py [--calls N] [--concurrency N] [--latency-ms MS]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import Settings
+from services.llm_registry import OPENAI_CHAT_MODEL, _registry
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": OPENAI_CHAT_MODEL,
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "Revise algebra first."},
+                 "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 12, "completion_tokens": 4, "total_tokens": 16},
+}).encode()
+
+
+class _StandInServer(ThreadingHTTPServer):
+    """OpenAI-compatible /v1/chat/completions that answers after latency_ms and counts connections."""
+
+    daemon_threads = True
+
+    def __init__(self, latency_ms: float):
+        super().__init__(("127.0.0.1", 0), _CompletionHandler)
+        self.latency_ms = latency_ms
+        self.connections = 0
+        self._count_lock = threading.Lock()
+
+    def get_request(self):
+        with self._count_lock:
+            self.connections += 1
+        return super().get_request()
+
+
+class _CompletionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    disable_nagle_algorithm = True  # headers and body go out separately
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.path != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        time.sleep(self.server.latency_ms / 1000)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(COMPLETION)))
+        self.end_headers()
+        self.wfile.write(COMPLETION)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _per_message_llm(base_url: str, http_client=None):
+    """What agent_service._get_llm did on every message before the registry."""
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=OPENAI_CHAT_MODEL, openai_api_key="benchmark-fake", base_url=base_url,
+                      temperature=0.7, http_async_client=http_client)
+
+
+async def _ask(llm, i: int) -> None:
+    response = await llm.ainvoke(f"What should I study next? ({i})")
+    assert response.content == "Revise algebra first."
+
+
+async def _run(call, calls: int, concurrency: int) -> list:
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int):
+        async with slots:
+            started = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one(i) for i in range(calls)))
+    return latencies
+
+
+async def _bench(server, base_url: str, args) -> None:
+    import httpx
+
+    async def model_per_message(i):
+        await _ask(_per_message_llm(base_url), i)
+
+    async def client_per_message(i):
+        async with httpx.AsyncClient(timeout=60.0) as http_client:
+            await _ask(_per_message_llm(base_url, http_client), i)
+
+    async def shared_registry(i):
+        await _ask(_registry.llm, i)
+
+    # Built once inside the loop that uses it, and warmed up, as the app lifespan does
+    _registry.swap(Settings(LLM_PROVIDER="openai", OPENAI_API_KEY="benchmark-fake", OPENAI_BASE_URL=base_url))
+    await _ask(_registry.llm, -1)
+    try:
+        for concurrency in args.concurrency:
+            print(f"\n{concurrency} concurrent call(s)")
+            for name, call in (
+                ("model per message", model_per_message),
+                ("model + client per message", client_per_message),
+                ("shared registry", shared_registry),
+            ):
+                before = server.connections
+                started = time.perf_counter()
+                latencies = await _run(call, args.calls, concurrency)
+                elapsed = time.perf_counter() - started
+                ms = np.asarray(latencies) * 1000
+                print(f"  {name:26s}: p50 {np.percentile(ms, 50):7.2f} ms  p99 {np.percentile(ms, 99):7.2f} ms  "
+                      f"overhead p50 {np.percentile(ms, 50) - args.latency_ms:6.2f} ms  "
+                      f"{args.calls / elapsed:7.1f} calls/s  {server.connections - before:4d} connections")
+    finally:
+        await _registry.http_client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=300, help="calls per path and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="stand-in server response time")
+    args = parser.parse_args()
+
+    try:
+        import langchain_openai  # noqa: F401
+    except ImportError:
+        sys.exit("❌ langchain-openai is not installed (pip install -r requirements.txt)")
+
+    server = _StandInServer(args.latency_ms)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    print(f"🤖 Stand-in OpenAI API at {base_url}, {args.latency_ms:.0f} ms per completion, {args.calls} calls per run")
+    try:
+        asyncio.run(_bench(server, base_url, args))
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Benchmark: planner resource lookups. Compares the original linear keyword scan
+over MOCK_RESOURCES with the compiled keyword trie (uncached and memoized) on
+a mix of catalog and off-catalog topics, then times whole plans laid out by
+build_plan_days the old way (one lookup per session, linear scan) and the
+current way (one memoized lookup per distinct topic per plan).
+Run with: python benchmark_planner_resources.py [--lookups N] [--plans N] [--topics N]
+"""
+import sys
+import os
+import argparse
+import random
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Measure the curated catalog, not the offline vector index in front of it
+os.environ["LOCAL_INDEX_ENABLED"] = "false"
+
+from services import pinecone_service, planner_service
+from services.pinecone_service import DEFAULT_RESOURCES, MOCK_RESOURCES
+
+TOPIC_WORDS = ["Algebra", "Linear Algebra", "Calculus I", "Statistics", "Probability Theory", "Newton's Laws",
+               "Organic Chemistry", "Thermodynamics", "Cell Biology", "World History", "Digital Marketing",
+               "Contract Law", "Ecology", "Python Programming", "Cybersecurity Basics", "Microeconomics"]
+
+
+def _linear_scan(topic: str, top_k: int = 5):
+    """The lookup the planner used before the keyword trie."""
+    topic_lower = topic.lower()
+    for key, resources in MOCK_RESOURCES.items():
+        if key in topic_lower or topic_lower in key:
+            return resources[:top_k]
+    for key, resources in MOCK_RESOURCES.items():
+        words = key.split()
+        if any(w in topic_lower for w in words):
+            return resources[:top_k]
+    return DEFAULT_RESOURCES[:top_k]
+
+
+def _trie_uncached(topic: str, top_k: int = 5):
+    key = pinecone_service._match_catalog_key(topic.lower())
+    resources = MOCK_RESOURCES[key] if key is not None else DEFAULT_RESOURCES
+    return resources[:top_k]
+
+
+def _topics(n: int, rng: random.Random):
+    return [f"{rng.choice(TOPIC_WORDS)} {'unit ' + str(rng.randint(1, 9)) if rng.random() < 0.5 else ''}".strip()
+            for _ in range(n)]
+
+
+class _NoMemo(dict):
+    """A resource memo that never remembers: every session resolves its topic again."""
+
+    def __contains__(self, key):
+        return False
+
+
+def _time_lookups(lookup, topics) -> float:
+    started = time.perf_counter()
+    for topic in topics:
+        lookup(topic, 3)
+    return (time.perf_counter() - started) / len(topics) * 1e6
+
+
+def _time_plans(plans, lookup, memo_factory) -> tuple:
+    calls = 0
+    in_lookups = 0.0
+
+    def counting(topic, top_k=5):
+        nonlocal calls, in_lookups
+        calls += 1
+        started = time.perf_counter()
+        try:
+            return lookup(topic, top_k)
+        finally:
+            in_lookups += time.perf_counter() - started
+
+    original = planner_service.retrieve_resources_sync
+    planner_service.retrieve_resources_sync = counting
+    try:
+        started = time.perf_counter()
+        for weighted in plans:
+            planner_service.build_plan_days(weighted, date.today(), memo_factory())
+        elapsed = time.perf_counter() - started
+    finally:
+        planner_service.retrieve_resources_sync = original
+    n = len(plans)
+    return elapsed / n * 1000, in_lookups / n * 1000, calls / n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=100000)
+    parser.add_argument("--plans", type=int, default=500)
+    parser.add_argument("--topics", type=int, default=20, help="weak topics per plan")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    topics = _topics(args.lookups, rng)
+    mismatches = [t for t in set(topics) if _linear_scan(t) != _trie_uncached(t)]
+    assert not mismatches, f"trie disagrees with the linear scan on {mismatches[:5]}"
+
+    print(f"🔎 {args.lookups:,} topic lookups ({len(set(topics))} distinct), same results from every path")
+    for name, lookup in (
+        ("linear scan", _linear_scan),
+        ("keyword trie", _trie_uncached),
+        ("trie + memo", pinecone_service._get_mock_resources),
+    ):
+        print(f"  {name:12s}: {_time_lookups(lookup, topics):7.2f} µs/lookup")
+
+    plans = []
+    for _ in range(args.plans):
+        chosen = list(dict.fromkeys(rng.sample(_topics(args.topics * 4, rng), args.topics)))
+        weights = [0.1 + rng.random() for _ in chosen]
+        total = sum(weights)
+        plans.append([
+            {"topic": t, "weight": w / total, "weakness_score": rng.random()}
+            for t, w in zip(chosen, weights)
+        ])
+
+    print(f"\n📅 {args.plans} plans, up to {args.topics} topics each ({planner_service.TOTAL_DAYS} days)")
+    for name, lookup, memo in (
+        ("per session, linear", _linear_scan, _NoMemo),
+        ("per topic, trie+memo", pinecone_service.retrieve_resources_sync, dict),
+    ):
+        ms, lookup_ms, calls = _time_plans(plans, lookup, memo)
+        print(f"  {name:20s}: {ms:6.3f} ms/plan ({lookup_ms:6.3f} ms in lookups)  {calls:5.1f} lookups/plan")
+
+
+if __name__ == "__main__":
+    main()
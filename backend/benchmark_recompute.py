@@ -0,0 +1,131 @@
+"""
+Benchmark: the bulk weakness recompute on a synthetic attempt log in a
+throwaway SQLite database. Generates --answers submitted answers (tests of
+--questions questions over 12 topics, spread over a year), then runs
+recompute_weakness once per --workers value and reports answers/s.
+Run with: python benchmark_recompute.py [--answers N] [--questions N] [--workers 1 4]
+"""
+import sys
+import os
+import argparse
+import atexit
+import json
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# A throwaway database, chosen before config is imported (pool workers inherit it)
+_tmp = tempfile.mkdtemp(prefix="bench-recompute-")
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+
+from sqlalchemy import insert
+
+from database import SessionLocal, init_db
+from models import Domain, MockTest, Question, StudentAttempt, Subject, TopicPerformance
+from services.weakness_recompute import recompute_weakness
+
+TESTS = 20
+TOPICS = 12
+ATTEMPTS_PER_STUDENT = 20
+INSERT_BATCH = 5000
+
+
+def _make_tests(db, questions: int, rng: random.Random) -> dict:
+    """{test_id: [question ids]}"""
+    domain = Domain(name="bench")
+    db.add(domain)
+    db.flush()
+    subject = Subject(name="bench", domain_id=domain.id)
+    db.add(subject)
+    db.flush()
+    tests = {}
+    for t in range(TESTS):
+        test = MockTest(name=f"bench-{t}", subject_id=subject.id, difficulty="medium")
+        db.add(test)
+        db.flush()
+        rows = []
+        for i in range(questions):
+            q = Question(test_id=test.id, text=f"q{i}", correct_answer=rng.randint(0, 3),
+                         topic=f"Topic {(t + i) % TOPICS}", order_num=i)
+            q.set_options(["a", "b", "c", "d"])
+            rows.append(q)
+        db.add_all(rows)
+        db.flush()
+        tests[test.id] = [q.id for q in rows]
+    db.commit()
+    return tests
+
+
+def _make_attempts(db, tests: dict, attempts: int, rng: random.Random) -> None:
+    start = datetime.utcnow() - timedelta(days=365)
+    test_ids = list(tests)
+    batch = []
+    for n in range(attempts):
+        test_id = rng.choice(test_ids)
+        answers = {str(qid): rng.randint(0, 3) for qid in tests[test_id]}
+        batch.append({
+            "student_id": f"student-{n // ATTEMPTS_PER_STUDENT:07d}",
+            "test_id": test_id,
+            "answers": json.dumps(answers),
+            "score": 0,
+            "total": len(answers),
+            "completed": True,
+            "created_at": start + timedelta(seconds=rng.randint(0, 365 * 86400)),
+        })
+        if len(batch) >= INSERT_BATCH:
+            db.execute(insert(StudentAttempt), batch)
+            batch = []
+    if batch:
+        db.execute(insert(StudentAttempt), batch)
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--answers", type=int, default=1_000_000, help="submitted answers in the log (10M: pass 10000000)")
+    parser.add_argument("--questions", type=int, default=50, help="questions per test")
+    parser.add_argument("--workers", type=int, nargs="+", default=sorted({1, os.cpu_count() or 1}))
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    init_db()
+    rng = random.Random(args.seed)
+    attempts = max(1, args.answers // args.questions)
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        tests = _make_tests(db, args.questions, rng)
+        _make_attempts(db, tests, attempts, rng)
+    finally:
+        db.close()
+    students = -(-attempts // ATTEMPTS_PER_STUDENT)
+    print(f"🧪 Synthetic log: {attempts:,} attempts x {args.questions} questions = {attempts * args.questions:,} "
+          f"answers, {students:,} students (generated in {time.perf_counter() - started:.1f}s)")
+
+    for workers in args.workers:
+        print(f"\n🔄 {workers} worker(s)")
+        totals = recompute_weakness(
+            workers=workers,
+            n_shards=workers * 4,
+            chunk_size=args.chunk_size,
+            checkpoint_path=os.path.join(_tmp, "recompute.checkpoint.json"),
+            restart=True,
+        )
+        db = SessionLocal()
+        try:
+            rows = db.query(TopicPerformance).count()
+        finally:
+            db.close()
+        answers_per_second = totals["attempts"] * args.questions / max(totals["seconds"], 1e-9)
+        print(f"✅ {workers} worker(s): {totals['attempts']:,} attempts → {rows:,} rows in {totals['seconds']}s "
+              f"({answers_per_second:,.0f} answers/s)")
+
+
+if __name__ == "__main__":
+    main()
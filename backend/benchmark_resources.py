@@ -0,0 +1,166 @@
+"""
+Benchmark: resource retrieval with Pinecone configured, against a local fake
+index and embedder with injected latency (no network, no API keys). Reports
+p50/p99 of retrieve_resources for embedding-cache misses, in-memory hits and
+on-disk hits (a fresh process), then build time and query p50/p99 of the
+offline local index on a synthetic corpus.
+Run with: python benchmark_resources.py [--topics N] [--embed-ms MS] [--query-ms MS] [--resources N]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+import zlib
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import settings
+from services import embedding_cache, pinecone_service
+from services.embedding_cache import EmbeddingCache
+from services.local_index import build_index, load_index
+
+DIM = 384
+SUBJECTS = ["Organic Chemistry", "Thermodynamics", "Linear Algebra", "Probability", "World History",
+            "Cell Biology", "Microeconomics", "Electromagnetism", "Statistics", "Contract Law"]
+
+
+class FakeEmbeddings:
+    """Deterministic embedder that takes embed_ms per call, like a remote embedding API."""
+
+    model = "fake-embedding"
+
+    def __init__(self, embed_ms: float):
+        self.embed_ms = embed_ms
+        self.calls = 0
+
+    def embed_query(self, text):
+        self.calls += 1
+        time.sleep(self.embed_ms / 1000)
+        rng = np.random.default_rng(zlib.crc32(text.encode()))
+        vector = rng.standard_normal(DIM).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def embed_documents(self, texts):
+        return [self.embed_query(t) for t in texts]
+
+
+class FakeIndex:
+    """Brute-force cosine search over random vectors, plus query_ms of network time."""
+
+    def __init__(self, resources: int, query_ms: float):
+        rng = np.random.default_rng(0)
+        vectors = rng.standard_normal((resources, DIM)).astype(np.float32)
+        self.vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        self.query_ms = query_ms
+
+    def query(self, vector, top_k, include_metadata=True):
+        time.sleep(self.query_ms / 1000)
+        scores = self.vectors @ np.asarray(vector, dtype=np.float32)
+        best = np.argsort(-scores)[:top_k]
+        return {"matches": [
+            {"score": float(scores[i]), "metadata": {"title": f"Resource {i}", "url": f"https://example.com/{i}"}}
+            for i in best
+        ]}
+
+
+def _percentiles(latencies) -> str:
+    ms = np.asarray(latencies) * 1000
+    return f"p50 {np.percentile(ms, 50):7.2f} ms  p99 {np.percentile(ms, 99):7.2f} ms"
+
+
+async def _retrieve_all(topics):
+    latencies = []
+    for topic in topics:
+        started = time.perf_counter()
+        items = await pinecone_service.retrieve_resources(topic, top_k=3)
+        latencies.append(time.perf_counter() - started)
+        assert items and items[0].title.startswith("Resource ")
+    return latencies
+
+
+def _bench_pinecone(args, tmp: str) -> None:
+    embedder = FakeEmbeddings(args.embed_ms)
+    settings.PINECONE_API_KEY = "benchmark-fake"
+    clients = pinecone_service._clients
+    clients.index = FakeIndex(args.index_size, args.query_ms)
+    clients.embed_model = embedder
+    clients.model_name = pinecone_service._embedding_model_name(embedder)
+    clients.ready = True
+
+    disk_path = os.path.join(tmp, "embedding_cache.db")
+    embedding_cache._cache = EmbeddingCache(settings.EMBEDDING_CACHE_SIZE, disk_path)
+    topics = [f"{random.choice(SUBJECTS)} {i}" for i in range(args.topics)]
+
+    print(f"🌲 Pinecone path: fake embedder {args.embed_ms:.0f} ms, fake index {args.query_ms:.0f} ms "
+          f"over {args.index_size} vectors, {args.topics} topics")
+    misses = asyncio.run(_retrieve_all(topics))
+    memory_hits = asyncio.run(_retrieve_all(random.sample(topics, len(topics))))
+    # A new worker: empty memory tier, same on-disk store
+    embedding_cache._cache.store.close()
+    embedding_cache._cache = EmbeddingCache(settings.EMBEDDING_CACHE_SIZE, disk_path)
+    disk_hits = asyncio.run(_retrieve_all(topics))
+    embedding_cache._cache.store.close()
+
+    print(f"  miss (embed + query): {_percentiles(misses)}")
+    print(f"  memory hit (query):   {_percentiles(memory_hits)}")
+    print(f"  disk hit (query):     {_percentiles(disk_hits)}")
+    print(f"  embedding calls: {embedder.calls} for {3 * args.topics} lookups")
+
+
+def _bench_local_index(args, tmp: str) -> None:
+    corpus = os.path.join(tmp, "resources.jsonl")
+    rng = random.Random(1)
+    with open(corpus, "w") as f:
+        for i in range(args.resources):
+            subject = rng.choice(SUBJECTS)
+            f.write(json.dumps({
+                "title": f"{subject} guide {i}",
+                "description": f"Worked examples and notes on {subject.lower()} part {i % 97}",
+                "tags": subject.lower(),
+            }) + "\n")
+
+    index_dir = os.path.join(tmp, "index")
+    started = time.perf_counter()
+    build_index(corpus, index_dir, settings.LOCAL_INDEX_DIM)
+    build_seconds = time.perf_counter() - started
+
+    index = load_index(corpus, index_dir, settings.LOCAL_INDEX_DIM)
+    try:
+        latencies = []
+        for i in range(args.topics):
+            query = f"{rng.choice(SUBJECTS)} practice {i}"
+            started = time.perf_counter()
+            index.search(query, top_k=3)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        index.close()
+
+    print(f"\n📚 Local index: {args.resources} resources, {settings.LOCAL_INDEX_DIM} dims")
+    print(f"  build: {build_seconds:.2f}s ({args.resources / build_seconds:,.0f} resources/s)")
+    print(f"  query: {_percentiles(latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--topics", type=int, default=200, help="distinct topics looked up")
+    parser.add_argument("--embed-ms", type=float, default=40.0, help="fake embedding API latency")
+    parser.add_argument("--query-ms", type=float, default=15.0, help="fake Pinecone query latency")
+    parser.add_argument("--index-size", type=int, default=20000, help="vectors in the fake Pinecone index")
+    parser.add_argument("--resources", type=int, default=50000, help="local index corpus size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    with tempfile.TemporaryDirectory(prefix="bench-resources-") as tmp:
+        _bench_pinecone(args, tmp)
+        _bench_local_index(args, tmp)
+
+
+if __name__ == "__main__":
+    main()
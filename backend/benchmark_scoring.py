@@ -0,0 +1,128 @@
+"""
+Benchmark: scoring one attempt with the compiled answer key vs the original
+ORM path (load every Question row, score in Python), on 50-, 200- and
+1000-question tests in a throwaway SQLite database. Reports p50/p99 latency
+and the peak memory allocated per attempt (tracemalloc).
+Run with: python benchmark_scoring.py [--attempts N] [--sizes 50 200 1000]
+"""
+import sys
+import os
+import argparse
+import atexit
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# A throwaway database, chosen before config is imported
+_tmp = tempfile.mkdtemp(prefix="bench-scoring-")
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'bench.db')}"
+
+import numpy as np
+
+from database import SessionLocal, init_db
+from models import MockTest, Question, Subject, Domain
+from services.answer_key import get_answer_key
+
+
+def _score_orm(db, test_id: int, answers: dict) -> dict:
+    """The scoring loop submit_attempt used before answer keys."""
+    questions = db.query(Question).filter(Question.test_id == test_id).all()
+    score = 0
+    correct_ids, incorrect_ids = [], []
+    topic_breakdown = {}
+    for q in questions:
+        submitted = answers.get(str(q.id))
+        is_correct = submitted is not None and submitted == q.correct_answer
+        if is_correct:
+            score += 1
+            correct_ids.append(q.id)
+        else:
+            incorrect_ids.append(q.id)
+        stats = topic_breakdown.setdefault(q.topic, {"correct": 0, "total": 0})
+        stats["total"] += 1
+        stats["correct"] += is_correct
+    return {"score": score, "total": len(questions), "correct_questions": correct_ids,
+            "incorrect_questions": incorrect_ids, "topic_breakdown": topic_breakdown}
+
+
+def _score_key(db, test_id: int, answers: dict) -> dict:
+    return get_answer_key(db, test_id).score(answers)
+
+
+def _make_test(size: int, rng: random.Random) -> tuple:
+    db = SessionLocal()
+    try:
+        domain = Domain(name=f"bench-{size}")
+        db.add(domain)
+        db.flush()
+        subject = Subject(name=f"bench-{size}", domain_id=domain.id)
+        db.add(subject)
+        db.flush()
+        test = MockTest(name=f"bench-{size}", subject_id=subject.id, difficulty="medium")
+        db.add(test)
+        db.flush()
+        questions = []
+        for i in range(size):
+            q = Question(
+                test_id=test.id, text=f"Question {i}: " + "lorem ipsum " * 20, correct_answer=rng.randint(0, 3),
+                topic=f"Topic {i % 12}", explanation="Because " + "reasons " * 30, order_num=i,
+            )
+            q.set_options([f"option {j} " * 5 for j in range(4)])
+            questions.append(q)
+        db.add_all(questions)
+        db.commit()
+        return test.id, [q.id for q in questions]
+    finally:
+        db.close()
+
+
+def _measure(score, test_id: int, answer_sets: list) -> dict:
+    latencies = []
+    peaks = []
+    for answers in answer_sets:
+        db = SessionLocal()  # a fresh session per attempt, as each request gets
+        try:
+            tracemalloc.start()
+            started = time.perf_counter()
+            score(db, test_id, answers)
+            latencies.append(time.perf_counter() - started)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        finally:
+            db.close()
+    ms = np.asarray(latencies) * 1000
+    return {"p50": np.percentile(ms, 50), "p99": np.percentile(ms, 99), "kib": np.median(peaks) / 1024}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--attempts", type=int, default=200, help="attempts scored per test and path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 1000], help="questions per test")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    init_db()
+    rng = random.Random(args.seed)
+    print(f"📝 {args.attempts} attempts per test, fresh session per attempt (latency includes tracemalloc overhead)")
+    for size in args.sizes:
+        test_id, question_ids = _make_test(size, rng)
+        answer_sets = [{str(qid): rng.randint(0, 3) for qid in question_ids} for _ in range(args.attempts)]
+        db = SessionLocal()
+        try:
+            assert _score_key(db, test_id, answer_sets[0]) == _score_orm(db, test_id, answer_sets[0])
+        finally:
+            db.close()
+
+        print(f"\n{size} questions")
+        for name, score in (("orm", _score_orm), ("answer key", _score_key)):
+            r = _measure(score, test_id, answer_sets)
+            print(f"  {name:10s}: p50 {r['p50']:7.3f} ms  p99 {r['p99']:7.3f} ms  peak {r['kib']:8.1f} KiB/attempt")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""
+Build the offline resource index from the JSONL corpus.
+The API also builds it on first use; run this after editing the corpus or to
+index a large corpus ahead of deployment.
+Run with: python build_resource_index.py [--corpus FILE] [--out DIR] [--dim N]
+"""
+import sys
+import os
+import argparse
+import time
+
+# Ensure imports work
+sys.path.insert(0, os.path.dirname(__file__))
+
+from config import settings
+from services.local_index import build_index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", default=settings.RESOURCE_CORPUS_PATH)
+    parser.add_argument("--out", default=settings.LOCAL_INDEX_DIR)
+    parser.add_argument("--dim", type=int, default=settings.LOCAL_INDEX_DIM, help="hashed feature dimensions")
+    args = parser.parse_args()
+
+    print(f"📚 Indexing {args.corpus} ({args.dim} dims)...")
+    started = time.perf_counter()
+    count = build_index(args.corpus, args.out, args.dim)
+    print(f"✅ Indexed {count} resources into {args.out} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,70 @@ from typing import List
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./learning.db"
+    DB_ASYNC: bool = False  # True = AsyncSession (aiosqlite / asyncpg) for the async routers
+    DB_ASYNC_SQLITE_POOL_SIZE: int = 1  # async sessions open at once on SQLite (one writer)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    # SQLite PRAGMAs applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers no longer block on writers
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # durable in WAL mode, fsync only at checkpoints
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB, i.e. 64 MiB page cache
     PINECONE_API_KEY: str = ""
     PINECONE_INDEX_NAME: str = "learning-resources"
+    EMBEDDING_CACHE_SIZE: int = 4096  # query embeddings kept in memory
+    EMBEDDING_CACHE_PATH: str = "./embedding_cache.db"  # on-disk tier; empty = memory only
+    # Offline resource search when Pinecone is not configured (services.local_index)
+    LOCAL_INDEX_ENABLED: bool = True
+    RESOURCE_CORPUS_PATH: str = "./data/resources.jsonl"
+    LOCAL_INDEX_DIR: str = "./data/resource_index"  # built from the corpus on first use
+    LOCAL_INDEX_DIM: int = 512
+    LOCAL_INDEX_MIN_SCORE: float = 0.25  # below this cosine, fall back to the mock catalog
+    RESOURCE_BATCH_CONCURRENCY: int = 8  # parallel lookups per POST /resources/batch
     LLM_PROVIDER: str = "gemini"  # "gemini" or "openai"
     GEMINI_API_KEY: str = ""
     OPENAI_API_KEY: str = ""
+    OPENAI_BASE_URL: str = ""  # OpenAI-compatible endpoint override (proxy, local stand-in)
+    # Shared chat model (services.llm_registry)
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE: int = 20
+    LLM_WARMUP: bool = True  # send one tiny prompt at startup to open the connection
+    LLM_WARMUP_TIMEOUT_SECONDS: float = 10.0
+    # Admission control for LLM calls (services.llm_gate)
+    LLM_MAX_CONCURRENCY: int = 16  # provider calls in flight per process
+    LLM_MAX_QUEUE: int = 64  # calls waiting for a slot; beyond this → 429
+    LLM_MAX_PER_STUDENT: int = 0  # slots + queue places per student; 0 = no cap
+    LLM_RETRY_AFTER_SECONDS: int = 2
+    CONTEXT_CACHE_SIZE: int = 4096  # rendered coach-prompt contexts (students)
+    CONTEXT_CACHE_TTL_SECONDS: int = 300  # entries are version-checked on read; the TTL only bounds memory
+    # Server-side coach memory (services.conversation_service)
+    CHAT_MEMORY_TURNS: int = 4  # most recent exchanges kept verbatim in the prompt
+    CHAT_SUMMARY_BATCH: int = 4  # older exchanges folded into the summary at a time
+    CHAT_SUMMARY_MAX_CHARS: int = 1200
+    # AI coach answers (services.coach_cache); only history-free turns are cached
+    COACH_CACHE_SIZE: int = 2048
+    COACH_CACHE_TTL_SECONDS: int = 3600
+    COACH_SEMANTIC_CACHE: bool = False  # also reuse answers to near-duplicate questions
+    COACH_SEMANTIC_THRESHOLD: float = 0.9  # cosine between hashed TF-IDF message vectors
+    CONTENT_VERSION_CHECK_SECONDS: float = 1.0  # how stale another process's content write can look
     CORS_ORIGINS: str = "http://localhost:3000"
+    QUESTION_CACHE_SIZE: int = 512  # tests
+    QUESTION_CACHE_TTL_SECONDS: int = 300
+    ANSWER_KEY_CACHE_SIZE: int = 1024  # tests
+    ANSWER_KEY_CACHE_TTL_SECONDS: int = 300
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    # Time-decayed weakness: an answer's weight halves every half-life.
+    # Accumulators grow as 2^((t - epoch) / half-life); move the epoch forward
+    # (and run recompute_weakness) if the half-life is made very short.
+    WEAKNESS_HALF_LIFE_DAYS: float = 30.0
+    WEAKNESS_DECAY_EPOCH: str = "2024-01-01"
+    # init_db backfills the decayed columns of an upgraded database inline only
+    # up to this many attempts; larger logs are left to recompute_weakness.py
+    WEAKNESS_BACKFILL_MAX_ATTEMPTS: int = 50000
+    PLANNER_ALLOCATOR: str = "optimal"  # "optimal" or "greedy" (see services.plan_allocator)
+    PLAN_DAY_UTC_OFFSET_MINUTES: int = 0  # plan days start at midnight in this UTC offset (e.g. 330 for IST)
 
     @property
     def cors_origins_list(self) -> List[str]:
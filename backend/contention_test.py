@@ -0,0 +1,179 @@
+"""
+Contention test: analytics reads while submissions stream in, on SQLite with
+the previous engine settings (rollback journal, synchronous=FULL, no busy
+timeout) and with the tuned ones from config (WAL, synchronous=NORMAL,
+busy_timeout, mmap and page cache). Each run gets a fresh copy of the
+DATABASE_URL file (run seed.py first) and its own uvicorn server; "database
+is locked" errors are counted from the server log.
+Run with: python contention_test.py [--seconds N] [--writers N] [--readers N] [--configs baseline tuned]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import sqlite3
+import subprocess
+import tempfile
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import settings
+
+STUDENTS = [f"contention-{i}" for i in range(50)]
+
+# Engine settings per run; "baseline" is what database.py used before it applied PRAGMAs
+CONFIGS = {
+    "baseline": {
+        "SQLITE_JOURNAL_MODE": "DELETE",
+        "SQLITE_SYNCHRONOUS": "FULL",
+        "SQLITE_BUSY_TIMEOUT_MS": "0",
+        "SQLITE_MMAP_SIZE": "0",
+        "SQLITE_CACHE_SIZE": "-2000",
+    },
+    "tuned": {},  # config defaults
+}
+
+
+def _copy_database(source: str, target: str) -> None:
+    """Copy through the backup API so pages still in a WAL file come along."""
+    src = sqlite3.connect(source)
+    dst = sqlite3.connect(target)
+    try:
+        src.backup(dst)
+    finally:
+        dst.close()
+        src.close()
+
+
+def _start_server(db_path: str, overrides: dict, port: int, log) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        **overrides,
+        "DATABASE_URL": f"sqlite:///{db_path}",
+        "DB_ASYNC": "false",
+        "LLM_WARMUP": "false",
+    }
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+        stdout=log,
+        stderr=subprocess.STDOUT,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline and server.poll() is None:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+def _percentile(latencies: list, q: float) -> float:
+    if not latencies:
+        return 0.0
+    latencies = sorted(latencies)
+    return latencies[min(int(len(latencies) * q), len(latencies) - 1)] * 1000
+
+
+async def _run_load(server, base_url: str, test_id: int, seconds: float, writers: int, readers: int) -> dict:
+    concurrency = writers + readers
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await _wait_ready(client, server)
+        response = await client.get(f"/questions/{test_id}")
+        if response.status_code != 200:
+            raise RuntimeError(f"test {test_id} has no questions (run seed.py first)")
+        questions = response.json()
+
+        stats = {kind: {"latencies": [], "errors": 0} for kind in ("submit", "analytics")}
+        deadline = time.perf_counter() + seconds
+
+        def submit():
+            answers = {str(q["id"]): random.randint(0, 3) for q in questions}
+            student = random.choice(STUDENTS)
+            return client.post("/submit_attempt", json={"student_id": student, "test_id": test_id, "answers": answers})
+
+        def analytics():
+            return client.get(f"/analytics/{random.choice(STUDENTS)}")
+
+        async def worker(kind: str, request):
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                try:
+                    failed = (await request()).status_code >= 400
+                except httpx.TransportError:
+                    failed = True
+                stats[kind]["latencies"].append(time.perf_counter() - started)
+                stats[kind]["errors"] += failed
+
+        await asyncio.gather(
+            *(worker("submit", submit) for _ in range(writers)),
+            *(worker("analytics", analytics) for _ in range(readers)),
+        )
+
+    return {
+        kind: {
+            "per_second": len(s["latencies"]) / seconds,
+            "p50_ms": _percentile(s["latencies"], 0.5),
+            "p95_ms": _percentile(s["latencies"], 0.95),
+            "errors": s["errors"],
+        }
+        for kind, s in stats.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0, help="load duration per config")
+    parser.add_argument("--writers", type=int, default=8, help="concurrent submitters")
+    parser.add_argument("--readers", type=int, default=32, help="concurrent analytics readers")
+    parser.add_argument("--configs", nargs="+", choices=list(CONFIGS), default=list(CONFIGS))
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--test-id", type=int, default=1)
+    args = parser.parse_args()
+
+    url = settings.DATABASE_URL
+    if not url.startswith("sqlite:///"):
+        parser.error("DATABASE_URL must be a SQLite file")
+    source = url[len("sqlite:///"):]
+
+    print(f"🏋️  {args.writers} submitters + {args.readers} analytics readers for {args.seconds:.0f}s per config")
+    for name in args.configs:
+        with tempfile.TemporaryDirectory(prefix="contention-") as tmp:
+            db_path = os.path.join(tmp, "learning.db")
+            _copy_database(source, db_path)
+            log_path = os.path.join(tmp, "server.log")
+            with open(log_path, "w") as log:
+                server = _start_server(db_path, CONFIGS[name], args.port, log)
+                try:
+                    result = asyncio.run(_run_load(
+                        server, f"http://127.0.0.1:{args.port}", args.test_id,
+                        args.seconds, args.writers, args.readers,
+                    ))
+                finally:
+                    server.terminate()
+                    server.wait()
+            with open(log_path) as log:
+                # One SQLAlchemy line per failed statement (the chained sqlite3 one is skipped)
+                locked = sum("OperationalError) database is locked" in line for line in log)
+
+        print(f"\n{name}: {locked} 'database is locked' errors")
+        for kind, r in result.items():
+            print(
+                f"  {kind:9s}: {r['per_second']:7.1f} req/s  p50 {r['p50_ms']:7.1f} ms  "
+                f"p95 {r['p95_ms']:7.1f} ms  errors {r['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
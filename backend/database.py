@@ -1,21 +1,113 @@
 """
 Database configuration module.
-Handles SQLite engine creation and session management.
+Handles engine creation (tuned SQLite PRAGMAs, pool sizing) and session management.
+Set DB_ASYNC=true to serve the hot routers from an AsyncSession instead
+of the sync session + threadpool.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, literal, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from starlette.concurrency import run_in_threadpool
 from config import settings
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Required for SQLite
-)
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+
+def _is_sqlite_memory(url: str) -> bool:
+    path = url.split("?")[0].split("://", 1)[-1]
+    return path in ("", "/", "/:memory:")
+
+
+def _sqlite_pragmas() -> dict:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+    }
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in _sqlite_pragmas().items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+
+def _engine_kwargs(url: str) -> dict:
+    kwargs: dict = {}
+    if _is_sqlite(url):
+        kwargs["connect_args"] = {"check_same_thread": False}  # Required for SQLite
+    else:
+        kwargs["pool_pre_ping"] = True
+    if not _is_sqlite_memory(url):
+        kwargs["pool_size"] = settings.DB_POOL_SIZE
+        kwargs["max_overflow"] = settings.DB_MAX_OVERFLOW
+    return kwargs
+
+
+def create_db_engine(url: str = settings.DATABASE_URL):
+    """Create the sync engine with pool sizing and, for SQLite, tuned PRAGMAs."""
+    db_engine = create_engine(url, **_engine_kwargs(url))
+    if _is_sqlite(url):
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
+def log_engine_settings(db_engine=None):
+    """Startup check: print the PRAGMAs SQLite actually applied."""
+    db_engine = db_engine or engine
+    if db_engine.dialect.name != "sqlite":
+        print(f"🗄️  Database: {db_engine.dialect.name} (pool_size={settings.DB_POOL_SIZE})")
+        return
+    with db_engine.connect() as conn:
+        effective = {
+            name: conn.execute(text(f"PRAGMA {name}")).scalar()
+            for name in _sqlite_pragmas()
+        }
+    print("🗄️  SQLite PRAGMAs: " + ", ".join(f"{k}={v}" for k, v in effective.items()))
+    if str(effective["journal_mode"]).lower() != settings.SQLITE_JOURNAL_MODE.lower():
+        print(f"⚠️  journal_mode is {effective['journal_mode']}, expected {settings.SQLITE_JOURNAL_MODE}")
+
+
+engine = create_db_engine()
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def _async_url(url: str) -> str:
+    """Map a sync DATABASE_URL onto its async driver."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql://", "postgres://"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg://" + url[len(prefix):]
+    return url
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    _url = _async_url(settings.DATABASE_URL)
+    _async_kwargs = _engine_kwargs(_url)
+    _async_kwargs.pop("connect_args", None)  # aiosqlite runs each connection in its own thread
+    if _is_sqlite(_url) and not _is_sqlite_memory(_url):
+        # SQLite has a single writer, and every session's ORM work shares one event
+        # loop, so a transaction holding the write lock can stall behind other
+        # requests until waiters pass busy_timeout. Queue sessions at the pool
+        # (FIFO) instead of in SQLite's busy handler.
+        _async_kwargs.update(pool_size=settings.DB_ASYNC_SQLITE_POOL_SIZE, max_overflow=0)
+    async_engine = create_async_engine(_url, **_async_kwargs)
+    if _is_sqlite(_url):
+        event.listen(async_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+
+
 def get_db():
     """Dependency injection for database sessions."""
     db = SessionLocal()
@@ -25,10 +117,141 @@ def get_db():
         db.close()
 
 
+async def get_async_db():
+    """Dependency injection for async database sessions (DB_ASYNC=true)."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency for async routers; the backend is picked by config
+get_session = get_async_db if settings.DB_ASYNC else get_db
+
+
+def dialect_insert(db: Session):
+    """The INSERT construct that supports ON CONFLICT for this session's database."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+async def run_db(db, fn, *args):
+    """
+    Run fn(session, *args) — ORM code written against a sync Session — from an
+    async endpoint. An AsyncSession runs it on the event loop via run_sync();
+    a plain Session runs it in the threadpool as FastAPI would for a sync route.
+    """
+    if isinstance(db, Session):
+        return await run_in_threadpool(fn, db, *args)
+    return await db.run_sync(fn, *args)
+
+
+async def run_in_session(fn, *args):
+    """
+    run_db in a session of its own, closed (and its connection returned to the
+    pool) before this returns. For endpoints that wait on something slow
+    between database steps, e.g. the LLM, which must not hold a connection
+    meanwhile: with the async SQLite pool that connection is the only one.
+    """
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            return await db.run_sync(fn, *args)
+
+    def _call():
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    return await run_in_threadpool(_call)
+
+
 def init_db():
     """Initialize all database tables."""
     from models import (  # noqa: F401 - import to register models
-        Student, Domain, Subject, MockTest, Question,
-        StudentAttempt, TopicPerformance, RevisionPlan
+        Student, Domain, Subject, MockTest, Question, ContentVersion,
+        StudentAttempt, StudentSummary, TopicPerformance, RevisionPlan,
+        Conversation, ConversationTurn,
     )
     Base.metadata.create_all(bind=engine)
+    added = _ensure_columns()
+    _ensure_indexes()
+    if ("topic_performance", "decayed_total") in added:
+        _backfill_decayed_weakness()
+
+
+def _column_ddl(column) -> str:
+    dialect = engine.dialect
+    quote = dialect.identifier_preparer.quote
+    ddl = f"ALTER TABLE {quote(column.table.name)} ADD COLUMN {quote(column.name)} {column.type.compile(dialect=dialect)}"
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = literal(default.arg, column.type).compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        ddl += f" DEFAULT {value}"
+    return ddl
+
+
+def _ensure_columns() -> set:
+    """
+    create_all() skips tables that already exist, so add any newer columns.
+    Existing rows get the column's scalar default (NULL if it has none).
+    Returns the (table, column) pairs that were added.
+    """
+    inspector = inspect(engine)
+    added = set()
+    for table in Base.metadata.sorted_tables:
+        present = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            try:
+                with engine.begin() as conn:
+                    conn.execute(text(_column_ddl(column)))
+            except Exception as e:  # e.g. another worker added it first
+                print(f"⚠️  Could not add column {table.name}.{column.name}: {e}")
+                continue
+            print(f"🛠️  Added column {table.name}.{column.name}")
+            added.add((table.name, column.name))
+    return added
+
+
+def _backfill_decayed_weakness():
+    """
+    Fill the decayed weakness columns of a pre-existing database from the
+    attempt log, in the foreground. Skipped when there is nothing to replay or
+    the columns already hold figures; logs too large to replay at startup are
+    left to recompute_weakness.py with a warning. A failure never stops the
+    app from starting.
+    """
+    from models import StudentAttempt, TopicPerformance
+    from services.weakness_recompute import recompute_shard
+    try:
+        db = SessionLocal()
+        try:
+            attempts = db.query(StudentAttempt.id).count()
+            filled = db.query(TopicPerformance.id).filter(TopicPerformance.decayed_total > 0).first() is not None
+        finally:
+            db.close()
+        if not attempts or filled:  # nothing to replay, or another worker already did
+            return
+        if attempts > settings.WEAKNESS_BACKFILL_MAX_ATTEMPTS:
+            print(f"⚠️  Decayed weakness not backfilled: {attempts} attempts is over "
+                  f"WEAKNESS_BACKFILL_MAX_ATTEMPTS ({settings.WEAKNESS_BACKFILL_MAX_ATTEMPTS}); "
+                  "run python recompute_weakness.py")
+            return
+        result = recompute_shard((0, None, None, 20000))
+        print(f"🛠️  Backfilled decayed weakness: {result['attempts']} attempts → {result['rows']} topic rows")
+    except Exception as e:
+        print(f"⚠️  Could not backfill decayed weakness ({e}); run python recompute_weakness.py")
+
+
+def _ensure_indexes():
+    """create_all() skips tables that already exist, so add any newer indexes."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except Exception as e:
+                print(f"⚠️  Could not create index {index.name}: {e}")
@@ -0,0 +1,141 @@
+"""
+Load test: LLM admission control under bursts, through the real /chat route
+with a fake chat model of fixed latency (no provider, no API key) and a
+throwaway SQLite database. Three scenarios:
+  burst     — more distinct prompts at once than slots + queue: peak provider
+              concurrency must stay at the limit and the overflow gets 429s
+  coalesce  — the same prompt sent many times at once: one provider call
+  fairness  — one student floods the coach while others ask once, with and
+              without a per-student cap
+Run with: python gate_load_test.py [--latency-ms MS] [--concurrency N] [--queue N] [--burst N]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import atexit
+import shutil
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# A throwaway database, chosen before config is imported
+_tmp = tempfile.mkdtemp(prefix="gate-load-")
+atexit.register(shutil.rmtree, _tmp, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'gate.db')}"
+os.environ["EMBEDDING_CACHE_PATH"] = ""
+
+import httpx
+import numpy as np
+
+from database import init_db
+from main import app
+from services import llm_gate, llm_registry
+from services.llm_gate import LLMGate
+
+
+class FakeChatModel:
+    """Answers after latency_ms and records how many calls were in flight at once."""
+
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        from langchain_core.messages import AIMessage
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency_ms / 1000)
+            return AIMessage(content="Practice one concept at a time.")
+        finally:
+            self.in_flight -= 1
+
+
+async def _send(client: httpx.AsyncClient, student_id: str, message: str) -> tuple:
+    started = time.perf_counter()
+    response = await client.post("/chat", json={"student_id": student_id, "message": message})
+    return response.status_code, time.perf_counter() - started
+
+
+def _summary(results) -> str:
+    ok = [seconds for status, seconds in results if status == 200]
+    rejected = sum(status == 429 for status, _ in results)
+    other = len(results) - len(ok) - rejected
+    line = f"{len(ok):4d} ok  {rejected:4d} × 429"
+    if other:
+        line += f"  {other} other"
+    if ok:
+        ms = np.asarray(ok) * 1000
+        line += f"  p50 {np.percentile(ms, 50):7.1f} ms  p99 {np.percentile(ms, 99):7.1f} ms"
+    return line
+
+
+async def _scenario(args, max_per_student: int, requests) -> tuple:
+    """Fire every (student, message) at once through a fresh gate and fake model."""
+    model = FakeChatModel(args.latency_ms)
+    llm_registry._registry.llm, llm_registry._registry.model_name = model, "fake:gate-load"
+    llm_registry._registry.ready = True
+    gate = llm_gate._gate = LLMGate(args.concurrency, args.queue, max_per_student, retry_after=1)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://gate", timeout=60) as client:
+        results = await asyncio.gather(*(_send(client, student, message) for student, message in requests))
+    return results, model, gate
+
+
+async def _run(args) -> None:
+    limit = args.concurrency + args.queue
+    print(f"🚦 Gate: {args.concurrency} slots + {args.queue} queue places, fake LLM {args.latency_ms:.0f} ms per call")
+
+    results, model, gate = await _scenario(
+        args, 0, [(f"burst-{i}", f"Question {i}: how do I revise?") for i in range(args.burst)]
+    )
+    print(f"\nburst: {args.burst} distinct prompts at once (slots + queue: {limit}, freed as calls finish)")
+    print(f"  {_summary(results)}")
+    print(f"  provider calls {model.calls}, peak in flight {model.peak} (limit {args.concurrency})  "
+          f"{'✅' if model.peak <= args.concurrency else '❌'}")
+
+    results, model, gate = await _scenario(
+        args, 0, [("coalesce", "What should I study next?")] * args.burst
+    )
+    print(f"\ncoalesce: the same prompt {args.burst} times at once")
+    print(f"  {_summary(results)}")
+    cache_hits = len(results) - model.calls - gate.coalesced  # arrived after the shared call had finished
+    print(f"  provider calls {model.calls}, coalesced {gate.coalesced}, response cache {cache_hits}  "
+          f"{'✅' if model.calls == 1 else '❌'}")
+
+    flood = [("noisy", f"Flood {i}") for i in range(args.burst)]
+    quiet = [(f"quiet-{i}", "How am I doing?") for i in range(args.quiet)]
+    for cap in (0, args.per_student):
+        # The flood is sent first; the cap bounds how much of the queue it holds ahead of the others
+        results, model, gate = await _scenario(args, cap, flood + quiet)
+        print(f"\nfairness: 1 student × {len(flood)} + {len(quiet)} students × 1, "
+              f"per-student cap {cap or 'off'}")
+        print(f"  noisy: {_summary(results[:len(flood)])}")
+        print(f"  quiet: {_summary(results[len(flood):])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="fake provider latency per call")
+    parser.add_argument("--concurrency", type=int, default=16, help="LLM_MAX_CONCURRENCY")
+    parser.add_argument("--queue", type=int, default=64, help="LLM_MAX_QUEUE")
+    parser.add_argument("--per-student", type=int, default=4, help="LLM_MAX_PER_STUDENT for the capped fairness run")
+    parser.add_argument("--burst", type=int, default=200, help="requests in each burst")
+    parser.add_argument("--quiet", type=int, default=40, help="students asking once during the flood")
+    args = parser.parse_args()
+
+    try:
+        import langchain_core  # noqa: F401
+    except ImportError:
+        sys.exit("❌ langchain-core is not installed (pip install -r requirements.txt)")
+
+    init_db()
+    asyncio.run(_run(args))
+
+
+if __name__ == "__main__":
+    main()
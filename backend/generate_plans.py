@@ -0,0 +1,58 @@
+"""
+Pre-generate revision plans for a cohort of students.
+Meant for a nightly job so daytime planner requests only read stored plans.
+Plans start on --date (default: the next plan day, see PLAN_DAY_UTC_OFFSET_MINUTES)
+and are served on that day; run it shortly before the day rolls over.
+Run with: python generate_plans.py [--workers N] [--chunk-size N] [--students FILE] [--date YYYY-MM-DD]
+"""
+import sys
+import os
+import argparse
+from datetime import date
+
+# Ensure imports work
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import init_db
+from services.plan_batch import generate_plans, next_plan_day
+
+
+def _read_ids(path):
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="students per task")
+    parser.add_argument(
+        "--students", default=None,
+        help="file with one student id per line (default: every student with performance data)",
+    )
+    parser.add_argument(
+        "--date", type=date.fromisoformat, default=None,
+        help="first day of the plans (default: the next plan day)",
+    )
+    args = parser.parse_args()
+    plan_date = args.date or next_plan_day()
+
+    init_db()
+    print(f"🗓️  Generating revision plans for {plan_date} with {args.workers} worker(s)...")
+    totals = generate_plans(
+        student_ids=_read_ids(args.students) if args.students else None,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        plan_date=plan_date,
+    )
+    print(
+        f"✅ Generated {totals['plans']} plans for {totals['students']} students "
+        f"in {totals['seconds']}s ({totals['plans_per_second']:,.0f} plans/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Load test: requests/sec of the DB-backed endpoints with the sync session
+(threadpool) and with DB_ASYNC=true (AsyncSession), against the same database.
+Starts one uvicorn server per mode on the configured DATABASE_URL (run seed.py first).
+Run with: python load_test.py [--requests N] [--concurrency N] [--modes sync async]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import subprocess
+import time
+
+import httpx
+
+STUDENTS = [f"loadtest-{i}" for i in range(50)]
+
+
+def _start_server(mode: str, port: int) -> subprocess.Popen:
+    env = {**os.environ, "DB_ASYNC": "true" if mode == "async" else "false", "LLM_WARMUP": "false"}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env,
+    )
+
+
+async def _wait_ready(client: httpx.AsyncClient, server: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline and server.poll() is None:
+        try:
+            if (await client.get("/health")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("server did not start")
+
+
+async def _run_load(server: subprocess.Popen, base_url: str, test_id: int, total: int, concurrency: int) -> dict:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await _wait_ready(client, server)
+        questions = (await client.get(f"/questions/{test_id}")).json()
+
+        def request():
+            student = random.choice(STUDENTS)
+            kind = random.random()
+            if kind < 0.4:
+                answers = {str(q["id"]): random.randint(0, 3) for q in questions}
+                return client.post("/submit_attempt", json={"student_id": student, "test_id": test_id, "answers": answers})
+            if kind < 0.8:
+                return client.get(f"/analytics/{student}")
+            return client.get(f"/generate_plan/{student}")
+
+        for _ in range(concurrency):  # warm caches and connections
+            await request()
+
+        remaining = total
+        errors = 0
+        latencies = []
+
+        async def worker():
+            nonlocal remaining, errors
+            while remaining > 0:
+                remaining -= 1
+                started = time.perf_counter()
+                try:
+                    failed = (await request()).status_code >= 400
+                except httpx.TransportError:  # server dropped the connection after a 500
+                    failed = True
+                latencies.append(time.perf_counter() - started)
+                errors += failed
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95)] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--modes", nargs="+", choices=["sync", "async"], default=["sync", "async"])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--test-id", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"🏋️  {args.requests} requests, concurrency {args.concurrency} "
+          "(40% submit, 40% analytics, 20% plan)")
+    for mode in args.modes:
+        server = _start_server(mode, args.port)
+        try:
+            result = asyncio.run(_run_load(
+                server, f"http://127.0.0.1:{args.port}", args.test_id, args.requests, args.concurrency
+            ))
+        finally:
+            server.terminate()
+            server.wait()
+        print(
+            f"✅ {mode:5s}: {result['rps']:7.1f} req/s  p50 {result['p50_ms']:6.1f} ms  "
+            f"p95 {result['p95_ms']:6.1f} ms  errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
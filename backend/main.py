@@ -5,12 +5,21 @@ Includes all routers and startup events.
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from database import init_db
+from database import init_db, log_engine_settings
 from config import settings
+from services.question_cache import question_cache_stats
+from services.answer_key import answer_key_cache_stats
+from services.catalog_service import catalog_cache_stats
+from services.embedding_cache import embedding_cache_stats
+from services.coach_cache import coach_cache_stats
+from services.context_cache import context_cache_stats
+from services.pinecone_service import init_vector_clients
+from services.llm_registry import close_llm, init_llm, warm_up_llm
+from services.llm_gate import init_llm_gate, llm_gate_stats
 
 from routers import (
     domains, subjects, tests, questions,
-    attempts, analytics, planner, resources, coach, exam_coach, auth
+    attempts, analytics, planner, resources, coach, exam_coach, auth, catalog
 )
 
 
@@ -19,8 +28,14 @@ async def lifespan(app: FastAPI):
     """Initialize database on startup."""
     init_db()
     print("✅ Database initialized")
+    log_engine_settings()
+    init_vector_clients()
+    init_llm()
+    init_llm_gate()
+    await warm_up_llm()
     yield
     print("🔴 Shutting down...")
+    await close_llm()
 
 
 app = FastAPI(
@@ -43,6 +58,7 @@ app.add_middleware(
 app.include_router(domains.router, prefix="/domains", tags=["Domains"])
 app.include_router(subjects.router, prefix="/subjects", tags=["Subjects"])
 app.include_router(tests.router, prefix="/tests", tags=["Tests"])
+app.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
 app.include_router(questions.router, prefix="/questions", tags=["Questions"])
 app.include_router(attempts.router, prefix="/submit_attempt", tags=["Attempts"])
 app.include_router(analytics.router, prefix="/analytics", tags=["Analytics"])
@@ -58,6 +74,20 @@ async def health_check():
     return {"status": "ok", "version": "1.0.0"}
 
 
+@app.get("/metrics", tags=["Health"])
+async def metrics():
+    """In-process cache and LLM admission counters."""
+    return {
+        "question_cache": question_cache_stats(),
+        "answer_key_cache": answer_key_cache_stats(),
+        "catalog_cache": catalog_cache_stats(),
+        "embedding_cache": embedding_cache_stats(),
+        "coach_cache": coach_cache_stats(),
+        "context_cache": context_cache_stats(),
+        "llm_gate": llm_gate_stats(),
+    }
+
+
 @app.get("/", tags=["Root"])
 async def root():
     return {
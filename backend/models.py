@@ -4,8 +4,8 @@ SQLAlchemy ORM models for the adaptive learning platform.
 import json
 from datetime import datetime
 from sqlalchemy import (
-    Column, Integer, String, Text, Float, DateTime,
-    ForeignKey, Enum, Boolean
+    Column, Integer, String, Text, Float, Date, DateTime,
+    ForeignKey, Enum, Boolean, Index
 )
 from sqlalchemy.orm import relationship
 from database import Base
@@ -101,8 +101,21 @@ class Question(Base):
         self.options = json.dumps(options_list)
 
 
+class ContentVersion(Base):
+    """Single-row counter bumped on every content write (see services.content_version)."""
+    __tablename__ = "content_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
 class StudentAttempt(Base):
     __tablename__ = "student_attempts"
+    __table_args__ = (
+        # Keyset pagination order for GET /analytics/{student_id}/attempts
+        Index("ix_student_attempts_student_created_id", "student_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(String(100), nullable=False, index=True)
@@ -129,15 +142,43 @@ class StudentAttempt(Base):
         return round((self.score / self.total) * 100, 2)
 
 
+class StudentSummary(Base):
+    """Per-student analytics rollup, maintained incrementally on attempt submission."""
+    __tablename__ = "student_summaries"
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(String(100), unique=True, nullable=False, index=True)
+    attempt_count = Column(Integer, default=0)
+    total_correct = Column(Integer, default=0)
+    total_questions = Column(Integer, default=0)
+    recent_attempts = Column(Text, nullable=False, default="[]")  # JSON: last 10 attempts, newest first
+    performance_version = Column(Integer, default=0)  # bumped on every attempt submission
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def get_recent_attempts(self):
+        return json.loads(self.recent_attempts)
+
+    def set_recent_attempts(self, recent_list):
+        self.recent_attempts = json.dumps(recent_list)
+
+
 class TopicPerformance(Base):
     __tablename__ = "topic_performance"
+    __table_args__ = (
+        # Conflict target for the set-based upsert in services.performance_service
+        Index("ix_topic_performance_student_topic", "student_id", "topic", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(String(100), nullable=False, index=True)
     topic = Column(String(200), nullable=False)
     correct = Column(Integer, default=0)
     total_attempted = Column(Integer, default=0)
-    weakness_score = Column(Float, default=0.0)  # 0.0=strong, 1.0=very weak
+    weakness_score = Column(Float, default=0.0)  # 0.0=strong, 1.0=very weak (time-decayed)
+    # Forward-decay accumulators: sum of correct/total, each weighted by
+    # 2^((answered_at - epoch) / half-life). Their ratio is the decayed accuracy.
+    decayed_correct = Column(Float, default=0.0)
+    decayed_total = Column(Float, default=0.0)
     last_updated = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     @property
@@ -155,3 +196,40 @@ class RevisionPlan(Base):
     plan_data = Column(Text, nullable=False)  # JSON: list of DayPlan objects
     generated_at = Column(DateTime, default=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    # StudentSummary version it was built from. No default on purpose: plans stored
+    # before this column existed migrate as NULL, which the planner treats as stale.
+    performance_version = Column(Integer, nullable=True)
+    # Day 1 of the plan. Batch plans are built the night before the day they serve;
+    # NULL (plans from before this column) means the day of generated_at.
+    plan_date = Column(Date, nullable=True)
+
+
+class Conversation(Base):
+    """Server-side coach memory for one chat session (see services.conversation_service)."""
+    __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_student_session", "student_id", "session_id", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    student_id = Column(String(100), nullable=False)
+    session_id = Column(String(100), nullable=False)
+    summary = Column(Text, nullable=False, default="")  # rolling summary of the folded-in turns
+    summarized_through = Column(Integer, nullable=False, default=0)  # turns with seq < this are in summary
+    turn_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ConversationTurn(Base):
+    """One message of a conversation; deleted once folded into the summary."""
+    __tablename__ = "conversation_turns"
+    __table_args__ = (
+        Index("ix_conversation_turns_conversation_seq", "conversation_id", "seq", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    conversation_id = Column(Integer, ForeignKey("conversations.id"), nullable=False)
+    seq = Column(Integer, nullable=False)
+    role = Column(String(20), nullable=False)  # "user" | "assistant"
+    content = Column(Text, nullable=False)
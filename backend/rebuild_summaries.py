@@ -0,0 +1,33 @@
+"""
+Rebuild per-student analytics summaries from the raw attempt log.
+Use after restoring a backup or when summaries drift from student_attempts.
+Run with: python rebuild_summaries.py
+"""
+import sys
+import os
+
+# Ensure imports work
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import SessionLocal, init_db
+from services.summary_service import rebuild_summaries
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    try:
+        print("🔄 Rebuilding student summaries...")
+        count = rebuild_summaries(db)
+        db.commit()
+        print(f"✅ Rebuilt {count} student summaries")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Rebuild failed: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
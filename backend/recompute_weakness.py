@@ -0,0 +1,43 @@
+"""
+Recompute every TopicPerformance row from the raw attempt log.
+Use after changing the weakness formula or fixing question answer keys.
+Interrupted runs resume from the checkpoint file; pass --restart to start over.
+Run with: python recompute_weakness.py [--workers N] [--shards N] [--chunk-size N]
+"""
+import sys
+import os
+import argparse
+
+# Ensure imports work
+sys.path.insert(0, os.path.dirname(__file__))
+
+from database import init_db
+from services.weakness_recompute import recompute_weakness
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=None, help="default: 4 × workers")
+    parser.add_argument("--chunk-size", type=int, default=20000, help="attempts fetched per chunk")
+    parser.add_argument("--checkpoint", default="recompute_weakness.checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    args = parser.parse_args()
+
+    init_db()
+    print(f"🔄 Recomputing topic performance with {args.workers} worker(s)...")
+    totals = recompute_weakness(
+        workers=args.workers,
+        n_shards=args.shards or args.workers * 4,
+        chunk_size=args.chunk_size,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+    )
+    print(
+        f"✅ Recomputed {totals['rows']} rows from {totals['attempts']} attempts "
+        f"in {totals['seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
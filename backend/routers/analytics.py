@@ -2,25 +2,62 @@
 Analytics router.
 Returns student performance summary, weakness report.
 """
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from typing import List
-from database import get_db
-from models import StudentAttempt, TopicPerformance, MockTest, Subject, Domain
-from schemas import AnalyticsResponse, TopicPerformanceResponse
+from database import get_session, run_db
+from models import MockTest, StudentAttempt, TopicPerformance
+from schemas import (
+    AnalyticsResponse, TopicPerformanceResponse,
+    AttemptHistoryItem, AttemptHistoryPage,
+)
+from services.summary_service import load_summary
 
 router = APIRouter()
 
 
+def _encode_cursor(created_at: datetime, attempt_id: int) -> str:
+    raw = json.dumps([created_at.isoformat(), attempt_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, attempt_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(attempt_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/{student_id}", response_model=AnalyticsResponse)
-def get_analytics(student_id: str, db: Session = Depends(get_db)):
-    """Comprehensive analytics for a student."""
-    attempts = (
-        db.query(StudentAttempt)
-        .filter(StudentAttempt.student_id == student_id)
-        .order_by(StudentAttempt.created_at.desc())
-        .all()
-    )
+async def get_analytics(student_id: str, db=Depends(get_session)):
+    """Comprehensive analytics for a student, served from the incremental summary."""
+    return await run_db(db, _get_analytics, student_id)
+
+
+@router.get("/{student_id}/attempts", response_model=AttemptHistoryPage)
+async def get_attempt_history(
+    student_id: str,
+    after: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db=Depends(get_session),
+):
+    """
+    Full attempt history, newest first, keyset-paginated on (created_at, id).
+    Each page is one index range scan, so page 500 costs the same as page 1.
+    """
+    # Decode up front so a bad cursor is a 400 before touching the database
+    cursor = _decode_cursor(after) if after else None
+    return await run_db(db, _get_attempt_history, student_id, cursor, limit)
+
+
+def _get_analytics(db: Session, student_id: str) -> AnalyticsResponse:
+    summary = load_summary(db, student_id)
 
     topic_performances = (
         db.query(TopicPerformance)
@@ -29,25 +66,10 @@ def get_analytics(student_id: str, db: Session = Depends(get_db)):
         .all()
     )
 
-    total_correct = sum(a.score for a in attempts)
-    total_questions = sum(a.total for a in attempts)
+    total_correct = summary["total_correct"]
+    total_questions = summary["total_questions"]
     overall_accuracy = round((total_correct / total_questions) * 100, 2) if total_questions > 0 else 0.0
 
-    # Build recent attempts with context
-    recent = []
-    for a in attempts[:10]:
-        test = db.query(MockTest).filter(MockTest.id == a.test_id).first()
-        test_name = test.name if test else "Unknown"
-        recent.append({
-            "attempt_id": a.id,
-            "test_id": a.test_id,
-            "test_name": test_name,
-            "score": a.score,
-            "total": a.total,
-            "percentage": a.percentage,
-            "created_at": a.created_at.isoformat(),
-        })
-
     tp_responses = [
         TopicPerformanceResponse(
             topic=tp.topic,
@@ -64,10 +86,54 @@ def get_analytics(student_id: str, db: Session = Depends(get_db)):
 
     return AnalyticsResponse(
         student_id=student_id,
-        total_tests_taken=len(attempts),
+        total_tests_taken=summary["attempt_count"],
         overall_accuracy=overall_accuracy,
         topic_performance=tp_responses,
         weakest_topics=weakest,
         strongest_topics=strongest,
-        recent_attempts=recent,
+        recent_attempts=summary["recent_attempts"],
     )
+
+
+def _get_attempt_history(
+    db: Session,
+    student_id: str,
+    cursor: Optional[Tuple[datetime, int]],
+    limit: int,
+) -> AttemptHistoryPage:
+    query = (
+        db.query(StudentAttempt, MockTest.name)
+        .outerjoin(MockTest, MockTest.id == StudentAttempt.test_id)
+        .filter(StudentAttempt.student_id == student_id)
+    )
+    if cursor:
+        created_at, attempt_id = cursor
+        query = query.filter(
+            tuple_(StudentAttempt.created_at, StudentAttempt.id) < tuple_(created_at, attempt_id)
+        )
+    rows = (
+        query
+        .order_by(StudentAttempt.created_at.desc(), StudentAttempt.id.desc())
+        .limit(limit + 1)  # one extra row tells us whether another page exists
+        .all()
+    )
+
+    page = rows[:limit]
+    items = [
+        AttemptHistoryItem(
+            attempt_id=a.id,
+            test_id=a.test_id,
+            test_name=name or "Unknown",
+            score=a.score,
+            total=a.total,
+            percentage=a.percentage,
+            created_at=a.created_at,
+        )
+        for a, name in page
+    ]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        next_cursor = _encode_cursor(last.created_at, last.id)
+
+    return AttemptHistoryPage(student_id=student_id, items=items, next_cursor=next_cursor)
@@ -2,100 +2,127 @@
 Attempt submission router.
 Handles scoring, topic performance updates, and persistence.
 """
-import json
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from typing import Dict
-from database import get_db
-from models import StudentAttempt, Question, TopicPerformance
-from schemas import SubmitAttemptRequest, AttemptResult
-from datetime import datetime
+from typing import List
+from database import get_session, run_db
+from models import StudentAttempt
+from schemas import (
+    SubmitAttemptRequest, AttemptResult,
+    BatchSubmitRequest, BatchAttemptItem, BatchAttemptResult,
+)
+from services.answer_key import get_answer_key, get_answer_keys
+from services.performance_service import apply_topic_deltas, TopicDeltas
+from services.summary_service import record_attempts
 
 router = APIRouter()
 
 
+def _new_attempt(payload: SubmitAttemptRequest, scored: dict) -> StudentAttempt:
+    attempt = StudentAttempt(
+        student_id=payload.student_id,
+        test_id=payload.test_id,
+        score=scored["score"],
+        total=scored["total"],
+        time_taken_seconds=payload.time_taken_seconds,
+        completed=True,
+    )
+    attempt.set_answers(payload.answers)
+    return attempt
+
+
+def _attempt_result(attempt: StudentAttempt, scored: dict) -> AttemptResult:
+    score, total = scored["score"], scored["total"]
+    return AttemptResult(
+        attempt_id=attempt.id,
+        score=score,
+        total=total,
+        percentage=round((score / total) * 100, 2) if total > 0 else 0.0,
+        correct_questions=scored["correct_questions"],
+        incorrect_questions=scored["incorrect_questions"],
+        topic_breakdown=scored["topic_breakdown"],
+    )
+
+
 @router.post("", response_model=AttemptResult)
-def submit_attempt(payload: SubmitAttemptRequest, db: Session = Depends(get_db)):
+async def submit_attempt(payload: SubmitAttemptRequest, db=Depends(get_session)):
     """
     Submit student answers for a mock test.
     Scores the attempt, updates topic performance, and persists everything.
     """
-    # Fetch all questions for the test
-    questions = db.query(Question).filter(Question.test_id == payload.test_id).all()
-    if not questions:
-        raise HTTPException(status_code=404, detail="Test not found")
+    return await run_db(db, _submit_attempt, payload)
 
-    # Score the attempt
-    score = 0
-    correct_ids = []
-    incorrect_ids = []
-    topic_breakdown: Dict[str, Dict[str, int]] = {}
 
-    for q in questions:
-        submitted = payload.answers.get(str(q.id))
-        is_correct = submitted is not None and submitted == q.correct_answer
+@router.post("/batch", response_model=BatchAttemptResult)
+async def submit_attempts_batch(payload: BatchSubmitRequest, db=Depends(get_session)):
+    """
+    Submit many attempts at once (offline/bulk sync).
+    Loads each distinct test's answer key once, scores everything in memory and
+    persists all attempts, topic deltas and summaries in a single transaction.
+    Items for unknown tests are reported per item and do not fail the batch.
+    """
+    return await run_db(db, _submit_attempts_batch, payload)
 
-        if is_correct:
-            score += 1
-            correct_ids.append(q.id)
-        else:
-            incorrect_ids.append(q.id)
 
-        # Track per-topic breakdown
-        if q.topic not in topic_breakdown:
-            topic_breakdown[q.topic] = {"correct": 0, "total": 0}
-        topic_breakdown[q.topic]["total"] += 1
-        if is_correct:
-            topic_breakdown[q.topic]["correct"] += 1
+def _submit_attempt(db: Session, payload: SubmitAttemptRequest) -> AttemptResult:
+    # Compiled (cached) answer key for the test
+    answer_key = get_answer_key(db, payload.test_id)
+    if answer_key is None:
+        raise HTTPException(status_code=404, detail="Test not found")
 
-    total = len(questions)
+    scored = answer_key.score(payload.answers)
 
     # Persist attempt
-    attempt = StudentAttempt(
-        student_id=payload.student_id,
-        test_id=payload.test_id,
-        score=score,
-        total=total,
-        time_taken_seconds=payload.time_taken_seconds,
-        completed=True,
-    )
-    attempt.set_answers(payload.answers)
+    attempt = _new_attempt(payload, scored)
     db.add(attempt)
+    db.flush()
+    result = _attempt_result(attempt, scored)
 
-    # Update TopicPerformance
-    for topic, stats in topic_breakdown.items():
-        tp = db.query(TopicPerformance).filter(
-            TopicPerformance.student_id == payload.student_id,
-            TopicPerformance.topic == topic
-        ).first()
-
-        if not tp:
-            tp = TopicPerformance(
-                student_id=payload.student_id,
-                topic=topic,
-                correct=0,
-                total_attempted=0
-            )
-            db.add(tp)
-
-        tp.correct += stats["correct"]
-        tp.total_attempted += stats["total"]
-        # weakness_score: 0.0 = perfect, 1.0 = all wrong
-        if tp.total_attempted > 0:
-            tp.weakness_score = round(
-                1.0 - (tp.correct / tp.total_attempted), 4
-            )
-        tp.last_updated = datetime.utcnow()
+    # Update TopicPerformance in one upsert (SQL-side increments)
+    apply_topic_deltas(db, {
+        (payload.student_id, topic): stats for topic, stats in scored["topic_breakdown"].items()
+    })
+    record_attempts(db, [attempt])
 
     db.commit()
-    db.refresh(attempt)
+    return result
 
-    return AttemptResult(
-        attempt_id=attempt.id,
-        score=score,
-        total=total,
-        percentage=round((score / total) * 100, 2) if total > 0 else 0.0,
-        correct_questions=correct_ids,
-        incorrect_questions=incorrect_ids,
-        topic_breakdown=topic_breakdown,
+
+def _submit_attempts_batch(db: Session, payload: BatchSubmitRequest) -> BatchAttemptResult:
+    answer_keys = get_answer_keys(db, {a.test_id for a in payload.attempts})
+
+    items: List[BatchAttemptItem] = []
+    pending = []  # (item, attempt, scored)
+    deltas: TopicDeltas = {}
+
+    for i, item in enumerate(payload.attempts):
+        answer_key = answer_keys.get(item.test_id)
+        if answer_key is None:
+            items.append(BatchAttemptItem(index=i, error="Test not found"))
+            continue
+
+        scored = answer_key.score(item.answers)
+        for topic, stats in scored["topic_breakdown"].items():
+            agg = deltas.setdefault((item.student_id, topic), {"correct": 0, "total": 0})
+            agg["correct"] += stats["correct"]
+            agg["total"] += stats["total"]
+
+        batch_item = BatchAttemptItem(index=i)
+        items.append(batch_item)
+        pending.append((batch_item, _new_attempt(item, scored), scored))
+
+    if pending:
+        db.add_all([attempt for _, attempt, _ in pending])
+        db.flush()  # assigns attempt ids
+        # Build results before commit() expires the attempts
+        for batch_item, attempt, scored in pending:
+            batch_item.result = _attempt_result(attempt, scored)
+        apply_topic_deltas(db, deltas)
+        record_attempts(db, [attempt for _, attempt, _ in pending])
+        db.commit()
+
+    return BatchAttemptResult(
+        submitted=len(payload.attempts),
+        succeeded=len(pending),
+        items=items,
     )
@@ -0,0 +1,29 @@
+"""
+Catalog router.
+Whole domain → subject → test tree in one response.
+"""
+from fastapi import APIRouter, Depends, Request, Response
+from database import get_session, run_db
+from schemas import CatalogResponse
+from services.catalog_service import build_catalog, get_cached_catalog, cache_catalog
+from services.content_version import cached_content_version, content_version
+
+router = APIRouter()
+
+
+@router.get("", response_model=CatalogResponse)
+async def get_catalog(request: Request, db=Depends(get_session)):
+    """Return the full catalog with question counts; supports If-None-Match."""
+    current = cached_content_version()
+    if current is None:
+        current = await run_db(db, content_version)
+    entry = get_cached_catalog(current)
+    if entry is None:
+        entry = await run_db(db, build_catalog)
+        cache_catalog(current, entry)
+
+    version, body = entry
+    etag = f'"{version}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -2,25 +2,82 @@
 AI Coach router.
 LangChain-powered coaching agent endpoint.
 """
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from database import get_db
-from services.agent_service import get_coach_response
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from services.agent_service import get_coach_response, stream_coach_response
+from services.llm_gate import LLMOverloaded
 from schemas import ChatRequest, ChatResponse
 
 router = APIRouter()
 
 
+def _overloaded(e: LLMOverloaded) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
 @router.post("", response_model=ChatResponse)
-async def chat_with_coach(payload: ChatRequest, db: Session = Depends(get_db)):
-    """Chat with the AI learning coach."""
+async def chat_with_coach(payload: ChatRequest):
+    """
+    Chat with the AI learning coach. No request-scoped session: the agent opens
+    short ones around the LLM call, so it never holds a pooled connection.
+    """
     try:
         response = await get_coach_response(
             student_id=payload.student_id,
             message=payload.message,
             history=payload.history or [],
-            db=db
+            session_id=payload.session_id,
         )
-        return ChatResponse(response=response, student_id=payload.student_id)
+        return ChatResponse(response=response, student_id=payload.student_id, session_id=payload.session_id)
+    except LLMOverloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI Coach error: {str(e)}")
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/stream")
+async def stream_chat_with_coach(payload: ChatRequest, request: Request):
+    """
+    Chat with the AI coach, streamed as Server-Sent Events:
+    `token` events carry text chunks, then one `done` event (or `error`).
+    """
+    chunks = stream_coach_response(
+        student_id=payload.student_id,
+        message=payload.message,
+        history=payload.history or [],
+        session_id=payload.session_id,
+    )
+    # Pull the first chunk before answering, so an overloaded provider is a real 429
+    try:
+        first = await anext(chunks)
+    except StopAsyncIteration:
+        first = None
+    except LLMOverloaded as e:
+        await chunks.aclose()
+        raise _overloaded(e)
+
+    async def events():
+        try:
+            if first is not None:
+                yield _sse("token", {"token": first})
+            async for chunk in chunks:
+                if await request.is_disconnected():
+                    return  # closing the generator cancels the upstream LLM call
+                yield _sse("token", {"token": chunk})
+            yield _sse("done", {"student_id": payload.student_id, "session_id": payload.session_id})
+        except Exception as e:
+            yield _sse("error", {"detail": f"AI Coach error: {str(e)}"})
+        finally:
+            await chunks.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -2,11 +2,17 @@
 Exam Coach router — analyze topic scores and generate personalized revision plans
 for JEE Main, JEE Advanced, EAMCET, and NEET.
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 from datetime import date, timedelta
 
+from services.exam_readiness import (
+    BULK_COLUMNS, BULK_FORMATS, WEAK_BELOW, analyze_bulk, classify_mistake,
+    detect_format, predict_score, read_topic_scores, topic_priority,
+)
+
 router = APIRouter()
 
 # ─── Constants ──────────────────────────────────────────────────────────────
@@ -19,22 +25,6 @@ EXAM_SUBJECTS = {
     "neet": ["Biology", "Physics", "Chemistry"],
 }
 
-EXAM_WEIGHTAGE = {
-    "jee_main":     {"Mathematics": 33, "Physics": 33, "Chemistry": 34},
-    "jee_advanced": {"Mathematics": 33, "Physics": 33, "Chemistry": 34},
-    "eamcet_mpc":   {"Mathematics": 40, "Physics": 30, "Chemistry": 30},
-    "eamcet_bipc":  {"Biology": 50, "Physics": 25, "Chemistry": 25},
-    "neet":         {"Biology": 50, "Physics": 25, "Chemistry": 25},
-}
-
-EXAM_MAX_MARKS = {
-    "jee_main": 300,
-    "jee_advanced": 360,
-    "eamcet_mpc": 160,
-    "eamcet_bipc": 160,
-    "neet": 720,
-}
-
 VIDEO_RESOURCES = {
     "Mathematics": [
         {"title": "Physics Wallah Maths", "url": "https://www.youtube.com/@PhysicsWallah", "type": "YouTube"},
@@ -55,13 +45,6 @@ VIDEO_RESOURCES = {
     ],
 }
 
-MISTAKE_THRESHOLDS = {
-    "Conceptual":   lambda acc: acc < 40,
-    "Calculation":  lambda acc: 40 <= acc < 60,
-    "Careless":     lambda acc: 60 <= acc < 75,
-    "Time Pressure":lambda acc: 75 <= acc < 85,
-}
-
 STRATEGY = {
     "jee_main": {
         "attempt_order": "Chemistry → Physics → Mathematics",
@@ -191,52 +174,59 @@ def analyze_performance(req: AnalyzeRequest):
         subj = ts.subject
         subject_totals.setdefault(subj, []).append(ts.accuracy)
 
-        if ts.accuracy < 85:
-            # Classify mistake type
-            mistake = "Conceptual"
-            for mtype, cond in MISTAKE_THRESHOLDS.items():
-                if cond(ts.accuracy):
-                    mistake = mtype
-                    break
-
-            # Also penalise slow answers even if moderately accurate
-            if ts.time_taken_avg > 120 and ts.accuracy < 75:
-                mistake = "Time Pressure"
-
-            priority = "High" if ts.accuracy < 50 else ("Medium" if ts.accuracy < 70 else "Low")
+        if ts.accuracy < WEAK_BELOW:
             weak.append(WeakTopic(
                 topic=ts.topic,
                 subject=ts.subject,
                 accuracy=ts.accuracy,
-                mistake_type=mistake,
-                priority=priority,
+                mistake_type=classify_mistake(ts.accuracy, ts.time_taken_avg),
+                priority=topic_priority(ts.accuracy),
             ))
 
     subject_summary = {
         subj: round(sum(accs) / len(accs), 1)
         for subj, accs in subject_totals.items()
     }
-
-    # Predicted score
-    weightage = EXAM_WEIGHTAGE.get(req.exam_type, {})
-    max_marks = EXAM_MAX_MARKS.get(req.exam_type, 300)
-    predicted = 0.0
-    for subj, avg_acc in subject_summary.items():
-        w = weightage.get(subj, 33)
-        subject_marks = (w / 100) * max_marks
-        predicted += (avg_acc / 100) * subject_marks
-
-    readiness = round((predicted / max_marks) * 100, 1) if max_marks else 0
+    predicted, max_marks, readiness = predict_score(subject_summary, req.exam_type)
 
     return AnalyzeResponse(
         weak_topics=sorted(weak, key=lambda x: x.accuracy),
         subject_summary=subject_summary,
-        predicted_score=round(predicted, 1),
+        predicted_score=predicted,
         max_score=max_marks,
         readiness_pct=readiness,
     )
 
 
+@router.post("/analyze/bulk")
+def analyze_bulk_upload(
+    file: UploadFile = File(...),
+    exam_type: str = Form(...),
+    format: Optional[str] = Form(None),
+):
+    """
+    /analyze for a whole cohort: upload CSV, Parquet or Arrow IPC rows of
+    (student, subject, topic, accuracy, time_taken_avg, attempted) and get one
+    NDJSON readiness report per student, streamed as it is produced.
+    """
+    fmt = (format or detect_format(file.filename, file.content_type) or "").lower()
+    if fmt not in BULK_FORMATS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Cannot tell the file format; pass format= one of: {', '.join(BULK_FORMATS)}",
+        )
+    try:
+        df = read_topic_scores(file.file.read(), fmt)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Could not read {fmt} upload with columns {', '.join(BULK_COLUMNS)}: {e}",
+        )
+    return StreamingResponse(analyze_bulk(df, exam_type), media_type="application/x-ndjson")
+
+
 @router.post("/plan", response_model=PlanResponse)
 def generate_plan(req: PlanRequest):
     """Generate a 7-day revision plan targeting weak topics."""
@@ -1,14 +1,29 @@
 """Planner router."""
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from database import get_db
-from services.planner_service import generate_revision_plan
+from fastapi import APIRouter, Depends, Request, Response
+from database import get_session, run_db
+from services.planner_service import generate_revision_plan, get_or_generate_plan
 from schemas import RevisionPlanResponse
 
 router = APIRouter()
 
 
+@router.get("/{student_id}", response_model=RevisionPlanResponse)
+async def get_plan(student_id: str, request: Request, db=Depends(get_session)):
+    """
+    Return the student's current plan, regenerating it only when their
+    performance has changed since it was built. Supports If-None-Match.
+    """
+    plan, etag = await run_db(db, lambda session: get_or_generate_plan(student_id, session))
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(
+        content=plan.model_dump_json(),
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
 @router.post("/{student_id}", response_model=RevisionPlanResponse)
-def generate_plan(student_id: str, db: Session = Depends(get_db)):
-    """Generate a personalized 7-day revision plan for a student."""
-    return generate_revision_plan(student_id, db)
+async def generate_plan(student_id: str, db=Depends(get_session)):
+    """Generate a personalized 7-day revision plan for a student (always rebuilds)."""
+    return await run_db(db, lambda session: generate_revision_plan(student_id, session))
@@ -1,18 +1,34 @@
 """Questions router."""
 import json
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import List
-from database import get_db
+from database import get_session, run_db
 from models import Question
 from schemas import QuestionResponse
+from services.content_version import cached_content_version, content_version
+from services.question_cache import get_cached_questions, cache_questions
 
 router = APIRouter()
 
+_question_list = TypeAdapter(List[QuestionResponse])
+
 
 @router.get("/{test_id}", response_model=List[QuestionResponse])
-def get_questions(test_id: int, db: Session = Depends(get_db)):
+async def get_questions(test_id: int, db=Depends(get_session)):
     """Return all questions for a test (without correct answers)."""
+    version = cached_content_version()
+    if version is None:
+        version = await run_db(db, content_version)
+    body = get_cached_questions(test_id, version)
+    if body is None:
+        body = await run_db(db, _load_questions, test_id)
+        cache_questions(test_id, version, body)
+    return Response(content=body, media_type="application/json")
+
+
+def _load_questions(db: Session, test_id: int) -> bytes:
     questions = (
         db.query(Question)
         .filter(Question.test_id == test_id)
@@ -34,4 +50,4 @@ def get_questions(test_id: int, db: Session = Depends(get_db)):
             order_num=q.order_num,
             correct_answer=None  # hidden during test
         ))
-    return result
+    return _question_list.dump_json(result)
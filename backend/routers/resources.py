@@ -3,12 +3,19 @@ Resources router.
 Retrieves relevant study materials via Pinecone vector search.
 """
 from fastapi import APIRouter
-from schemas import ResourcesResponse
-from services.pinecone_service import retrieve_resources
+from schemas import ResourcesBatchRequest, ResourcesBatchResponse, ResourcesResponse
+from services.pinecone_service import retrieve_resources, retrieve_resources_batch
 
 router = APIRouter()
 
 
+@router.post("/batch", response_model=ResourcesBatchResponse)
+async def get_resources_batch(req: ResourcesBatchRequest):
+    """Return top-k resources for several topics in one round trip (duplicates resolved once)."""
+    resources = await retrieve_resources_batch(req.topics, top_k=req.top_k)
+    return ResourcesBatchResponse(resources=resources)
+
+
 @router.get("/{topic}", response_model=ResourcesResponse)
 async def get_resources(topic: str, top_k: int = 5):
     """Return top-k relevant study resources for a topic via vector search."""
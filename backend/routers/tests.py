@@ -1,5 +1,6 @@
 """Mock tests router."""
 from fastapi import APIRouter, Depends
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 from database import get_db
@@ -12,12 +13,18 @@ router = APIRouter()
 @router.get("/{subject_id}", response_model=List[MockTestResponse])
 def get_tests(subject_id: int, db: Session = Depends(get_db)):
     """Return all mock tests for a subject, with question count."""
-    tests = db.query(MockTest).filter(MockTest.subject_id == subject_id).all()
+    rows = (
+        db.query(MockTest, func.count(Question.id))
+        .outerjoin(Question, Question.test_id == MockTest.id)
+        .filter(MockTest.subject_id == subject_id)
+        .group_by(MockTest.id)
+        .order_by(MockTest.id)
+        .all()
+    )
     # Do NOT raise 404 — return empty list so frontend handles it gracefully
 
     result = []
-    for test in tests:
-        q_count = db.query(Question).filter(Question.test_id == test.id).count()
+    for test, q_count in rows:
         # Build dict manually to inject computed question_count (avoids Pydantic immutability)
         result.append(MockTestResponse(
             id=test.id,
@@ -55,6 +55,36 @@ class MockTestResponse(MockTestBase):
     question_count: Optional[int] = None
 
 
+# ─── Catalog ─────────────────────────────────────────────
+class CatalogTest(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    difficulty: DifficultyEnum
+    duration_minutes: int
+    question_count: int
+
+
+class CatalogSubject(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    tests: List[CatalogTest]
+
+
+class CatalogDomain(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    icon: Optional[str] = None
+    subjects: List[CatalogSubject]
+
+
+class CatalogResponse(BaseModel):
+    version: str  # changes whenever catalog content changes; also sent as ETag
+    domains: List[CatalogDomain]
+
+
 # ─── Question ────────────────────────────────────────────
 class QuestionBase(BaseModel):
     text: str
@@ -101,6 +131,22 @@ class AttemptResult(BaseModel):
     topic_breakdown: Dict[str, Dict[str, int]]  # {topic: {correct, total}}
 
 
+class BatchSubmitRequest(BaseModel):
+    attempts: List[SubmitAttemptRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchAttemptItem(BaseModel):
+    index: int  # position in the submitted batch
+    result: Optional[AttemptResult] = None
+    error: Optional[str] = None
+
+
+class BatchAttemptResult(BaseModel):
+    submitted: int
+    succeeded: int
+    items: List[BatchAttemptItem]
+
+
 # ─── Analytics ───────────────────────────────────────────
 class TopicPerformanceResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -121,6 +167,22 @@ class AnalyticsResponse(BaseModel):
     recent_attempts: List[Dict[str, Any]]
 
 
+class AttemptHistoryItem(BaseModel):
+    attempt_id: int
+    test_id: int
+    test_name: str
+    score: int
+    total: int
+    percentage: float
+    created_at: datetime
+
+
+class AttemptHistoryPage(BaseModel):
+    student_id: str
+    items: List[AttemptHistoryItem]
+    next_cursor: Optional[str] = None  # opaque; pass back as ?after= for the next page
+
+
 # ─── Planner ─────────────────────────────────────────────
 class StudySession(BaseModel):
     topic: str
@@ -158,6 +220,15 @@ class ResourcesResponse(BaseModel):
     resources: List[ResourceItem]
 
 
+class ResourcesBatchRequest(BaseModel):
+    topics: List[str] = Field(..., min_length=1, max_length=100)
+    top_k: int = Field(5, ge=1, le=20)
+
+
+class ResourcesBatchResponse(BaseModel):
+    resources: Dict[str, List[ResourceItem]]  # requested topic -> resources
+
+
 # ─── Chat ────────────────────────────────────────────────
 class ChatMessage(BaseModel):
     role: str  # "user" | "assistant"
@@ -167,12 +238,14 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     student_id: str
     message: str
-    history: Optional[List[ChatMessage]] = []
+    history: Optional[List[ChatMessage]] = []  # ignored when session_id is set
+    session_id: Optional[str] = Field(None, max_length=100)  # server-side memory for this chat
 
 
 class ChatResponse(BaseModel):
     response: str
     student_id: str
+    session_id: Optional[str] = None
 
 
 # ─── Auth ────────────────────────────────────────────────
@@ -13,6 +13,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from database import engine, SessionLocal, Base
 from models import Domain, Subject, MockTest, Question
+from services.catalog_service import notify_content_changed
 
 # Initialize tables
 Base.metadata.create_all(bind=engine)
@@ -417,6 +418,7 @@ def seed():
 
                 print(f"  ✅ {subject.name}: {len(subject_data['tests'])} tests")
 
+        notify_content_changed(db)
         db.commit()
         print(f"\n✅ Seeded {db.query(Domain).count()} domains successfully!")
         print(f"   • Subjects: {db.query(Subject).count()}")
@@ -3,11 +3,19 @@ LangChain AI Coaching Agent.
 Compatible with Gemini (default) and OpenAI (via LLM_PROVIDER env var).
 Falls back to helpful static responses when LLM not configured.
 """
-from typing import List
+from contextlib import aclosing
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 from sqlalchemy.orm import Session
-from config import settings
+from database import run_in_session
 from schemas import ChatMessage
+from services.coach_cache import cache_response, coach_cache_key, get_cached_response
+from services.context_cache import ContextVersion, cache_context, context_version, get_cached_context
+from services.conversation_service import load_memory, remember_exchange
+from services.llm_gate import LLMOverloaded, get_llm_gate, prompt_key
+from services.llm_registry import get_llm, get_llm_model_name
 import json
+import re
+import time
 
 
 SYSTEM_PROMPT = """You are LearnBot, a warm, encouraging, and expert AI learning coach.
@@ -29,23 +37,7 @@ When responding:
 """
 
 
-def _get_llm():
-    """Initialize LLM — returns None if not configured (graceful degradation)."""
-    try:
-        if settings.LLM_PROVIDER == "openai" and settings.OPENAI_API_KEY:
-            from langchain_openai import ChatOpenAI
-            return ChatOpenAI(model="gpt-4o-mini", openai_api_key=settings.OPENAI_API_KEY, temperature=0.7)
-        elif settings.GEMINI_API_KEY and settings.GEMINI_API_KEY not in ("", "your_gemini_api_key_here"):
-            from langchain_google_genai import ChatGoogleGenerativeAI
-            return ChatGoogleGenerativeAI(
-                model="gemini-1.5-flash",
-                google_api_key=settings.GEMINI_API_KEY,
-                temperature=0.7,
-                convert_system_message_to_human=True,
-            )
-    except ImportError:
-        pass
-    return None
+NO_DATA_CONTEXT = "The student has not completed any tests yet."
 
 
 def _build_student_context(student_id: str, db: Session) -> str:
@@ -58,7 +50,7 @@ def _build_student_context(student_id: str, db: Session) -> str:
         .all()
     )
     if not topic_perfs:
-        return "The student has not completed any tests yet."
+        return NO_DATA_CONTEXT
 
     weak = [tp.topic for tp in topic_perfs if tp.weakness_score > 0.5]
     strong = [tp.topic for tp in topic_perfs if tp.weakness_score < 0.25]
@@ -68,49 +60,187 @@ def _build_student_context(student_id: str, db: Session) -> str:
         f"Strong topics: {', '.join(strong[:3]) if strong else 'None identified yet'}",
     ]
 
-    plan = db.query(RevisionPlan).filter(
+    plan_data = db.query(RevisionPlan.plan_data).filter(
         RevisionPlan.student_id == student_id,
         RevisionPlan.is_active == True
-    ).first()
-    if plan:
-        plan_data = json.loads(plan.plan_data)
-        if plan_data:
-            today_topics = [s["topic"] for s in plan_data[0].get("sessions", [])]
-            if today_topics:
-                ctx.append(f"Today's plan: {', '.join(today_topics)}")
+    ).scalar()
+    first_day = _first_plan_day(plan_data) if plan_data else None
+    if first_day:
+        today_topics = [s["topic"] for s in first_day.get("sessions", [])]
+        if today_topics:
+            ctx.append(f"Today's plan: {', '.join(today_topics)}")
     return "\n".join(ctx)
 
 
+def _first_plan_day(plan_data: str) -> Optional[dict]:
+    """Decode only day 1 of a stored plan (a JSON list of day objects)."""
+    start = plan_data.find("{")
+    if start < 0:
+        return None
+    day, _ = json.JSONDecoder().raw_decode(plan_data, start)
+    return day
+
+
+def _cached_student_context(db: Session, student_id: str) -> Tuple[ContextVersion, str]:
+    version = context_version(db, student_id)
+    context = get_cached_context(student_id, version)
+    if context is None:
+        context = _build_student_context(student_id, db)
+        cache_context(student_id, version, context)
+    return version, context
+
+
+async def _student_context(student_id: str) -> Tuple[ContextVersion, str]:
+    """Rendered context for the prompt and its version; cached until the version moves."""
+    return await run_in_session(_cached_student_context, student_id)
+
+
+async def _prepare_turn(student_id: str, message: str, history: List[ChatMessage], summary: str = ""):
+    """LangChain messages for this turn plus its response-cache key (None when not cacheable)."""
+    from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+    version, student_context = await _student_context(student_id)
+    full_system = f"{SYSTEM_PROMPT}\n\n--- Student Context ---\n{student_context}\n--- End Context ---"
+    if summary:
+        full_system += f"\n\n--- Earlier In This Conversation ---\n{summary}\n--- End Summary ---"
+
+    messages = [SystemMessage(content=full_system)]
+    # Already bounded: the last 10 client-sent messages, or the session's unsummarized turns
+    for msg in history:
+        if msg.role == "user":
+            messages.append(HumanMessage(content=msg.content))
+        elif msg.role == "assistant":
+            messages.append(AIMessage(content=msg.content))
+    messages.append(HumanMessage(content=message))
+
+    # Only first turns are cached: with history the answer depends on the conversation
+    cache_key = None
+    if not history and not summary:
+        cache_key = coach_cache_key(
+            get_llm_model_name(), student_id, student_context, message,
+            personalized=student_context != NO_DATA_CONTEXT, version=version,
+        )
+    return messages, cache_key
+
+
 async def get_coach_response(
     student_id: str,
     message: str,
     history: List[ChatMessage],
-    db: Session
+    session_id: Optional[str] = None,
 ) -> str:
-    llm = _get_llm()
+    """
+    With a session_id the conversation memory is kept server-side and the
+    client-sent history is ignored. Each database step runs in a short
+    session of its own, so no connection is held while the LLM answers.
+    """
+    memory = await run_in_session(load_memory, student_id, session_id) if session_id else None
+    response = await _answer(
+        student_id, message, memory.recent if memory else history[-10:], memory.summary if memory else ""
+    )
+    if session_id:
+        await remember_exchange(student_id, session_id, message, response)
+    return response
+
+
+async def _answer(student_id: str, message: str, history: List[ChatMessage], summary: str) -> str:
+    llm = get_llm()
     if llm is None:
         return _static_response(message)
 
     try:
-        from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-        student_context = _build_student_context(student_id, db)
-        full_system = f"{SYSTEM_PROMPT}\n\n--- Student Context ---\n{student_context}\n--- End Context ---"
-
-        messages = [SystemMessage(content=full_system)]
-        for msg in history[-10:]:
-            if msg.role == "user":
-                messages.append(HumanMessage(content=msg.content))
-            elif msg.role == "assistant":
-                messages.append(AIMessage(content=msg.content))
-        messages.append(HumanMessage(content=message))
-
-        response = await llm.ainvoke(messages)
-        return response.content
+        messages, cache_key = await _prepare_turn(student_id, message, history, summary)
+        if cache_key is not None:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                return cached
+
+        async def _call() -> str:
+            started = time.perf_counter()
+            response = await llm.ainvoke(messages)
+            if cache_key is not None:
+                cache_response(cache_key, response.content, time.perf_counter() - started)
+            return response.content
+
+        # Admission control; identical prompts already in flight share that call
+        return await get_llm_gate().run(prompt_key(get_llm_model_name(), messages), student_id, _call)
+    except LLMOverloaded:
+        raise
     except Exception as e:
         print(f"⚠️  LLM error: {e}")
         return _static_response(message)
 
 
+def _word_chunks(text: str) -> Iterator[str]:
+    """Split a finished answer into word-sized stream chunks (whitespace kept)."""
+    return (m.group(0) for m in re.finditer(r"\s*\S+\s*", text))
+
+
+async def stream_coach_response(
+    student_id: str,
+    message: str,
+    history: List[ChatMessage],
+    session_id: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """
+    Same answer as get_coach_response, yielded chunk by chunk as the LLM
+    produces it (llm.astream). Demo-mode and cached answers are replayed in
+    word chunks. Closing the generator cancels the upstream LLM call. A
+    provider failure after the first chunk is raised; only complete answers
+    are added to the session memory or the response cache.
+    """
+    memory = await run_in_session(load_memory, student_id, session_id) if session_id else None
+    parts = []
+    answer = _stream_answer(
+        student_id, message, memory.recent if memory else history[-10:], memory.summary if memory else ""
+    )
+    async with aclosing(answer) as chunks:
+        async for chunk in chunks:
+            parts.append(chunk)
+            yield chunk
+    if session_id:
+        await remember_exchange(student_id, session_id, message, "".join(parts))
+
+
+async def _stream_answer(
+    student_id: str, message: str, history: List[ChatMessage], summary: str
+) -> AsyncIterator[str]:
+    llm = get_llm()
+    if llm is None:
+        for chunk in _word_chunks(_static_response(message)):
+            yield chunk
+        return
+
+    sent_any = False
+    try:
+        messages, cache_key = await _prepare_turn(student_id, message, history, summary)
+        if cache_key is not None:
+            cached = get_cached_response(cache_key)
+            if cached is not None:
+                for chunk in _word_chunks(cached):
+                    yield chunk
+                return
+
+        async with get_llm_gate().slot(student_id):
+            started = time.perf_counter()
+            parts = []
+            async with aclosing(llm.astream(messages)) as stream:
+                async for chunk in stream:
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        sent_any = True
+                        yield chunk.content
+        if cache_key is not None:
+            cache_response(cache_key, "".join(parts), time.perf_counter() - started)
+    except LLMOverloaded:
+        raise
+    except Exception as e:
+        print(f"⚠️  LLM error: {e}")
+        if sent_any:
+            raise  # too late for the fallback: the client already has part of an answer
+        for chunk in _word_chunks(_static_response(message)):
+            yield chunk
+
+
 def _static_response(message: str) -> str:
     msg = message.lower()
     if any(w in msg for w in ["weak", "struggling", "hard", "difficult", "fail"]):
@@ -0,0 +1,151 @@
+"""
+Compiled answer keys for scoring.
+Each test's key is loaded once (ids, correct options and topics only — no
+question text) into compact arrays, cached in process, and scored with a
+tight loop or, for large tests, NumPy. Keys carry the content version they
+were compiled at (services.content_version), so a question write made by any
+process is picked up; writers call catalog_service.notify_content_changed().
+"""
+import sys
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from config import settings
+from models import Question
+from services.cache import LRUCache
+from services.content_version import content_version
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python loop is always available
+    np = None
+
+NUMPY_MIN_QUESTIONS = 256
+
+_cache = LRUCache(
+    max_size=settings.ANSWER_KEY_CACHE_SIZE,
+    ttl_seconds=settings.ANSWER_KEY_CACHE_TTL_SECONDS,
+)
+
+
+class AnswerKey:
+    """Immutable, compact answer key for one mock test."""
+
+    __slots__ = ("test_id", "question_ids", "answer_keys", "correct", "topic_index",
+                 "topics", "topic_totals", "_np")
+
+    def __init__(self, test_id: int, rows: Iterable[Tuple[int, int, str]]):
+        topic_slots: Dict[str, int] = {}
+        self.test_id = test_id
+        self.question_ids = array("q")
+        self.correct = array("q")
+        self.topic_index = array("I")
+        for qid, correct_answer, topic in rows:
+            self.question_ids.append(qid)
+            self.correct.append(correct_answer)
+            self.topic_index.append(topic_slots.setdefault(sys.intern(topic), len(topic_slots)))
+        self.topics: Tuple[str, ...] = tuple(topic_slots)
+        # Submitted answers are keyed by str(question_id); build those keys once
+        self.answer_keys: Tuple[str, ...] = tuple(str(qid) for qid in self.question_ids)
+        self.topic_totals = [0] * len(self.topics)
+        for t in self.topic_index:
+            self.topic_totals[t] += 1
+        self._np = None
+        if np is not None and len(self.question_ids) >= NUMPY_MIN_QUESTIONS:
+            self._np = (
+                np.frombuffer(self.question_ids, dtype=np.int64),
+                np.frombuffer(self.correct, dtype=np.int64),
+                np.frombuffer(self.topic_index, dtype=np.uint32),
+            )
+
+    def __len__(self) -> int:
+        return len(self.question_ids)
+
+    def score(self, answers: Dict[str, int]) -> dict:
+        """Score submitted {question_id: option} answers against this key."""
+        if self._np is not None:
+            return self._score_numpy(answers)
+
+        get = answers.get
+        topic_correct = [0] * len(self.topics)
+        correct_ids: List[int] = []
+        incorrect_ids: List[int] = []
+        for key, qid, expected, t in zip(self.answer_keys, self.question_ids, self.correct, self.topic_index):
+            if get(key) == expected:
+                correct_ids.append(qid)
+                topic_correct[t] += 1
+            else:
+                incorrect_ids.append(qid)
+        return self._result(correct_ids, incorrect_ids, topic_correct)
+
+    def _score_numpy(self, answers: Dict[str, int]) -> dict:
+        qids, expected, topic_index = self._np
+        get = answers.get
+        submitted = np.fromiter(
+            (-1 if (v := get(k)) is None else v for k in self.answer_keys),
+            dtype=np.int64, count=len(self.answer_keys),
+        )
+        mask = submitted == expected
+        topic_correct = np.bincount(topic_index, weights=mask, minlength=len(self.topics))
+        return self._result(
+            qids[mask].tolist(),
+            qids[~mask].tolist(),
+            topic_correct.astype(np.int64).tolist(),
+        )
+
+    def _result(self, correct_ids: List[int], incorrect_ids: List[int], topic_correct: List[int]) -> dict:
+        return {
+            "score": len(correct_ids),
+            "total": len(self.question_ids),
+            "correct_questions": correct_ids,
+            "incorrect_questions": incorrect_ids,
+            "topic_breakdown": {
+                topic: {"correct": topic_correct[i], "total": self.topic_totals[i]}
+                for i, topic in enumerate(self.topics)
+            },
+        }
+
+
+def get_answer_keys(db: Session, test_ids: Iterable[int]) -> Dict[int, AnswerKey]:
+    """Return compiled keys for the given tests, loading all misses in one query."""
+    version = content_version(db)
+    keys: Dict[int, AnswerKey] = {}
+    missing = []
+    for test_id in set(test_ids):
+        entry = _cache.get(test_id)
+        if entry is None or entry[0] != version:
+            missing.append(test_id)
+        else:
+            keys[test_id] = entry[1]
+
+    if missing:
+        rows_by_test: Dict[int, list] = {}
+        rows = (
+            db.query(Question.test_id, Question.id, Question.correct_answer, Question.topic)
+            .filter(Question.test_id.in_(missing))
+            .order_by(Question.test_id, Question.id)
+            .all()
+        )
+        for test_id, qid, correct_answer, topic in rows:
+            rows_by_test.setdefault(test_id, []).append((qid, correct_answer, topic))
+        for test_id, test_rows in rows_by_test.items():
+            key = AnswerKey(test_id, test_rows)
+            _cache.set(test_id, (version, key))
+            keys[test_id] = key
+    return keys
+
+
+def get_answer_key(db: Session, test_id: int) -> Optional[AnswerKey]:
+    return get_answer_keys(db, [test_id]).get(test_id)
+
+
+def invalidate_answer_keys(test_id: Optional[int] = None) -> None:
+    """Drop one test's compiled key, or every key when test_id is None."""
+    if test_id is None:
+        _cache.clear()
+    else:
+        _cache.invalidate(test_id)
+
+
+def answer_key_cache_stats() -> dict:
+    return _cache.stats()
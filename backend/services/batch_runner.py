@@ -0,0 +1,60 @@
+"""
+Batch job runner.
+Shared by the offline jobs (weakness recompute, plan generation): runs a task
+function over a stream of tasks, in process or across a process pool, keeping
+a bounded number of tasks in flight, and tracks run totals for progress lines.
+"""
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable
+
+
+def _init_worker() -> None:
+    from database import engine
+    engine.dispose(close=False)  # never share pooled connections inherited from the parent
+
+
+def run_batch(
+    fn: Callable[[Any], Dict],
+    tasks: Iterable[Any],
+    workers: int,
+    on_result: Callable[[Dict], None],
+) -> None:
+    """Call fn(task) for every task and hand each result to on_result as it completes."""
+    if workers <= 1:
+        for task in tasks:
+            on_result(fn(task))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending = set()
+        for task in tasks:
+            # Keep a bounded number of tasks in flight so lazy task streams stay streamed
+            if len(pending) >= workers * 2:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    on_result(future.result())
+            pending.add(pool.submit(fn, task))
+        for future in wait(pending).done:
+            on_result(future.result())
+
+
+class BatchTotals:
+    """Running sums of the counters the task results report, plus elapsed time."""
+
+    def __init__(self, *counters: str):
+        self.counts = dict.fromkeys(counters, 0)
+        self.started = time.perf_counter()
+
+    def add(self, result: Dict) -> None:
+        for name in self.counts:
+            self.counts[name] += result[name]
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def rate(self, name: str) -> float:
+        return self.counts[name] / max(self.elapsed(), 1e-9)
+
+    def summary(self) -> Dict:
+        return {**self.counts, "seconds": round(self.elapsed(), 2)}
@@ -0,0 +1,106 @@
+"""
+Catalog service.
+Builds the full domain → subject → test tree (with question counts) from a
+single grouped query and caches it as pre-serialized JSON with a content
+hash stamp (the ETag). The cached entry is tied to the database content
+version (services.content_version), so after a reseed or admin edit in any
+process the tree is rebuilt and the ETag changes.
+"""
+import hashlib
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from config import settings
+from models import Domain, Subject, MockTest, Question
+from schemas import CatalogResponse, CatalogDomain, CatalogSubject, CatalogTest
+from services.cache import LRUCache
+from services.question_cache import invalidate_questions
+from services.answer_key import invalidate_answer_keys
+from services.content_version import bump_content_version
+
+_CATALOG_KEY = "catalog"
+_cache = LRUCache(max_size=1, ttl_seconds=settings.CATALOG_CACHE_TTL_SECONDS)
+
+
+def build_catalog(db: Session) -> Tuple[str, bytes]:
+    """Return (version, JSON body) for the whole catalog tree."""
+    counts = (
+        select(Question.test_id, func.count(Question.id).label("question_count"))
+        .group_by(Question.test_id)
+        .subquery()
+    )
+    rows = db.execute(
+        select(
+            Domain.id.label("domain_id"), Domain.name.label("domain_name"),
+            Domain.description.label("domain_description"), Domain.icon,
+            Subject.id.label("subject_id"), Subject.name.label("subject_name"),
+            Subject.description.label("subject_description"),
+            MockTest.id.label("test_id"), MockTest.name.label("test_name"),
+            MockTest.description.label("test_description"),
+            MockTest.difficulty, MockTest.duration_minutes,
+            func.coalesce(counts.c.question_count, 0).label("question_count"),
+        )
+        .outerjoin(Subject, Subject.domain_id == Domain.id)
+        .outerjoin(MockTest, MockTest.subject_id == Subject.id)
+        .outerjoin(counts, counts.c.test_id == MockTest.id)
+        .order_by(Domain.name, Subject.name, MockTest.id)
+    ).all()
+
+    domains: Dict[int, CatalogDomain] = {}
+    subjects: Dict[int, CatalogSubject] = {}
+    for r in rows:
+        domain = domains.get(r.domain_id)
+        if domain is None:
+            domain = domains[r.domain_id] = CatalogDomain(
+                id=r.domain_id, name=r.domain_name,
+                description=r.domain_description, icon=r.icon, subjects=[],
+            )
+        if r.subject_id is None:
+            continue
+        subject = subjects.get(r.subject_id)
+        if subject is None:
+            subject = subjects[r.subject_id] = CatalogSubject(
+                id=r.subject_id, name=r.subject_name,
+                description=r.subject_description, tests=[],
+            )
+            domain.subjects.append(subject)
+        if r.test_id is not None:
+            subject.tests.append(CatalogTest(
+                id=r.test_id, name=r.test_name, description=r.test_description,
+                difficulty=r.difficulty, duration_minutes=r.duration_minutes,
+                question_count=r.question_count,
+            ))
+
+    tree = list(domains.values())
+    # Content-derived stamp: identical content always yields the same version
+    version = hashlib.sha1(
+        CatalogResponse(version="", domains=tree).model_dump_json().encode()
+    ).hexdigest()[:16]
+    return version, CatalogResponse(version=version, domains=tree).model_dump_json().encode()
+
+
+def get_cached_catalog(content_version: int) -> Optional[Tuple[str, bytes]]:
+    entry = _cache.get(_CATALOG_KEY)
+    if entry is None or entry[0] != content_version:
+        return None
+    return entry[1]
+
+
+def cache_catalog(content_version: int, entry: Tuple[str, bytes]) -> None:
+    _cache.set(_CATALOG_KEY, (content_version, entry))
+
+
+def notify_content_changed(db: Session, test_id: Optional[int] = None) -> None:
+    """
+    Invalidation hook for catalog/question writes (seed, admin tools).
+    Bumps the content version in the writer's transaction (the caller commits),
+    which every process's content caches check, and drops this process's copies.
+    """
+    bump_content_version(db)
+    invalidate_questions(test_id)
+    invalidate_answer_keys(test_id)
+    _cache.clear()
+
+
+def catalog_cache_stats() -> dict:
+    return _cache.stats()
@@ -0,0 +1,184 @@
+"""
+AI coach response cache.
+Answers are keyed by (provider/model, scope, student-context hash, normalized
+message), so a repeated question is answered without another LLM round trip.
+The scope is the student id whenever the prompt carried that student's
+performance context; only context-free prompts share a scope across students,
+so a personalized answer is never served to anyone else. A personalized hash
+also covers the student's context version, so the next submission retires the
+answer even when the rendered context reads the same.
+
+An optional semantic tier (COACH_SEMANTIC_CACHE) also reuses an answer for a
+near-duplicate question in the same scope and context: messages are embedded
+with the local hashed TF-IDF embedder (services.local_index) into a fixed-size
+ring of vectors, and the best match above COACH_SEMANTIC_THRESHOLD wins.
+"""
+import hashlib
+import threading
+from typing import Any, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from config import settings
+from services.cache import LRUCache
+from services.embedding_cache import normalize_text
+from services.local_index import HashedTfidfEmbedder
+
+SHARED_SCOPE = "*"
+
+
+class CoachCacheKey(NamedTuple):
+    model: str
+    scope: str
+    context_hash: str
+    message: str
+
+
+def normalize_message(message: str) -> str:
+    return normalize_text(message).rstrip("?!. ")
+
+
+def coach_cache_key(
+    model: str, student_id: str, student_context: str, message: str, personalized: bool, version: Any = None,
+) -> CoachCacheKey:
+    stamp = f"{version}\n{student_context}" if personalized else student_context
+    context_hash = hashlib.sha256(stamp.encode()).hexdigest()[:16]
+    scope = student_id if personalized else SHARED_SCOPE
+    return CoachCacheKey(model, scope, context_hash, normalize_message(message))
+
+
+class _SemanticIndex:
+    """Ring of L2-normalized message vectors; each slot remembers the exact key it stands for."""
+
+    def __init__(self, capacity: int, dim: int):
+        self.embedder = HashedTfidfEmbedder(dim)
+        self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self.groups = np.zeros(capacity, dtype=np.int64)
+        self.keys: list = [None] * capacity
+        self.next = 0
+
+    @staticmethod
+    def _group(key: CoachCacheKey) -> int:
+        # Same model, scope and context: the only answers a near-duplicate may reuse
+        digest = hashlib.blake2b("\0".join(key[:3]).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little", signed=True)
+
+    def _embed(self, message: str) -> Optional[np.ndarray]:
+        idx, vals = self.embedder.embed_sparse(message)
+        if not len(idx):
+            return None
+        vector = np.zeros(self.embedder.dim, dtype=np.float32)
+        np.add.at(vector, idx, vals)
+        return vector
+
+    def add(self, key: CoachCacheKey) -> None:
+        vector = self._embed(key.message)
+        if vector is None:
+            return
+        slot = self.next % len(self.keys)
+        self.vectors[slot] = vector
+        self.groups[slot] = self._group(key)
+        self.keys[slot] = key
+        self.next += 1
+
+    def nearest(self, key: CoachCacheKey, threshold: float) -> Optional[CoachCacheKey]:
+        vector = self._embed(key.message)
+        if vector is None:
+            return None
+        candidates = np.flatnonzero(self.groups == self._group(key))
+        if not len(candidates):
+            return None
+        scores = self.vectors[candidates] @ vector
+        best = int(np.argmax(scores))
+        match = self.keys[candidates[best]]
+        if scores[best] < threshold or match is None or match[:3] != key[:3]:
+            return None
+        return match
+
+
+class CoachResponseCache:
+    def __init__(self, max_size: int, ttl_seconds: Optional[float], semantic: bool, threshold: float, dim: int):
+        self.exact = LRUCache(max_size, ttl_seconds)
+        self.semantic = _SemanticIndex(max(1, max_size), dim) if semantic else None
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.hits = 0
+        self.semantic_hits = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+        self.saved_seconds = 0.0
+
+    def _avg_llm_seconds(self) -> float:
+        return self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+
+    def get(self, key: CoachCacheKey) -> Optional[str]:
+        self.lookups += 1
+        response = self.exact.get(key)
+        if response is None and self.semantic is not None:
+            with self._lock:
+                match = self.semantic.nearest(key, self.threshold)
+            if match is not None:
+                response = self.exact.get(match)
+                if response is not None:
+                    self.semantic_hits += 1
+        if response is not None:
+            self.hits += 1
+            self.saved_seconds += self._avg_llm_seconds()
+        return response
+
+    def put(self, key: CoachCacheKey, response: str, llm_seconds: float) -> None:
+        """Store a fresh LLM answer; llm_seconds feeds the saved-latency estimate."""
+        self.llm_calls += 1
+        self.llm_seconds += llm_seconds
+        self.exact.set(key, response)
+        if self.semantic is not None:
+            with self._lock:
+                self.semantic.add(key)
+
+    def clear(self) -> None:
+        self.exact.clear()
+        if self.semantic is not None:
+            with self._lock:
+                self.semantic = _SemanticIndex(len(self.semantic.keys), self.semantic.embedder.dim)
+
+    def stats(self) -> Dict[str, Any]:
+        exact = self.exact.stats()
+        return {
+            "size": exact["size"],
+            "max_size": exact["max_size"],
+            "evictions": exact["evictions"],
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "semantic_enabled": self.semantic is not None,
+            "semantic_hits": self.semantic_hits,
+            "llm_calls": self.llm_calls,
+            "avg_llm_seconds": round(self._avg_llm_seconds(), 3),
+            "saved_seconds": round(self.saved_seconds, 2),
+        }
+
+
+_cache = CoachResponseCache(
+    max_size=settings.COACH_CACHE_SIZE,
+    ttl_seconds=settings.COACH_CACHE_TTL_SECONDS,
+    semantic=settings.COACH_SEMANTIC_CACHE,
+    threshold=settings.COACH_SEMANTIC_THRESHOLD,
+    dim=settings.LOCAL_INDEX_DIM,
+)
+
+
+def get_cached_response(key: CoachCacheKey) -> Optional[str]:
+    return _cache.get(key)
+
+
+def cache_response(key: CoachCacheKey, response: str, llm_seconds: float) -> None:
+    _cache.put(key, response, llm_seconds)
+
+
+def clear_coach_cache() -> None:
+    _cache.clear()
+
+
+def coach_cache_stats() -> Dict[str, Any]:
+    return _cache.stats()
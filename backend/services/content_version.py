@@ -0,0 +1,73 @@
+"""
+Content version.
+A single database row counting writes to the test content (domains, subjects,
+tests, questions). The in-process content caches (question payloads, compiled
+answer keys, the catalog) remember the version they were built at and treat
+an entry from another version as a miss, so a reseed or admin edit made by
+any process reaches every worker. Each process re-reads the row at most every
+CONTENT_VERSION_CHECK_SECONDS.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import dialect_insert
+from models import ContentVersion
+
+_ROW_ID = 1
+
+
+class _VersionProbe:
+    """Last version read from the database and when it was read."""
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def fresh(self) -> Optional[int]:
+        with self._lock:
+            if self.version is None or time.monotonic() - self.checked_at >= settings.CONTENT_VERSION_CHECK_SECONDS:
+                return None
+            return self.version
+
+    def store(self, version: int) -> None:
+        with self._lock:
+            self.version = version
+            self.checked_at = time.monotonic()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.version = None
+
+
+_probe = _VersionProbe()
+
+
+def cached_content_version() -> Optional[int]:
+    """The content version if it was read recently enough, else None (call content_version)."""
+    return _probe.fresh()
+
+
+def content_version(db: Session) -> int:
+    """Current content version (0 before any content write was recorded)."""
+    version = _probe.fresh()
+    if version is None:
+        version = db.query(ContentVersion.version).filter(ContentVersion.id == _ROW_ID).scalar() or 0
+        _probe.store(version)
+    return version
+
+
+def bump_content_version(db: Session) -> None:
+    """Record a content write; runs in the writer's transaction, the caller commits."""
+    insert = dialect_insert(db)
+    stmt = insert(ContentVersion).values(id=_ROW_ID, version=1, updated_at=datetime.utcnow())
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[ContentVersion.id],
+        set_={"version": ContentVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+    ))
+    _probe.reset()
@@ -0,0 +1,57 @@
+"""
+Student context cache.
+Holds the rendered coach-prompt context of each student, so follow-up chat
+turns skip the TopicPerformance and RevisionPlan queries. Each entry is stamped
+with the context version it was rendered from: the student's
+StudentSummary.performance_version (moved by every attempt submission and
+weakness recompute) and the id of the active plan (new on every regeneration).
+Both live in the database, so a write made by any worker or offline job makes
+the entry stale on the next lookup; the TTL only bounds memory.
+"""
+from typing import Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from config import settings
+from models import RevisionPlan, StudentSummary
+from services.cache import LRUCache
+
+ContextVersion = Tuple[int, Optional[int]]  # (performance_version, active plan id)
+
+_cache = LRUCache(
+    max_size=settings.CONTEXT_CACHE_SIZE,
+    ttl_seconds=settings.CONTEXT_CACHE_TTL_SECONDS,
+)
+
+
+def context_version(db: Session, student_id: str) -> ContextVersion:
+    """The student's current context version, in one query on two indexed lookups."""
+    performance = (
+        db.query(StudentSummary.performance_version)
+        .filter(StudentSummary.student_id == student_id)
+        .scalar_subquery()
+    )
+    plan = (
+        db.query(RevisionPlan.id)
+        .filter(RevisionPlan.student_id == student_id, RevisionPlan.is_active == True)
+        .order_by(RevisionPlan.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    version, plan_id = db.query(performance, plan).one()
+    return version or 0, plan_id
+
+
+def get_cached_context(student_id: str, version: ContextVersion) -> Optional[str]:
+    entry = _cache.get(student_id)
+    if entry is None or entry[0] != version:
+        return None
+    return entry[1]
+
+
+def cache_context(student_id: str, version: ContextVersion, context: str) -> None:
+    _cache.set(student_id, (version, context))
+
+
+def context_cache_stats() -> dict:
+    return _cache.stats()
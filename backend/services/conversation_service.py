@@ -0,0 +1,215 @@
+"""
+Server-side conversation memory for the AI coach.
+A chat session (student_id + client-chosen session_id) keeps its last
+CHAT_MEMORY_TURNS exchanges verbatim plus a rolling summary of everything
+older, so clients send only the new message and the prompt stays bounded
+however long the conversation gets. Once CHAT_SUMMARY_BATCH older exchanges
+have piled up, a background task folds them into the summary (with the LLM
+when one is configured) and deletes them, off the request path; until then
+the prompt carries them verbatim.
+"""
+import asyncio
+from datetime import datetime
+from typing import List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session
+
+from config import settings
+from database import SessionLocal, dialect_insert, run_in_session
+from models import Conversation, ConversationTurn
+from schemas import ChatMessage
+from services.llm_gate import LLMOverloaded, get_llm_gate
+from services.llm_registry import get_llm
+
+SUMMARY_PROMPT = """You maintain the running summary of a tutoring chat between a student and LearnBot, an AI learning coach.
+Merge the new messages into the current summary. Keep what matters for later turns:
+the student's goals, topics discussed, difficulties and misconceptions, and advice already given.
+Write plain prose, at most 120 words."""
+
+
+class ConversationMemory(NamedTuple):
+    summary: str
+    recent: List[ChatMessage]
+
+
+def _recent_messages() -> int:
+    return max(0, settings.CHAT_MEMORY_TURNS) * 2
+
+
+def _get_conversation(db: Session, student_id: str, session_id: str) -> Optional[Conversation]:
+    return db.query(Conversation).filter(
+        Conversation.student_id == student_id,
+        Conversation.session_id == session_id,
+    ).first()
+
+
+def load_memory(db: Session, student_id: str, session_id: str) -> ConversationMemory:
+    """
+    Summary plus every turn not folded into it yet (empty for a new session).
+    That is the recent window plus any turns still waiting for the background
+    fold, so nothing drops out of the prompt between the two.
+    """
+    conversation = _get_conversation(db, student_id, session_id)
+    if conversation is None:
+        return ConversationMemory("", [])
+    turns = (
+        db.query(ConversationTurn.role, ConversationTurn.content)
+        .filter(
+            ConversationTurn.conversation_id == conversation.id,
+            ConversationTurn.seq >= conversation.summarized_through,
+        )
+        .order_by(ConversationTurn.seq)
+        .all()
+    )
+    recent = [ChatMessage(role=role, content=content) for role, content in turns]
+    return ConversationMemory(conversation.summary or "", recent)
+
+
+def append_exchange(db: Session, student_id: str, session_id: str, message: str, response: str) -> bool:
+    """Store one user/assistant exchange; True when older turns are due for summarization."""
+    now = datetime.utcnow()
+    insert = dialect_insert(db)
+    db.execute(
+        insert(Conversation)
+        .values(
+            student_id=student_id, session_id=session_id, summary="",
+            summarized_through=0, turn_count=0, created_at=now, updated_at=now,
+        )
+        .on_conflict_do_nothing(index_elements=[Conversation.student_id, Conversation.session_id])
+    )
+    # Reserve two seqs in one statement: concurrent requests for the same
+    # session serialize on the row instead of reading the same turn_count
+    conversation_id, turn_count, summarized_through = db.execute(
+        update(Conversation)
+        .where(Conversation.student_id == student_id, Conversation.session_id == session_id)
+        .values(turn_count=Conversation.turn_count + 2, updated_at=now)
+        .returning(Conversation.id, Conversation.turn_count, Conversation.summarized_through)
+    ).one()
+    seq = turn_count - 2
+    db.add_all([
+        ConversationTurn(conversation_id=conversation_id, seq=seq, role="user", content=message),
+        ConversationTurn(conversation_id=conversation_id, seq=seq + 1, role="assistant", content=response),
+    ])
+    db.commit()
+    unsummarized = turn_count - _recent_messages() - summarized_through
+    return unsummarized >= max(1, settings.CHAT_SUMMARY_BATCH) * 2
+
+
+def _turns_to_fold(db: Session, student_id: str, session_id: str) -> Optional[Tuple]:
+    """(conversation id, current summary, summarized_through, fold_until, turns) or None."""
+    conversation = _get_conversation(db, student_id, session_id)
+    if conversation is None:
+        return None
+    fold_until = conversation.turn_count - _recent_messages()
+    if fold_until <= conversation.summarized_through:
+        return None
+    turns = (
+        db.query(ConversationTurn.role, ConversationTurn.content)
+        .filter(
+            ConversationTurn.conversation_id == conversation.id,
+            ConversationTurn.seq >= conversation.summarized_through,
+            ConversationTurn.seq < fold_until,
+        )
+        .order_by(ConversationTurn.seq)
+        .all()
+    )
+    return conversation.id, conversation.summary or "", conversation.summarized_through, fold_until, turns
+
+
+def _store_summary(db: Session, conversation_id: int, expected_through: int, fold_until: int, summary: str) -> None:
+    # Conditional on summarized_through so a concurrent refresh cannot fold the same turns twice
+    result = db.execute(
+        update(Conversation)
+        .where(Conversation.id == conversation_id, Conversation.summarized_through == expected_through)
+        .values(summary=summary, summarized_through=fold_until)
+    )
+    if result.rowcount:
+        db.execute(
+            delete(ConversationTurn).where(
+                ConversationTurn.conversation_id == conversation_id,
+                ConversationTurn.seq < fold_until,
+            )
+        )
+    db.commit()
+
+
+def _clip(summary: str) -> str:
+    limit = settings.CHAT_SUMMARY_MAX_CHARS
+    if len(summary) <= limit:
+        return summary
+    return "…" + summary[-limit:].split(" ", 1)[-1]
+
+
+def _extractive_summary(summary: str, turns) -> str:
+    """Demo-mode summary: the student's earlier questions, newest kept when clipped."""
+    asked = "; ".join(" ".join(content.split())[:120] for role, content in turns if role == "user")
+    if not asked:
+        return summary
+    if not summary:
+        return _clip(f"Earlier the student asked: {asked}.")
+    return _clip(f"{summary.rstrip('.')}; {asked}.")
+
+
+async def _llm_summary(summary: str, turns) -> Optional[str]:
+    llm = get_llm()
+    if llm is None:
+        return _extractive_summary(summary, turns)
+    from langchain_core.messages import HumanMessage, SystemMessage
+    transcript = "\n".join(f"{role}: {content}" for role, content in turns)
+    try:
+        async with get_llm_gate().slot():
+            response = await llm.ainvoke([
+                SystemMessage(content=SUMMARY_PROMPT),
+                HumanMessage(content=f"Current summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"),
+            ])
+        return _clip(response.content.strip())
+    except LLMOverloaded:
+        return None  # provider busy: retried after the next turn
+    except Exception as e:
+        print(f"⚠️  Conversation summary failed: {e} — using extractive summary")
+        return _extractive_summary(summary, turns)
+
+
+async def refresh_summary(student_id: str, session_id: str) -> None:
+    """Fold every turn older than the recent window into the session summary."""
+    def _with_session(fn, *args):
+        db = SessionLocal()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    pending = await asyncio.to_thread(_with_session, _turns_to_fold, student_id, session_id)
+    if pending is None:
+        return
+    conversation_id, summary, summarized_through, fold_until, turns = pending
+    new_summary = await _llm_summary(summary, turns)
+    if new_summary is not None:
+        await asyncio.to_thread(
+            _with_session, _store_summary, conversation_id, summarized_through, fold_until, new_summary
+        )
+
+
+_refreshing = {}  # (student_id, session_id) -> task; also keeps the tasks referenced
+
+
+def schedule_summary_refresh(student_id: str, session_id: str) -> None:
+    key = (student_id, session_id)
+    if key in _refreshing:
+        return
+    task = asyncio.create_task(refresh_summary(student_id, session_id))
+    _refreshing[key] = task
+
+    def _done(t: asyncio.Task) -> None:
+        _refreshing.pop(key, None)
+        if not t.cancelled() and t.exception() is not None:
+            print(f"⚠️  Conversation summary refresh failed: {t.exception()}")
+
+    task.add_done_callback(_done)
+
+
+async def remember_exchange(student_id: str, session_id: str, message: str, response: str) -> None:
+    """Persist the exchange (in a session of its own) and, when due, refresh the summary in the background."""
+    if await run_in_session(append_exchange, student_id, session_id, message, response):
+        schedule_summary_refresh(student_id, session_id)
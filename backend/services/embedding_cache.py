@@ -0,0 +1,139 @@
+"""
+Query-embedding cache.
+Two tiers keyed by (embedding model, normalized text): a bounded in-memory LRU
+in front of a small on-disk SQLite store, so a repeated topic is embedded once
+per model — even across restarts and worker processes.
+"""
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from services.cache import LRUCache
+
+
+def normalize_text(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class EmbeddingStore:
+    """On-disk tier: one row per (model, text) holding a float32 vector."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " model TEXT NOT NULL, text TEXT NOT NULL, vector BLOB NOT NULL,"
+            " PRIMARY KEY (model, text))"
+        )
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE model = ? AND text = ?", (model, text)
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        blob = np.asarray(vector, dtype=np.float32).tobytes()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO embeddings (model, text, vector) VALUES (?, ?, ?)",
+                (model, text, blob),
+            )
+            self._conn.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class EmbeddingCache:
+    def __init__(self, max_size: int, path: Optional[str]):
+        self.memory = LRUCache(max_size)
+        self.store = EmbeddingStore(path) if path else None
+        self.disk_hits = 0
+        self.embeds = 0
+
+    def get_or_embed(self, model: str, text: str, embed: Callable[[str], List[float]]) -> List[float]:
+        """Cached embedding of `text`; calls `embed` only on a miss in both tiers."""
+        key = (model, normalize_text(text))
+        vector = self.memory.get(key)
+        if vector is not None:
+            return vector
+        if self.store is not None:
+            vector = self.store.get(*key)
+            if vector is not None:
+                self.disk_hits += 1
+                self.memory.set(key, vector)
+                return vector
+        vector = list(embed(key[1]))
+        self.embeds += 1
+        self.memory.set(key, vector)
+        if self.store is not None:
+            self.store.put(model, key[1], vector)
+        return vector
+
+    def get_or_embed_many(
+        self, model: str, texts: List[str], embed_many: Callable[[List[str]], List[List[float]]]
+    ) -> List[List[float]]:
+        """Cached embeddings for several texts; all misses go to `embed_many` in one call."""
+        keys = [(model, normalize_text(t)) for t in texts]
+        vectors: Dict[tuple, List[float]] = {}
+        for key in dict.fromkeys(keys):
+            vector = self.memory.get(key)
+            if vector is None and self.store is not None:
+                vector = self.store.get(*key)
+                if vector is not None:
+                    self.disk_hits += 1
+                    self.memory.set(key, vector)
+            if vector is not None:
+                vectors[key] = vector
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing:
+            for key, vector in zip(missing, embed_many([text for _, text in missing])):
+                vector = list(vector)
+                vectors[key] = vector
+                self.embeds += 1
+                self.memory.set(key, vector)
+                if self.store is not None:
+                    self.store.put(model, key[1], vector)
+        return [vectors[key] for key in keys]
+
+    def clear(self) -> None:
+        self.memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "embeds": self.embeds,
+            "disk_path": self.store.path if self.store else None,
+        }
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EmbeddingCache(settings.EMBEDDING_CACHE_SIZE, settings.EMBEDDING_CACHE_PATH or None)
+    return _cache
+
+
+def embedding_cache_stats() -> Dict[str, Any]:
+    return get_embedding_cache().stats()
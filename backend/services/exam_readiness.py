@@ -0,0 +1,259 @@
+"""
+Exam readiness analysis.
+Mistake classification and score prediction shared by the single-student
+/exam-coach/analyze endpoint and the bulk path, which scores whole batches of
+students from columnar input (CSV, Parquet or Arrow IPC) with vectorized
+pandas/NumPy operations and yields one NDJSON report per student.
+"""
+import io
+import json
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+try:
+    import pandas as pd
+except ImportError:  # bulk analysis only
+    pd = None
+
+EXAM_WEIGHTAGE = {
+    "jee_main":     {"Mathematics": 33, "Physics": 33, "Chemistry": 34},
+    "jee_advanced": {"Mathematics": 33, "Physics": 33, "Chemistry": 34},
+    "eamcet_mpc":   {"Mathematics": 40, "Physics": 30, "Chemistry": 30},
+    "eamcet_bipc":  {"Biology": 50, "Physics": 25, "Chemistry": 25},
+    "neet":         {"Biology": 50, "Physics": 25, "Chemistry": 25},
+}
+
+EXAM_MAX_MARKS = {
+    "jee_main": 300,
+    "jee_advanced": 360,
+    "eamcet_mpc": 160,
+    "eamcet_bipc": 160,
+    "neet": 720,
+}
+
+DEFAULT_SUBJECT_WEIGHT = 33
+DEFAULT_MAX_MARKS = 300
+
+WEAK_BELOW = 85  # topics under this accuracy are reported
+# Mistake type by accuracy band: the first upper bound the accuracy is below
+MISTAKE_BANDS = (
+    ("Conceptual", 40),
+    ("Calculation", 60),
+    ("Careless", 75),
+    ("Time Pressure", 85),
+)
+# Slow answers count as time pressure even when moderately accurate
+SLOW_ANSWER_SECONDS = 120
+SLOW_MISTAKE_BELOW = 75
+PRIORITY_BANDS = (("High", 50), ("Medium", 70))  # anything else is "Low"
+
+BULK_COLUMNS = ("student", "subject", "topic", "accuracy", "time_taken_avg", "attempted")
+BULK_FORMATS = ("csv", "parquet", "arrow")
+NUMERIC_RANGES = (("accuracy", 0, 100), ("time_taken_avg", 0, np.inf), ("attempted", 0, np.inf))
+REPORT_BLOCK = 500  # students per yielded NDJSON chunk
+
+
+def classify_mistake(accuracy: float, time_taken_avg: float) -> str:
+    mistake = "Conceptual"
+    for mtype, upper in MISTAKE_BANDS:
+        if accuracy < upper:
+            mistake = mtype
+            break
+    if time_taken_avg > SLOW_ANSWER_SECONDS and accuracy < SLOW_MISTAKE_BELOW:
+        mistake = "Time Pressure"
+    return mistake
+
+
+def topic_priority(accuracy: float) -> str:
+    for priority, upper in PRIORITY_BANDS:
+        if accuracy < upper:
+            return priority
+    return "Low"
+
+
+def subject_max_marks(exam_type: str) -> Tuple[Dict[str, int], int]:
+    return EXAM_WEIGHTAGE.get(exam_type, {}), EXAM_MAX_MARKS.get(exam_type, DEFAULT_MAX_MARKS)
+
+
+def predict_score(subject_summary: Dict[str, float], exam_type: str) -> Tuple[float, int, float]:
+    """(predicted score, max marks, readiness %) from per-subject average accuracy."""
+    weightage, max_marks = subject_max_marks(exam_type)
+    predicted = 0.0
+    for subj, avg_acc in subject_summary.items():
+        w = weightage.get(subj, DEFAULT_SUBJECT_WEIGHT)
+        subject_marks = (w / 100) * max_marks
+        predicted += (avg_acc / 100) * subject_marks
+    readiness = round((predicted / max_marks) * 100, 1) if max_marks else 0
+    return round(predicted, 1), max_marks, readiness
+
+
+# ─── Bulk ───────────────────────────────────────────────────────────────────
+
+def _require_pandas() -> None:
+    if pd is None:
+        raise RuntimeError("Bulk analysis needs pandas (and pyarrow for Parquet/Arrow): pip install pandas pyarrow")
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> Optional[str]:
+    name = (filename or "").lower()
+    ctype = (content_type or "").lower()
+    if name.endswith(".csv") or "csv" in ctype:
+        return "csv"
+    if name.endswith((".parquet", ".pq")) or "parquet" in ctype:
+        return "parquet"
+    if name.endswith((".arrow", ".feather", ".ipc")) or "arrow" in ctype:
+        return "arrow"
+    return None
+
+
+def read_topic_scores(source, fmt: str) -> "pd.DataFrame":
+    """Load (student, subject, topic, accuracy, time_taken_avg, attempted) rows from bytes or a path."""
+    _require_pandas()
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if fmt == "csv":
+        try:
+            df = pd.read_csv(source, engine="pyarrow")
+        except ImportError:
+            df = pd.read_csv(source)
+    elif fmt == "parquet":
+        df = pd.read_parquet(source, columns=list(BULK_COLUMNS))
+    elif fmt == "arrow":
+        df = pd.read_feather(source, columns=list(BULK_COLUMNS))
+    else:
+        raise ValueError(f"Unsupported format '{fmt}' (expected one of: {', '.join(BULK_FORMATS)})")
+
+    missing = [c for c in BULK_COLUMNS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    _validate_topic_scores(df)
+    return df
+
+
+def _first_row(mask: "pd.Series") -> int:
+    return int(np.flatnonzero(mask.to_numpy())[0]) + 1
+
+
+def _validate_topic_scores(df: "pd.DataFrame") -> None:
+    """
+    Reject empty names and non-numeric, empty or out-of-range scores up front, so
+    the upload fails with a 422 instead of breaking the stream (or emitting NaN)
+    after the response has started. Numeric columns are converted in place.
+    """
+    for column in BULK_COLUMNS:
+        empty = df[column].isna()
+        if empty.any():
+            raise ValueError(f"Column '{column}' is empty in row {_first_row(empty)}")
+    for column, low, high in NUMERIC_RANGES:
+        try:
+            values = pd.to_numeric(df[column], errors="raise")
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Column '{column}' must be numeric: {e}")
+        bad = (values < low) | (values > high)
+        if bad.any():
+            row = _first_row(bad)
+            allowed = f"between {low:g} and {high:g}" if np.isfinite(high) else f"at least {low:g}"
+            raise ValueError(f"Column '{column}' must be {allowed}; row {row} has {values.iloc[row - 1]}")
+        df[column] = values
+
+
+def _band_codes(values: np.ndarray, uppers) -> np.ndarray:
+    """Index of the first band whose upper bound the value is below (len(uppers) if none)."""
+    return np.searchsorted(np.asarray(uppers, dtype=np.float64), values, side="right")
+
+
+def analyze_bulk(df: "pd.DataFrame", exam_type: str) -> Iterator[str]:
+    """
+    Readiness report of every student in df, as NDJSON chunks. Each line has
+    the /exam-coach/analyze response fields plus "student"; students keep
+    their first-appearance order and weak topics are sorted by accuracy.
+    """
+    _require_pandas()
+    student_codes, students = pd.factorize(df["student"], sort=False)
+    subject_codes, subjects = pd.factorize(df["subject"], sort=False)
+    subjects = [str(s) for s in subjects]
+    accuracy = df["accuracy"].to_numpy(dtype=np.float64)
+    time_taken = df["time_taken_avg"].to_numpy(dtype=np.float64)
+    n_students, n_subjects = len(students), len(subjects)
+
+    # Subject summary: mean accuracy per (student, subject) pair
+    pair = student_codes.astype(np.int64) * n_subjects + subject_codes
+    sums = np.bincount(pair, weights=accuracy, minlength=n_students * n_subjects)
+    counts = np.bincount(pair, minlength=n_students * n_subjects)
+    # Pairs grouped by student, each student's subjects in first-appearance order
+    pairs = pd.unique(pair)
+    pairs = pairs[np.argsort(pairs // n_subjects, kind="stable")]
+    pair_bounds = np.searchsorted(pairs // n_subjects, np.arange(n_students + 1))
+    means = [round(m, 1) for m in (sums[pairs] / counts[pairs]).tolist()]  # round() as in analyze_performance
+
+    # Predicted score from the rounded averages, summed per student in summary order
+    weightage, max_marks = subject_max_marks(exam_type)
+    subject_marks = np.array(
+        [(weightage.get(s, DEFAULT_SUBJECT_WEIGHT) / 100) * max_marks for s in subjects], dtype=np.float64
+    )
+    contributions = (np.array(means) / 100) * subject_marks[pairs % n_subjects]
+    # Added one subject position at a time, in the same order as predict_score, so floats round identically
+    starts, sizes = pair_bounds[:-1], np.diff(pair_bounds)
+    predicted = np.zeros(n_students)
+    for k in range(int(sizes.max(initial=0))):
+        has = sizes > k
+        predicted[has] += contributions[starts[has] + k]
+    pair_subjects = [subjects[c] for c in (pairs % n_subjects).tolist()]
+
+    # Weak topics: mistake type and priority bands, slow-answer override
+    weak = np.flatnonzero(accuracy < WEAK_BELOW)
+    weak_acc = accuracy[weak]
+    mistake_codes = np.minimum(_band_codes(weak_acc, [u for _, u in MISTAKE_BANDS]), len(MISTAKE_BANDS) - 1)
+    slow = (time_taken[weak] > SLOW_ANSWER_SECONDS) & (weak_acc < SLOW_MISTAKE_BELOW)
+    mistake_codes[slow] = [m for m, _ in MISTAKE_BANDS].index("Time Pressure")
+    priority_codes = _band_codes(weak_acc, [u for _, u in PRIORITY_BANDS])
+
+    # Group weak rows by student, ordered by accuracy (stable: ties keep input order)
+    order = np.lexsort((weak_acc, student_codes[weak]))
+    weak = weak[order]
+    bounds = np.searchsorted(student_codes[weak], np.arange(n_students + 1))
+
+    # Weak-topic objects are assembled from pre-encoded JSON pieces (each distinct
+    # string and accuracy encoded once) rather than json-encoding every dict;
+    # separators match json.dumps, so the lines are byte-for-byte the same.
+    encode = json.JSONEncoder(ensure_ascii=False).encode
+    topic_codes, topic_names = pd.factorize(df["topic"], sort=False)
+    topic_json = np.array([encode(t) for t in topic_names.tolist()] or [""], dtype=object)
+    subject_json = np.array([encode(s) for s in subjects] or [""], dtype=object)
+    mistake_json = np.array([encode(m) for m, _ in MISTAKE_BANDS], dtype=object)
+    priority_json = np.array([encode(p) for p, _ in PRIORITY_BANDS] + [encode("Low")], dtype=object)
+    acc_codes, acc_values = pd.factorize(weak_acc[order], sort=False)
+    acc_json = np.array(encode(acc_values.tolist())[1:-1].split(", "), dtype=object)
+    weak_topics = [
+        f'{{"topic": {t}, "subject": {sub}, "accuracy": {a}, "mistake_type": {m}, "priority": {p}}}'
+        for t, sub, a, m, p in zip(
+            topic_json[topic_codes[weak]].tolist(),
+            subject_json[subject_codes[weak]].tolist(),
+            acc_json[acc_codes].tolist(),
+            mistake_json[mistake_codes[order]].tolist(),
+            priority_json[priority_codes[order]].tolist(),
+        )
+    ]
+
+    predicted_list = predicted.tolist()
+    student_list = students.tolist()
+
+    lines = []
+    for s in range(n_students):
+        plo, phi = pair_bounds[s], pair_bounds[s + 1]
+        rest = encode({
+            "subject_summary": dict(zip(pair_subjects[plo:phi], means[plo:phi])),
+            "predicted_score": round(predicted_list[s], 1),
+            "max_score": max_marks,
+            "readiness_pct": round((predicted_list[s] / max_marks) * 100, 1) if max_marks else 0,
+        })
+        lines.append(
+            f'{{"student": {encode(student_list[s])}, '
+            f'"weak_topics": [{", ".join(weak_topics[bounds[s]:bounds[s + 1]])}], {rest[1:]}'
+        )
+        if len(lines) >= REPORT_BLOCK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
@@ -0,0 +1,162 @@
+"""
+Admission control for LLM calls.
+At most LLM_MAX_CONCURRENCY provider calls run at once; up to LLM_MAX_QUEUE
+more wait for a slot, and anything beyond that is rejected immediately with
+LLMOverloaded (the routers answer 429 + Retry-After) instead of piling onto a
+provider that is already rate limiting us. Identical prompts in flight share
+one call (single-flight), and LLM_MAX_PER_STUDENT optionally caps the slots
+and queue places a single student can hold.
+"""
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from config import settings
+
+
+class LLMOverloaded(Exception):
+    """The wait queue (or the student's share of it) is full; retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after: int, reason: str):
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+def prompt_key(model_name: str, messages) -> str:
+    """Identity of a prompt for coalescing: model plus every message's role and content."""
+    h = hashlib.sha256(model_name.encode())
+    for m in messages:
+        h.update(b"\0" + type(m).__name__.encode() + b"\0" + str(m.content).encode())
+    return h.hexdigest()
+
+
+class LLMGate:
+    def __init__(self, max_concurrency: int, max_queue: int, max_per_student: int, retry_after: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.max_per_student = max_per_student
+        self.retry_after = retry_after
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._per_student: Dict[str, int] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.coalesced = 0
+
+    def _hold(self, student_id: Optional[str], delta: int) -> None:
+        if student_id is None:
+            return
+        held = self._per_student.get(student_id, 0) + delta
+        if held:
+            self._per_student[student_id] = held
+        else:
+            self._per_student.pop(student_id, None)
+
+    def _admit(self, student_id: Optional[str]) -> None:
+        if self.active + self.waiting >= self.max_concurrency + self.max_queue:
+            self.rejected += 1
+            raise LLMOverloaded(self.retry_after, "The AI coach is busy right now")
+        if (
+            student_id is not None
+            and self.max_per_student > 0
+            and self._per_student.get(student_id, 0) >= self.max_per_student
+        ):
+            self.rejected += 1
+            raise LLMOverloaded(self.retry_after, "Too many coach requests in progress for this student")
+
+    @asynccontextmanager
+    async def slot(self, student_id: Optional[str] = None):
+        """Hold one provider slot, queueing if needed; raises LLMOverloaded when the queue is full."""
+        self._admit(student_id)
+        self._hold(student_id, 1)
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        except BaseException:
+            self.waiting -= 1
+            self._hold(student_id, -1)
+            raise
+        self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
+            self._hold(student_id, -1)
+
+    async def run(self, key: str, student_id: Optional[str], call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run call() in a slot, or join the identical call already in flight under `key`.
+        The call runs as its own task: a caller that is cancelled (the leader
+        included) only stops waiting, and the call is cancelled with its last waiter.
+        """
+        flight = self._inflight.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(self._fly(key, student_id, call))
+            flight.add_done_callback(lambda f: f.cancelled() or f.exception())  # no "never retrieved" noise
+            self._inflight[key] = flight
+        else:
+            self.coalesced += 1
+        self._waiters[flight] = self._waiters.get(flight, 0) + 1
+        try:
+            return await asyncio.shield(flight)
+        except asyncio.CancelledError:
+            if self._waiters[flight] == 1:
+                flight.cancel()
+            raise
+        finally:
+            self._waiters[flight] -= 1
+            if not self._waiters[flight]:
+                del self._waiters[flight]
+
+    async def _fly(self, key: str, student_id: Optional[str], call: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            async with self.slot(student_id):
+                return await call()
+        finally:
+            if self._inflight.get(key) is asyncio.current_task():
+                del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "max_per_student": self.max_per_student,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+        }
+
+
+_gate: Optional[LLMGate] = None
+
+
+def init_llm_gate() -> LLMGate:
+    """(Re)create the gate for the running event loop; called from the app lifespan."""
+    global _gate
+    _gate = LLMGate(
+        max_concurrency=settings.LLM_MAX_CONCURRENCY,
+        max_queue=settings.LLM_MAX_QUEUE,
+        max_per_student=settings.LLM_MAX_PER_STUDENT,
+        retry_after=settings.LLM_RETRY_AFTER_SECONDS,
+    )
+    return _gate
+
+
+def get_llm_gate() -> LLMGate:
+    gate = _gate
+    if gate is None:
+        gate = init_llm_gate()
+    return gate
+
+
+def llm_gate_stats() -> Dict[str, Any]:
+    return get_llm_gate().stats()
@@ -0,0 +1,143 @@
+"""
+Chat model registry.
+The LangChain chat model is built once per process (from the app lifespan) and
+shared by every request. OpenAI calls go through one pooled httpx client, so
+they reuse keep-alive connections instead of redoing TCP/TLS setup per message.
+Provider settings are read when the registry is built and again only on an
+explicit reload_llm().
+"""
+import asyncio
+import threading
+import time
+
+from config import Settings, settings
+
+OPENAI_CHAT_MODEL = "gpt-4o-mini"
+GEMINI_CHAT_MODEL = "gemini-1.5-flash"
+
+
+def _gemini_configured(config: Settings) -> bool:
+    return bool(config.GEMINI_API_KEY and config.GEMINI_API_KEY not in ("", "your_gemini_api_key_here"))
+
+
+class _LLMRegistry:
+    """Process-wide chat model plus its HTTP connection pool (see init_llm)."""
+
+    def __init__(self):
+        self.llm = None
+        self.model_name = ""
+        self.http_client = None
+        self.ready = False
+        self._lock = threading.Lock()
+
+    def _build(self, config: Settings):
+        """(llm, model name, http client) for config; (None, "", None) when not configured."""
+        try:
+            if config.LLM_PROVIDER == "openai" and config.OPENAI_API_KEY:
+                import httpx
+                from langchain_openai import ChatOpenAI
+                http_client = httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=config.LLM_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=config.LLM_HTTP_MAX_KEEPALIVE,
+                    ),
+                    timeout=config.LLM_TIMEOUT_SECONDS,
+                )
+                llm = ChatOpenAI(
+                    model=OPENAI_CHAT_MODEL,
+                    openai_api_key=config.OPENAI_API_KEY,
+                    base_url=config.OPENAI_BASE_URL or None,
+                    temperature=0.7,
+                    http_async_client=http_client,
+                )
+                return llm, f"openai:{OPENAI_CHAT_MODEL}", http_client
+            elif _gemini_configured(config):
+                from langchain_google_genai import ChatGoogleGenerativeAI
+                # The Google client keeps its own channel for the life of the model object
+                llm = ChatGoogleGenerativeAI(
+                    model=GEMINI_CHAT_MODEL,
+                    google_api_key=config.GEMINI_API_KEY,
+                    temperature=0.7,
+                    convert_system_message_to_human=True,
+                )
+                return llm, f"gemini:{GEMINI_CHAT_MODEL}", None
+        except ImportError:
+            pass
+        return None, "", None
+
+    def init(self) -> None:
+        with self._lock:
+            if self.ready:
+                return
+            self.llm, self.model_name, self.http_client = self._build(settings)
+            self.ready = True
+
+    def swap(self, config: Settings):
+        """Install a model built from config; returns the replaced HTTP client (if any)."""
+        llm, model_name, http_client = self._build(config)
+        with self._lock:
+            old_client = self.http_client
+            self.llm, self.model_name, self.http_client = llm, model_name, http_client
+            self.ready = True
+        return old_client
+
+
+_registry = _LLMRegistry()
+_closing = set()  # pending _close_later tasks (held so they are not garbage-collected)
+
+
+def get_llm():
+    """Shared chat model, or None when no provider is configured (graceful degradation)."""
+    _registry.init()  # no-op after the lifespan has run
+    return _registry.llm
+
+
+def get_llm_model_name() -> str:
+    _registry.init()
+    return _registry.model_name
+
+
+def init_llm() -> None:
+    """Build the chat model once; called from the app lifespan."""
+    _registry.init()
+    if _registry.llm is not None:
+        print(f"🤖 LLM ready ({_registry.model_name})")
+
+
+async def warm_up_llm() -> None:
+    """Send one tiny prompt so the first student does not pay for connection setup."""
+    llm = get_llm()
+    if llm is None or not settings.LLM_WARMUP:
+        return
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(llm.ainvoke("ping"), timeout=settings.LLM_WARMUP_TIMEOUT_SECONDS)
+        print(f"🔥 LLM warmed up in {(time.perf_counter() - started) * 1000:.0f} ms")
+    except Exception as e:
+        print(f"⚠️  LLM warm-up failed: {e!r}")
+
+
+async def _close_later(http_client, delay: float) -> None:
+    await asyncio.sleep(delay)
+    await http_client.aclose()
+
+
+async def reload_llm() -> None:
+    """
+    Re-read provider settings from the environment / .env and rebuild the
+    chat model. The old connection pool is closed once any call still using
+    it must have timed out.
+    """
+    old_client = _registry.swap(Settings())
+    print(f"🔄 LLM reloaded ({_registry.model_name or 'demo mode'})")
+    if old_client is not None:
+        task = asyncio.create_task(_close_later(old_client, settings.LLM_TIMEOUT_SECONDS))
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+    await warm_up_llm()
+
+
+async def close_llm() -> None:
+    """Release pooled connections at shutdown."""
+    if _registry.http_client is not None:
+        await _registry.http_client.aclose()
@@ -0,0 +1,217 @@
+"""
+Offline vector index for study resources.
+Semantic-ish retrieval without a network: resources from a JSONL corpus are
+embedded with a deterministic hashed n-gram TF-IDF embedder and stored as a
+float32 matrix in a memory-mapped .npy file. Loading maps the file instead of
+reading it, and a query only touches the matrix rows its own n-grams hash to.
+
+Index directory layout:
+    vectors.npy   float32 (dim, n_resources), dimension-major, columns L2-normalized
+    idf.npy       float32 (dim,) inverse document frequency per hashed feature
+    offsets.npy   int64 (n_resources,) byte offset of each record in the corpus
+    meta.json     dim, count and the corpus size/mtime the index was built from
+"""
+import json
+import os
+import re
+import tempfile
+import threading
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+SCORE_BLOCK = 16384  # columns scored per block
+PROBE_FEATURES = 8  # query features used to shortlist candidates on long queries
+CANDIDATES = 4096  # shortlisted columns re-scored with the full query
+
+
+class HashedTfidfEmbedder:
+    """Word unigrams plus character trigrams, feature-hashed into `dim` signed buckets."""
+
+    def __init__(self, dim: int, idf: Optional[np.ndarray] = None):
+        self.dim = dim
+        self.idf = idf if idf is not None else np.ones(dim, dtype=np.float32)
+
+    def features(self, text: str) -> Dict[int, float]:
+        counts: Dict[int, float] = {}
+        for token in _TOKEN_RE.findall(text.lower()):
+            grams = [token] + [f"#{token}#"[i:i + 3] for i in range(len(token))]
+            for gram in grams:
+                h = zlib.crc32(gram.encode())
+                bucket = h % self.dim
+                sign = 1.0 if (h >> 31) & 1 else -1.0
+                counts[bucket] = counts.get(bucket, 0.0) + sign
+        return counts
+
+    def fit_idf(self, texts: Iterable[str]) -> np.ndarray:
+        df = np.zeros(self.dim, dtype=np.float64)
+        n = 0
+        for text in texts:
+            n += 1
+            for bucket, value in self.features(text).items():
+                if value:
+                    df[bucket] += 1
+        self.idf = (np.log((1 + n) / (1 + df)) + 1.0).astype(np.float32)
+        return self.idf
+
+    def embed_sparse(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """(bucket indices, L2-normalized TF-IDF weights); empty arrays for empty text."""
+        feats = {b: v for b, v in self.features(text).items() if v}
+        if not feats:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        idx = np.fromiter(feats.keys(), dtype=np.int64, count=len(feats))
+        tf = np.fromiter(feats.values(), dtype=np.float32, count=len(feats))
+        vals = np.sign(tf) * (1.0 + np.log(np.abs(tf))) * self.idf[idx]
+        return idx, vals / np.linalg.norm(vals)
+
+
+def _corpus_stamp(corpus_path: str) -> Dict:
+    st = os.stat(corpus_path)
+    return {"corpus_size": st.st_size, "corpus_mtime_ns": st.st_mtime_ns}
+
+
+def _resource_text(record: Dict) -> str:
+    return " ".join(str(record.get(k, "")) for k in ("title", "description", "tags"))
+
+
+def _replace_file(index_dir: str, name: str, write: Callable[[str], None]) -> None:
+    """Write name through a private temp file and swap it in, so concurrent builds never interleave."""
+    fd, tmp_path = tempfile.mkstemp(dir=index_dir, prefix=f".{name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, os.path.join(index_dir, name))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _save_array(array: np.ndarray) -> Callable[[str], None]:
+    def write(path: str) -> None:
+        with open(path, "wb") as f:
+            np.save(f, array)
+    return write
+
+
+def build_index(corpus_path: str, index_dir: str, dim: int) -> int:
+    """Embed every record of the corpus into index_dir; returns the resource count."""
+    offsets = []
+    texts = []
+    with open(corpus_path, "rb") as f:
+        offset = 0
+        for line in f:
+            if line.strip():
+                offsets.append(offset)
+                texts.append(_resource_text(json.loads(line)))
+            offset += len(line)
+
+    embedder = HashedTfidfEmbedder(dim)
+    idf = embedder.fit_idf(texts)
+
+    def write_vectors(path: str) -> None:
+        vectors = np.lib.format.open_memmap(path, mode="w+", dtype=np.float32, shape=(dim, len(texts)))
+        for start in range(0, len(texts), SCORE_BLOCK):
+            # Fill a column block in memory, then write it out as one slab
+            block = np.zeros((dim, min(SCORE_BLOCK, len(texts) - start)), dtype=np.float32)
+            for col, text in enumerate(texts[start:start + SCORE_BLOCK]):
+                idx, vals = embedder.embed_sparse(text)
+                block[idx, col] = vals
+            vectors[:, start:start + block.shape[1]] = block
+        vectors.flush()
+        del vectors
+
+    def write_meta(path: str) -> None:
+        with open(path, "w") as f:
+            json.dump({"dim": dim, "count": len(texts), **_corpus_stamp(corpus_path)}, f)
+
+    os.makedirs(index_dir, exist_ok=True)
+    _replace_file(index_dir, "vectors.npy", write_vectors)
+    _replace_file(index_dir, "idf.npy", _save_array(idf))
+    _replace_file(index_dir, "offsets.npy", _save_array(np.asarray(offsets, dtype=np.int64)))
+    _replace_file(index_dir, "meta.json", write_meta)  # last: marks the index current
+    return len(texts)
+
+
+def _top_positive(scores: np.ndarray, k: int) -> np.ndarray:
+    """Indices of the k largest positive scores, best first.
+    Most columns share no feature with a query and score exactly 0; selecting
+    among the positive entries only keeps argpartition off those ties."""
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(scores[candidates], len(candidates) - k)[len(candidates) - k:]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class LocalResourceIndex:
+    def __init__(self, corpus_path: str, index_dir: str):
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.corpus_path = corpus_path
+        self.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(index_dir, "offsets.npy"), mmap_mode="r")
+        self.embedder = HashedTfidfEmbedder(self.meta["dim"], np.load(os.path.join(index_dir, "idf.npy")))
+        self._corpus = open(corpus_path, "rb")
+        self._corpus_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.vectors.shape[1]
+
+    def _partial_scores(self, idx: np.ndarray, vals: np.ndarray) -> np.ndarray:
+        """vals · vectors[idx] in column blocks, so the gathered rows stay in cache."""
+        n = len(self)
+        scores = np.empty(n, dtype=np.float32)
+        for start in range(0, n, SCORE_BLOCK):
+            stop = min(start + SCORE_BLOCK, n)
+            scores[start:stop] = vals @ self.vectors[idx, start:stop]
+        return scores
+
+    def search(self, text: str, top_k: int) -> List[Tuple[int, float]]:
+        """
+        Top-k (row, cosine) pairs with a positive cosine, best first.
+        Each query feature costs one full matrix row, so long queries are scored
+        in two passes: the PROBE_FEATURES heaviest features pick CANDIDATES
+        columns, which are then re-scored exactly with every feature.
+        """
+        idx, vals = self.embedder.embed_sparse(text)
+        n = len(self)
+        if not len(idx) or not n or top_k <= 0:
+            return []
+        if len(idx) > PROBE_FEATURES and n > CANDIDATES:
+            heaviest = np.argpartition(-np.abs(vals), PROBE_FEATURES)[:PROBE_FEATURES]
+            probe = self._partial_scores(idx[heaviest], vals[heaviest])
+            rows = np.sort(_top_positive(probe, CANDIDATES))  # sequential access into each row
+            scores = vals @ self.vectors[np.ix_(idx, rows)]
+            return [(int(rows[i]), float(scores[i])) for i in _top_positive(scores, top_k)]
+        scores = self._partial_scores(idx, vals)
+        return [(int(i), float(scores[i])) for i in _top_positive(scores, top_k)]
+
+    def record(self, row: int) -> Dict:
+        with self._corpus_lock:
+            self._corpus.seek(int(self.offsets[row]))
+            return json.loads(self._corpus.readline())
+
+    def close(self) -> None:
+        self._corpus.close()
+
+
+def is_index_current(corpus_path: str, index_dir: str, dim: int) -> bool:
+    try:
+        with open(os.path.join(index_dir, "meta.json")) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return False
+    return meta.get("dim") == dim and all(
+        meta.get(k) == v for k, v in _corpus_stamp(corpus_path).items()
+    )
+
+
+def load_index(corpus_path: str, index_dir: str, dim: int) -> Optional[LocalResourceIndex]:
+    """Map the index, (re)building it first if the corpus changed; None without a corpus."""
+    if not os.path.exists(corpus_path):
+        return None
+    if not is_index_current(corpus_path, index_dir, dim):
+        count = build_index(corpus_path, index_dir, dim)
+        print(f"📚 Built local resource index: {count} resources → {index_dir}")
+    return LocalResourceIndex(corpus_path, index_dir)
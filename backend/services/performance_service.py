@@ -0,0 +1,81 @@
+"""
+Topic performance service.
+Applies per-topic score deltas with one set-based upsert so concurrent
+submissions never lose increments.
+
+weakness_score is exponentially time-decayed (WEAKNESS_HALF_LIFE_DAYS).
+Rather than decaying stored sums on every write, each answer is weighted by
+2^((t - epoch) / half-life) ("forward decay"). The common factor cancels in
+decayed_correct / decayed_total, so the update stays a plain SQL addition
+and O(1) per submission, with no history scans.
+"""
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from sqlalchemy import Float, Numeric, case, cast, func
+from sqlalchemy.orm import Session
+from config import settings
+from database import dialect_insert
+from models import TopicPerformance
+
+TopicDeltas = Dict[Tuple[str, str], Dict[str, int]]  # {(student_id, topic): {correct, total}}
+
+DECAY_EPOCH = datetime.fromisoformat(settings.WEAKNESS_DECAY_EPOCH)
+
+
+def decay_weight(at: datetime) -> float:
+    """Forward-decay weight of an answer given at `at`."""
+    half_life_seconds = settings.WEAKNESS_HALF_LIFE_DAYS * 86400
+    return 2.0 ** ((at - DECAY_EPOCH).total_seconds() / half_life_seconds)
+
+
+def _weakness_expr(correct, total):
+    """weakness_score: 0.0 = perfect, 1.0 = all wrong — evaluated in SQL."""
+    return case(
+        (total > 0, func.round(cast(1.0 - cast(correct, Float) / total, Numeric), 4)),
+        else_=0.0,
+    )
+
+
+def apply_topic_deltas(db: Session, deltas: TopicDeltas, at: Optional[datetime] = None) -> None:
+    """
+    Add correct/total counts to TopicPerformance rows, creating missing rows.
+    Runs as one INSERT ... ON CONFLICT DO UPDATE statement; the caller commits.
+    """
+    if not deltas:
+        return
+
+    now = at or datetime.utcnow()
+    weight = decay_weight(now)
+    rows = [
+        {
+            "student_id": student_id,
+            "topic": topic,
+            "correct": stats["correct"],
+            "total_attempted": stats["total"],
+            "decayed_correct": stats["correct"] * weight,
+            "decayed_total": stats["total"] * weight,
+            "weakness_score": round(1.0 - stats["correct"] / stats["total"], 4) if stats["total"] else 0.0,
+            "last_updated": now,
+        }
+        for (student_id, topic), stats in deltas.items()
+    ]
+
+    # executemany form: the statement compiles once (and is cached), and
+    # insertmanyvalues packs the rows into multi-row INSERTs at execution time
+    insert = dialect_insert(db)
+    stmt = insert(TopicPerformance)
+    excluded = stmt.excluded
+    new_decayed_correct = func.coalesce(TopicPerformance.decayed_correct, 0.0) + excluded.decayed_correct
+    new_decayed_total = func.coalesce(TopicPerformance.decayed_total, 0.0) + excluded.decayed_total
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TopicPerformance.student_id, TopicPerformance.topic],
+        set_={
+            "correct": TopicPerformance.correct + excluded.correct,
+            "total_attempted": TopicPerformance.total_attempted + excluded.total_attempted,
+            "decayed_correct": new_decayed_correct,
+            "decayed_total": new_decayed_total,
+            "weakness_score": _weakness_expr(new_decayed_correct, new_decayed_total),
+            "last_updated": excluded.last_updated,
+        },
+    )
+    db.execute(stmt, rows)
@@ -1,10 +1,18 @@
 """
 Pinecone Vector Search Service.
-Gracefully falls back to curated mock data if Pinecone is not configured.
+Without Pinecone, resources come from the offline local vector index
+(services.local_index) and then the curated mock data.
+The client, index and embedding model are created once per process, and
+query embeddings are cached (services.embedding_cache).
 """
-from typing import List
+import asyncio
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 from config import settings
 from schemas import ResourceItem
+from services.embedding_cache import get_embedding_cache, normalize_text
+from services.local_index import load_index
 
 # Curated mock resources by keyword
 MOCK_RESOURCES: dict = {
@@ -69,17 +77,115 @@ DEFAULT_RESOURCES = [
 ]
 
 
+_END = ""  # trie terminal marker; never a real character
+
+
+def _build_keyword_trie(keys: List[str]) -> dict:
+    """
+    Character trie over the catalog keys, compiled once at import.
+    Terminal values are match priorities: a whole key scores its catalog rank;
+    a single word of a multi-word key scores len(keys) + rank, so whole-key
+    matches always win, exactly like the original two-pass scan.
+    """
+    trie: dict = {}
+    entries = [(key, rank) for rank, key in enumerate(keys)]
+    entries += [
+        (word, len(keys) + rank)
+        for rank, key in enumerate(keys) if " " in key
+        for word in key.split()
+    ]
+    for text, priority in entries:
+        node = trie
+        for ch in text:
+            node = node.setdefault(ch, {})
+        node[_END] = min(priority, node.get(_END, priority))
+    return trie
+
+
+_CATALOG_KEYS = list(MOCK_RESOURCES)
+_KEYWORD_TRIE = _build_keyword_trie(_CATALOG_KEYS)
+
+
+def _match_catalog_key(topic_lower: str) -> Optional[str]:
+    """First catalog key (in catalog order) occurring in the topic, or containing it."""
+    best = None
+    for start in range(len(topic_lower)):
+        node = _KEYWORD_TRIE
+        for ch in topic_lower[start:]:
+            node = node.get(ch)
+            if node is None:
+                break
+            priority = node.get(_END)
+            if priority is not None and (best is None or priority < best):
+                best = priority
+    # Topic is a fragment of a key, e.g. "calc" → "calculus"; only keys ranked
+    # ahead of the best substring match can still win
+    limit = len(_CATALOG_KEYS) if best is None else min(best, len(_CATALOG_KEYS))
+    for rank in range(limit):
+        if topic_lower in _CATALOG_KEYS[rank]:
+            return _CATALOG_KEYS[rank]
+    if best is None:
+        return None
+    return _CATALOG_KEYS[best % len(_CATALOG_KEYS)]
+
+
+@lru_cache(maxsize=1024)
+def _lookup_mock_resources(normalized_topic: str, top_k: int) -> Tuple[ResourceItem, ...]:
+    key = _match_catalog_key(normalized_topic)
+    resources = MOCK_RESOURCES[key] if key is not None else DEFAULT_RESOURCES
+    return tuple(resources[:top_k])
+
+
 def _get_mock_resources(topic: str, top_k: int = 5) -> List[ResourceItem]:
-    topic_lower = topic.lower()
-    for key, resources in MOCK_RESOURCES.items():
-        if key in topic_lower or topic_lower in key:
-            return resources[:top_k]
-    # Partial keyword match
-    for key, resources in MOCK_RESOURCES.items():
-        words = key.split()
-        if any(w in topic_lower for w in words):
-            return resources[:top_k]
-    return DEFAULT_RESOURCES[:top_k]
+    return list(_lookup_mock_resources(topic.lower(), top_k))
+
+
+_local_index = None
+_local_index_ready = False
+_local_index_lock = threading.Lock()
+
+
+def _get_local_index():
+    """Offline resource index (services.local_index), mapped once per process."""
+    global _local_index, _local_index_ready
+    if not _local_index_ready:
+        with _local_index_lock:
+            if not _local_index_ready:
+                if settings.LOCAL_INDEX_ENABLED:
+                    try:
+                        _local_index = load_index(
+                            settings.RESOURCE_CORPUS_PATH, settings.LOCAL_INDEX_DIR, settings.LOCAL_INDEX_DIM
+                        )
+                    except Exception as e:
+                        print(f"⚠️  Local resource index unavailable: {e} — using mock resources")
+                _local_index_ready = True
+    return _local_index
+
+
+@lru_cache(maxsize=1024)
+def _lookup_local_resources(normalized_topic: str, top_k: int) -> Tuple[ResourceItem, ...]:
+    index = _get_local_index()
+    if index is None:
+        return ()
+    items = []
+    for row, score in index.search(normalized_topic, top_k):
+        if score < settings.LOCAL_INDEX_MIN_SCORE:
+            break
+        record = index.record(row)
+        items.append(ResourceItem(
+            title=record.get("title", "Study Resource"),
+            description=record.get("description", ""),
+            url=record.get("url"),
+            resource_type=record.get("resource_type", "article"),
+            score=round(score, 4),
+        ))
+    return tuple(items)
+
+
+def _get_offline_resources(topic: str, top_k: int = 5) -> List[ResourceItem]:
+    """Local vector index when it has a good match, otherwise the curated mock catalog."""
+    normalized = topic.lower()
+    return list(_lookup_local_resources(normalized, top_k) or _lookup_mock_resources(normalized, top_k))
 
 
 def _is_pinecone_configured() -> bool:
@@ -89,43 +195,144 @@ def _is_pinecone_configured() -> bool:
     )
 
 
+class _VectorClients:
+    """Process-wide Pinecone index and embedding model, built once (see init_vector_clients)."""
+
+    def __init__(self):
+        self.index = None
+        self.embed_model = None
+        self.model_name = ""
+        self.ready = False
+        self._lock = threading.Lock()
+
+    def init(self) -> None:
+        with self._lock:
+            if self.ready:
+                return
+            self.ready = True
+            if not _is_pinecone_configured():
+                return
+            try:
+                from pinecone import Pinecone
+                pc = Pinecone(api_key=settings.PINECONE_API_KEY)
+                self.index = pc.Index(settings.PINECONE_INDEX_NAME)
+                self.embed_model = _get_embedding_model()
+                self.model_name = _embedding_model_name(self.embed_model)
+            except Exception as e:
+                print(f"⚠️  Pinecone init failed: {e} — using mock resources")
+                self.index = None
+
+    def reset(self) -> None:
+        with self._lock:
+            self.index = None
+            self.embed_model = None
+            self.model_name = ""
+            self.ready = False
+
+
+_clients = _VectorClients()
+
+
+def init_vector_clients() -> None:
+    """Create the Pinecone client/index and embedder once; called from the app lifespan."""
+    _clients.init()
+    if _clients.index is not None:
+        print(f"🌲 Pinecone index '{settings.PINECONE_INDEX_NAME}' ready ({_clients.model_name})")
+    local_index = _get_local_index()
+    if local_index is not None:
+        print(f"📚 Local resource index ready: {len(local_index)} resources")
+
+
+def _embed_query(topic: str) -> List[float]:
+    return get_embedding_cache().get_or_embed(
+        _clients.model_name, topic, _clients.embed_model.embed_query
+    )
+
+
 async def retrieve_resources(topic: str, top_k: int = 5) -> List[ResourceItem]:
-    """Async retrieval — uses Pinecone if configured, otherwise mock data."""
+    """Async retrieval — uses Pinecone if configured, otherwise the offline index/mock data."""
     if not _is_pinecone_configured():
-        return _get_mock_resources(topic, top_k)
+        return _get_offline_resources(topic, top_k)
     try:
-        import asyncio
-        from pinecone import Pinecone
-        pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-        index = pc.Index(settings.PINECONE_INDEX_NAME)
-
-        embed_model = _get_embedding_model()
-        if not embed_model:
-            return _get_mock_resources(topic, top_k)
-
-        query_emb = await asyncio.to_thread(embed_model.embed_query, topic)
-        results = await asyncio.to_thread(
-            index.query, vector=query_emb, top_k=top_k, include_metadata=True
-        )
-        items = []
-        for m in results.get("matches", []):
-            meta = m.get("metadata", {})
-            items.append(ResourceItem(
-                title=meta.get("title", "Study Resource"),
-                description=meta.get("description", ""),
-                url=meta.get("url"),
-                resource_type=meta.get("resource_type", "article"),
-                score=round(m.get("score", 0.0), 4),
-            ))
-        return items or _get_mock_resources(topic, top_k)
+        _clients.init()  # no-op after the lifespan has run
+        if _clients.index is None or _clients.embed_model is None:
+            return _get_offline_resources(topic, top_k)
+
+        query_emb = await asyncio.to_thread(_embed_query, topic)
+        items = await asyncio.to_thread(_query_index, query_emb, top_k)
+        return items or _get_offline_resources(topic, top_k)
     except Exception as e:
-        print(f"⚠️  Pinecone error: {e} — using mock resources")
-        return _get_mock_resources(topic, top_k)
+        print(f"⚠️  Pinecone error: {e} — using offline resources")
+        return _get_offline_resources(topic, top_k)
+
+
+def _embed_queries(texts: List[str]) -> List[List[float]]:
+    """One embedding call for several queries."""
+    try:
+        # Gemini embeds queries and documents differently; match embed_query()
+        return _clients.embed_model.embed_documents(texts, task_type="retrieval_query")
+    except TypeError:
+        return _clients.embed_model.embed_documents(texts)
+
+
+def _query_index(query_emb: List[float], top_k: int) -> List[ResourceItem]:
+    results = _clients.index.query(vector=query_emb, top_k=top_k, include_metadata=True)
+    items = []
+    for m in results.get("matches", []):
+        meta = m.get("metadata", {})
+        items.append(ResourceItem(
+            title=meta.get("title", "Study Resource"),
+            description=meta.get("description", ""),
+            url=meta.get("url"),
+            resource_type=meta.get("resource_type", "article"),
+            score=round(m.get("score", 0.0), 4),
+        ))
+    return items
+
+
+async def retrieve_resources_batch(topics: List[str], top_k: int = 5) -> Dict[str, List[ResourceItem]]:
+    """
+    Resolve many topics at once. Topics that only differ in case/whitespace
+    are looked up once, lookups run concurrently (at most
+    RESOURCE_BATCH_CONCURRENCY at a time), and with Pinecone every uncached
+    topic is embedded in a single call.
+    """
+    unique = list(dict.fromkeys(normalize_text(t) for t in topics))
+    limit = asyncio.Semaphore(max(1, settings.RESOURCE_BATCH_CONCURRENCY))
+
+    async def _bounded(fn, *args):
+        async with limit:
+            return await asyncio.to_thread(fn, *args)
+
+    embeddings: Dict[str, List[float]] = {}
+    if _is_pinecone_configured():
+        _clients.init()  # no-op after the lifespan has run
+        if _clients.index is not None and _clients.embed_model is not None:
+            try:
+                vectors = await asyncio.to_thread(
+                    get_embedding_cache().get_or_embed_many, _clients.model_name, unique, _embed_queries
+                )
+                embeddings = dict(zip(unique, vectors))
+            except Exception as e:
+                print(f"⚠️  Pinecone embedding error: {e} — using offline resources")
+
+    async def _resolve(topic: str) -> List[ResourceItem]:
+        if topic in embeddings:
+            try:
+                items = await _bounded(_query_index, embeddings[topic], top_k)
+                if items:
+                    return items
+            except Exception as e:
+                print(f"⚠️  Pinecone error: {e} — using offline resources")
+        return await _bounded(_get_offline_resources, topic, top_k)
+
+    resolved = dict(zip(unique, await asyncio.gather(*(_resolve(t) for t in unique))))
+    return {topic: resolved[normalize_text(topic)] for topic in topics}
 
 
 def retrieve_resources_sync(topic: str, top_k: int = 5) -> List[ResourceItem]:
-    """Synchronous fallback used by the planner service."""
-    return _get_mock_resources(topic, top_k)
+    """Synchronous (network-free) retrieval used by the planner service."""
+    return _get_offline_resources(topic, top_k)
 
 
 def _get_embedding_model():
@@ -142,3 +349,10 @@ def _get_embedding_model():
     except ImportError:
         pass
     return None
+
+
+def _embedding_model_name(embed_model) -> str:
+    """Cache namespace for an embedder: its class plus model id."""
+    if embed_model is None:
+        return ""
+    return f"{type(embed_model).__name__}:{getattr(embed_model, 'model', '')}"
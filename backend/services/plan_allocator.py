@@ -0,0 +1,287 @@
+"""
+Revision planner time-allocation engines.
+
+An allocator turns per-topic minute targets into a day-by-day schedule under
+the planner's constraints: daily budget, max topics per day, min/max session
+length and at most one session per topic per day. Both engines share one
+signature and are picked by name via settings.PLANNER_ALLOCATOR:
+
+- "greedy":  the original first-fit layout (weakest topics first, then
+  recycle the weakest topics on empty days).
+- "optimal": a slot apportionment followed by a convex min-cost flow over
+  the session minutes, driving down the target deviation
+  Σ (minutes_i - target_i)² / target_i. It is not a pure deviation minimizer:
+  it seats the largest targets first, spends the whole budget even past the
+  optimum, and returns the greedy layout when that covers more (see
+  optimal_allocate). With many equal targets this scores a higher deviation
+  than greedy, which leaves half the budget unused.
+"""
+import heapq
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+STRETCH_STEP_MINUTES = 5
+SESSION_PRICES = (-4.0, -0.5, 0.0, 0.5, 4.0)  # optimal_allocate tries each, keeps the cheapest
+
+
+class Slot(NamedTuple):
+    topic: str
+    minutes: int
+    review: bool = False  # greedy-only: filler session on an otherwise empty day
+
+
+Schedule = List[List[Slot]]  # one list of sessions per day
+Allocator = Callable[[List[Tuple[str, float]], int, int, int, int, int], Schedule]
+
+
+def greedy_allocate(
+    targets: List[Tuple[str, float]],
+    days: int,
+    daily_minutes: int,
+    max_topics_per_day: int,
+    min_session: int,
+    max_session: int,
+) -> Schedule:
+    """First-fit layout in target order; kept for comparison and rollback."""
+    remaining = {topic: max(round(minutes), min_session) for topic, minutes in targets}
+    queue = [topic for topic, _ in targets]
+    schedule: Schedule = []
+
+    for _ in range(days):
+        sessions: List[Slot] = []
+        minutes_today = 0
+        for topic in queue:
+            if len(sessions) >= max_topics_per_day or minutes_today >= daily_minutes:
+                break
+            if remaining[topic] <= 0:
+                continue
+            session_mins = min(remaining[topic], max_session, daily_minutes - minutes_today)
+            session_mins = max(session_mins, min_session)
+            sessions.append(Slot(topic, session_mins))
+            remaining[topic] -= session_mins
+            minutes_today += session_mins
+
+        if not sessions:
+            # Recycle weakest topics on empty days
+            sessions = [Slot(topic, min_session, review=True) for topic in queue[:max_topics_per_day]]
+        schedule.append(sessions)
+
+    return schedule
+
+
+def _deviation(minutes: float, target: float) -> float:
+    return (minutes - target) ** 2 / target
+
+
+def _session_count_cost(n: int, target: float, min_session: int, max_session: int) -> float:
+    """Best deviation reachable with n sessions, ignoring the daily budgets."""
+    if n == 0:
+        return _deviation(0, target)
+    return _deviation(min(max(target, n * min_session), n * max_session), target)
+
+
+def _augmenting_path(i, extra, max_extra, spare, topic_days, day_topics) -> Optional[List[Tuple[int, int, int]]]:
+    """
+    Path of (topic, day, ±1) edge moves that gives topic i one more step of
+    minutes while every other topic keeps its total (BFS in the residual graph).
+    """
+    parents: Dict[int, Tuple] = {i: None}
+    frontier = [i]
+    while frontier:
+        next_frontier = []
+        for topic in frontier:
+            for day in topic_days[topic]:
+                if extra[(topic, day)] >= max_extra:
+                    continue
+                if spare[day] >= STRETCH_STEP_MINUTES:
+                    path = [(topic, day, 1)]
+                    node = topic
+                    while parents[node] is not None:
+                        prev, via_day = parents[node]
+                        path.append((node, via_day, -1))
+                        path.append((prev, via_day, 1))
+                        node = prev
+                    return path
+                # Shift another topic's minutes off this day to make room
+                for other in day_topics[day]:
+                    if other not in parents and extra[(other, day)] >= STRETCH_STEP_MINUTES:
+                        parents[other] = (topic, day)
+                        next_frontier.append(other)
+        frontier = next_frontier
+    return None
+
+
+def _session_counts(target, days, per_day, min_session, max_session, price) -> List[int]:
+    """
+    Slot apportionment: one session for each of the largest targets that fit in
+    the week's slots, then more while one still lowers the cost by more than `price`.
+    """
+    counts = [0] * len(target)
+    # Coverage floor: a target under min_session costs less left out than
+    # overshot, so without it many small targets would leave the week empty
+    seated = sorted(range(len(target)), key=lambda i: (-target[i], i))[:days * per_day]
+    for i in seated:
+        counts[i] = 1
+
+    def _count_delta(i: int) -> float:
+        return (
+            _session_count_cost(counts[i] + 1, target[i], min_session, max_session)
+            - _session_count_cost(counts[i], target[i], min_session, max_session)
+        )
+
+    # Heap of marginal costs; ties favour earlier (= weaker) topics
+    heap = [(_count_delta(i), i) for i in range(len(target)) if counts[i] < days]
+    heapq.heapify(heap)
+    for _ in range(days * per_day - len(seated)):
+        if not heap or heap[0][0] >= -price:
+            break
+        _, i = heapq.heappop(heap)
+        counts[i] += 1
+        if counts[i] < days:
+            heapq.heappush(heap, (_count_delta(i), i))
+    return counts
+
+
+def _layout(counts, target, days, per_day, min_session, max_session):
+    """Place each topic's sessions on distinct days, balancing expected daily minutes."""
+    topic_days: Dict[int, List[int]] = {}
+    day_topics: List[List[int]] = [[] for _ in range(days)]
+    load = [0.0] * days
+    for i in sorted((i for i in range(len(target)) if counts[i]), key=lambda i: (-counts[i], i)):
+        expected = min(max(target[i] / counts[i], min_session), max_session)
+        open_days = [d for d in range(days) if len(day_topics[d]) < per_day]
+        for d in sorted(sorted(open_days, key=lambda d: (load[d], d))[:counts[i]]):
+            topic_days.setdefault(i, []).append(d)
+            day_topics[d].append(i)
+            load[d] += expected
+    return topic_days, day_topics
+
+
+def _stretch(target, topic_days, day_topics, daily_minutes, min_session, max_session):
+    """
+    Session minutes for a fixed layout as a convex min-cost flow, solved by
+    successive shortest paths in STRETCH_STEP_MINUTES units until no day or
+    session has room left.
+    Returns the per-session extra minutes above min_session and the total cost.
+    """
+    max_extra = max_session - min_session
+    spare = [daily_minutes - min_session * len(day) for day in day_topics]
+    extra = {(i, d): 0 for i, ds in topic_days.items() for d in ds}
+    allocated = [0.0] * len(target)
+    for i, ds in topic_days.items():
+        allocated[i] = len(ds) * min_session
+
+    def _step_delta(i: int) -> float:
+        return (
+            _deviation(allocated[i] + STRETCH_STEP_MINUTES, target[i])
+            - _deviation(allocated[i], target[i])
+        )
+
+    # Steps are taken cheapest first; once no step lowers the cost, the leftover
+    # budget still goes out where overshooting the target costs least
+    heap = [(_step_delta(i), i) for i in topic_days]
+    heapq.heapify(heap)
+    while heap:
+        _, i = heapq.heappop(heap)
+        path = _augmenting_path(i, extra, max_extra, spare, topic_days, day_topics)
+        if path is None:
+            continue  # saturated: no residual path can reopen (sink side only shrinks)
+        for topic, day, sign in path:
+            extra[(topic, day)] += sign * STRETCH_STEP_MINUTES
+        spare[path[0][1]] -= STRETCH_STEP_MINUTES
+        allocated[i] += STRETCH_STEP_MINUTES
+        heapq.heappush(heap, (_step_delta(i), i))
+
+    return extra, sum(_deviation(a, t) for a, t in zip(allocated, target))
+
+
+def optimal_allocate(
+    targets: List[Tuple[str, float]],
+    days: int,
+    daily_minutes: int,
+    max_topics_per_day: int,
+    min_session: int,
+    max_session: int,
+) -> Schedule:
+    """
+    Spend the whole budget under the planner constraints, keeping
+    Σ (minutes_i - target_i)² / target_i low.
+
+    1. Session counts n_i <= days, with at most max_topics_per_day slots per
+       day (never more than the budget allows at min_session each). The
+       largest targets are seated first, one session each while slots remain,
+       even where leaving a small target out would cost less. The best
+       deviation reachable with n sessions is convex in n, so the remaining
+       slots go one at a time to the topic whose cost drops most, while the
+       drop exceeds a session price (negative prices also buy cost-neutral
+       sessions that spread the load).
+    2. Topics with the most sessions go first, each onto the distinct days
+       with the least expected minutes so far (a topic never repeats on a day).
+    3. Every session starts at min_session; the remaining minutes are a convex
+       min-cost flow (source -> topic -> day -> sink, capacities max_session -
+       min_session per session and the spare budget per day). All cost sits on
+       the source arcs, so each successive-shortest-path step goes to the topic
+       with the most negative marginal cost that has any residual path. Given
+       the layout this is the deviation optimum up to the step size. Steps
+       then continue past the optimum (cheapest overshoot first) until every
+       day and session is full, so the result is not that optimum whenever
+       the targets leave budget over.
+    How many sessions fit best depends on the daily budgets (too many crowd
+    them, too few strand minutes max_session cannot reach), so steps 1-3 run
+    for each of SESSION_PRICES and the cheapest schedule wins.
+    Days never exceed daily_minutes. If the result still schedules fewer
+    minutes or topics than a greedy_allocate layout that keeps to the
+    budgets, the greedy layout is returned instead.
+    """
+    if days <= 0:
+        return []
+    per_day = min(max_topics_per_day, daily_minutes // min_session) if min_session > 0 else max_topics_per_day
+    if not targets or per_day <= 0:
+        return [[] for _ in range(days)]
+    target = [max(minutes, 1e-9) for _, minutes in targets]
+
+    best = None
+    seen = set()
+    for price in SESSION_PRICES:
+        counts = _session_counts(target, days, per_day, min_session, max_session, price)
+        if tuple(counts) in seen:
+            continue
+        seen.add(tuple(counts))
+        topic_days, day_topics = _layout(counts, target, days, per_day, min_session, max_session)
+        extra, cost = _stretch(target, topic_days, day_topics, daily_minutes, min_session, max_session)
+        if best is None or cost < best[0]:
+            best = (cost, day_topics, extra)
+
+    _, day_topics, extra = best
+    schedule = [
+        [Slot(targets[i][0], min_session + extra[(i, d)]) for i in sorted(day)]
+        for d, day in enumerate(day_topics)
+    ]
+    # Never schedule less study time or fewer topics than a greedy layout that
+    # keeps to the budgets (greedy can overrun a day to fit min_session)
+    greedy = greedy_allocate(targets, days, daily_minutes, max_topics_per_day, min_session, max_session)
+    if all(_minutes([day]) <= daily_minutes for day in greedy) and (
+        _minutes(schedule) < _minutes(greedy) or _topics(schedule) < _topics(greedy)
+    ):
+        return greedy
+    return schedule
+
+
+def _minutes(schedule: Schedule) -> int:
+    return sum(slot.minutes for day in schedule for slot in day)
+
+
+def _topics(schedule: Schedule) -> int:
+    return len({slot.topic for day in schedule for slot in day})
+
+
+ALLOCATORS: Dict[str, Allocator] = {
+    "greedy": greedy_allocate,
+    "optimal": optimal_allocate,
+}
+
+
+def get_allocator(name: str) -> Allocator:
+    try:
+        return ALLOCATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown planner allocator '{name}' (expected one of: {', '.join(ALLOCATORS)})")
@@ -0,0 +1,149 @@
+"""
+Batch plan generation.
+Builds revision plans for many students at once (e.g. nightly, so the morning
+rush only reads stored plans). Plans start on a target plan day, by default the
+next one, and the planner serves them as current on that day. Student ids are
+streamed in chunks; each chunk is one process-pool task that bulk-loads the
+chunk's TopicPerformance rows, lays out every plan in memory and swaps the
+chunk's active plans with one UPDATE and one bulk INSERT.
+"""
+import json
+import time
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import insert, update
+
+from models import RevisionPlan, StudentSummary, TopicPerformance
+from services.batch_runner import BatchTotals, run_batch
+from services.planner_service import build_plan_days, plan_today
+from services.weakness_scorer import rank_topic_scores, weight_topic_scores
+
+
+def iter_student_chunks(db, chunk_size: int) -> Iterator[List[str]]:
+    """Stream every student with topic performance, in id order, chunk_size at a time."""
+    last = None
+    while True:
+        query = db.query(TopicPerformance.student_id).distinct()
+        if last is not None:
+            query = query.filter(TopicPerformance.student_id > last)
+        chunk = [s for (s,) in query.order_by(TopicPerformance.student_id).limit(chunk_size)]
+        if not chunk:
+            return
+        yield chunk
+        last = chunk[-1]
+
+
+def _chunked(student_ids: Iterable[str], chunk_size: int) -> Iterator[List[str]]:
+    it = iter(student_ids)
+    while True:
+        chunk = list(islice(it, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def next_plan_day() -> date:
+    """The plan day after the current one: what a nightly run builds for."""
+    return plan_today() + timedelta(days=1)
+
+
+def generate_plan_chunk(task: Tuple[List[str], date]) -> Dict:
+    """Worker entry point: build and store fresh active plans starting on plan_date for one chunk of students."""
+    student_ids, plan_date = task
+    from database import SessionLocal
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        by_student: Dict[str, List] = {}
+        for row in (
+            db.query(
+                TopicPerformance.student_id, TopicPerformance.topic, TopicPerformance.correct,
+                TopicPerformance.total_attempted, TopicPerformance.weakness_score,
+            )
+            .filter(TopicPerformance.student_id.in_(student_ids))
+        ):
+            by_student.setdefault(row.student_id, []).append(row)
+        versions = dict(
+            db.query(StudentSummary.student_id, StudentSummary.performance_version)
+            .filter(StudentSummary.student_id.in_(student_ids))
+        )
+
+        now = datetime.utcnow()
+        resource_memo: Dict[str, List[Dict[str, str]]] = {}
+        rows = []
+        for student_id in student_ids:
+            weighted_topics = weight_topic_scores(rank_topic_scores(by_student.get(student_id, [])))
+            if not weighted_topics:
+                continue  # no data yet: the fallback plan is never stored
+            days = build_plan_days(weighted_topics, plan_date, resource_memo)
+            rows.append({
+                "student_id": student_id,
+                "plan_data": json.dumps([d.model_dump() for d in days]),
+                "generated_at": now,
+                "is_active": True,
+                "performance_version": versions.get(student_id) or 0,
+                "plan_date": plan_date,
+            })
+
+        if rows:
+            db.execute(
+                update(RevisionPlan)
+                .where(
+                    RevisionPlan.student_id.in_([r["student_id"] for r in rows]),
+                    RevisionPlan.is_active == True,
+                )
+                .values(is_active=False)
+            )
+            db.execute(insert(RevisionPlan), rows)
+        db.commit()
+        return {
+            "students": len(student_ids),
+            "plans": len(rows),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def generate_plans(
+    student_ids: Optional[Iterable[str]] = None,
+    workers: int = 1,
+    chunk_size: int = 1000,
+    plan_date: Optional[date] = None,
+) -> Dict:
+    """
+    Generate plans starting on plan_date (default: the next plan day) for the
+    given students (default: every student with performance data) across a
+    process pool; returns run totals.
+    """
+    plan_date = plan_date or next_plan_day()
+    from database import SessionLocal
+
+    totals = BatchTotals("students", "plans")
+
+    def _record(result: Dict) -> None:
+        totals.add(result)
+        print(
+            f"  ✅ {totals.counts['plans']} plans for {totals.counts['students']} students "
+            f"({totals.rate('plans'):,.0f} plans/s)"
+        )
+
+    db = SessionLocal()
+    try:
+        if student_ids is None:
+            chunks = iter_student_chunks(db, chunk_size)
+        else:
+            chunks = _chunked(student_ids, chunk_size)
+        run_batch(generate_plan_chunk, ((chunk, plan_date) for chunk in chunks), workers, _record)
+    finally:
+        db.close()
+
+    result = totals.summary()
+    result["plans_per_second"] = round(result["plans"] / max(result["seconds"], 1e-9), 1)
+    return result
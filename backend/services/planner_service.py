@@ -5,20 +5,27 @@ Algorithm:
 1. Fetch all TopicPerformance for student
 2. Compute weakness weights (0.1 floor for all topics)
 3. Budget: 120 min/day × 7 days = 840 total minutes
-4. Allocate minutes proportional to weakness weight
-5. Split into daily sessions (max 3 topics/day, max 60 min/topic)
+4. Target minutes per topic proportional to weakness weight
+5. Schedule daily sessions with the configured allocator
+   (services.plan_allocator; max 3 topics/day, 20-60 min/session)
 6. Generate learning objectives per session
-7. Persist active plan
+7. Persist active plan, stamped with the student's performance version
+
+Reads go through get_or_generate_plan(), which reuses the active plan until
+the performance version moves or a new plan day starts (plan_today()).
 """
 import json
 import math
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from sqlalchemy.orm import Session
+from config import settings
 from models import RevisionPlan
 from services.weakness_scorer import get_weighted_topics
 from services.pinecone_service import retrieve_resources_sync
+from services.plan_allocator import get_allocator
+from services.summary_service import get_performance_version
 from schemas import StudySession, DayPlan, RevisionPlanResponse
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 
 
 TOTAL_DAYS = 7
@@ -45,82 +52,39 @@ def _get_objective(weakness_score: float, topic: str) -> str:
         return f"Maintain '{topic}': quick recall flashcards, solve 3-5 advanced problems, review any recent errors"
 
 
-def generate_revision_plan(student_id: str, db: Session) -> RevisionPlanResponse:
-    """Generate a 7-day personalized revision plan."""
-    weighted_topics = get_weighted_topics(student_id, db)
+def _resource_links(topic: str, top_k: int, memo: Dict[str, List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """Resource links for a topic, resolved at most once per plan."""
+    if topic not in memo:
+        resources = retrieve_resources_sync(topic, top_k=3)
+        memo[topic] = [{"title": r.title, "url": r.url or "#", "type": r.resource_type} for r in resources]
+    return memo[topic][:top_k]
 
-    if not weighted_topics:
-        # No data yet — return a balanced fallback plan
-        return _fallback_plan(student_id)
 
-    # Allocate total minutes per topic
-    total_minutes = TOTAL_DAYS * DAILY_MINUTES
-    topic_minutes = {}
-    for topic_data in weighted_topics:
-        allocated = round(total_minutes * topic_data["weight"])
-        allocated = max(allocated, MIN_MINUTES_PER_SESSION)
-        topic_minutes[topic_data["topic"]] = {
-            "minutes_remaining": allocated,
-            "weakness_score": topic_data["weakness_score"],
-        }
-
-    # Distribute into days
-    days: List[DayPlan] = []
-    today = datetime.utcnow().date()
-    topics_queue = list(topic_minutes.keys())
+def plan_today() -> date:
+    """The current plan day: days roll over at midnight in PLAN_DAY_UTC_OFFSET_MINUTES."""
+    return (datetime.utcnow() + timedelta(minutes=settings.PLAN_DAY_UTC_OFFSET_MINUTES)).date()
 
-    for day_num in range(1, TOTAL_DAYS + 1):
-        sessions: List[StudySession] = []
-        minutes_today = 0
 
-        for topic in topics_queue:
-            if len(sessions) >= MAX_TOPICS_PER_DAY:
-                break
-            if minutes_today >= DAILY_MINUTES:
-                break
+def _plan_start(plan: RevisionPlan) -> date:
+    """Day 1 of a stored plan."""
+    return plan.plan_date or plan.generated_at.date()
 
-            remaining = topic_minutes[topic]["minutes_remaining"]
-            if remaining <= 0:
-                continue
 
-            session_mins = min(remaining, MAX_MINUTES_PER_SESSION, DAILY_MINUTES - minutes_today)
-            session_mins = max(session_mins, MIN_MINUTES_PER_SESSION)
+def generate_revision_plan(student_id: str, db: Session) -> RevisionPlanResponse:
+    """Generate a 7-day personalized revision plan."""
+    return _generate_plan(student_id, db)[0]
 
-            weakness = topic_minutes[topic]["weakness_score"]
-            objective = _get_objective(weakness, topic)
-            resources = retrieve_resources_sync(topic, top_k=3)
 
-            sessions.append(StudySession(
-                topic=topic,
-                duration_minutes=session_mins,
-                learning_objective=objective,
-                resources=[{"title": r.title, "url": r.url or "#", "type": r.resource_type} for r in resources],
-                weakness_score=round(weakness, 3),
-            ))
-            topic_minutes[topic]["minutes_remaining"] -= session_mins
-            minutes_today += session_mins
-
-        if not sessions:
-            # Recycle weakest topics on empty days
-            for topic in topics_queue[:MAX_TOPICS_PER_DAY]:
-                weakness = topic_minutes[topic]["weakness_score"]
-                resources = retrieve_resources_sync(topic, top_k=2)
-                sessions.append(StudySession(
-                    topic=topic,
-                    duration_minutes=MIN_MINUTES_PER_SESSION,
-                    learning_objective=f"Review session: {topic}",
-                    resources=[{"title": r.title, "url": r.url or "#", "type": r.resource_type} for r in resources],
-                    weakness_score=round(weakness, 3),
-                ))
-                minutes_today += MIN_MINUTES_PER_SESSION
+def _generate_plan(student_id: str, db: Session) -> Tuple[RevisionPlanResponse, str]:
+    """Build and persist a new plan; returns it with its ETag."""
+    weighted_topics = get_weighted_topics(student_id, db)
 
-        day_date = today + timedelta(days=day_num - 1)
-        days.append(DayPlan(
-            day=day_num,
-            date=day_date.isoformat(),
-            sessions=sessions,
-            total_minutes=minutes_today,
-        ))
+    if not weighted_topics:
+        # No data yet — return a balanced fallback plan
+        return _fallback_plan(student_id), plan_etag(None)
+
+    today = plan_today()
+    days = build_plan_days(weighted_topics, today, {})
 
     # Persist plan
     existing_plan = db.query(RevisionPlan).filter(
@@ -134,25 +98,103 @@ def generate_revision_plan(student_id: str, db: Session) -> RevisionPlanResponse
         student_id=student_id,
         plan_data=json.dumps([d.model_dump() for d in days]),
         is_active=True,
+        generated_at=datetime.utcnow(),
+        performance_version=get_performance_version(db, student_id),
+        plan_date=today,
     )
     db.add(new_plan)
+    db.flush()  # assigns the id for the ETag
+    result = _plan_response(student_id, days, new_plan.generated_at), plan_etag(new_plan)
     db.commit()
+    return result
 
+
+def _plan_response(student_id: str, days: List[DayPlan], generated_at: datetime) -> RevisionPlanResponse:
     total_topics = len(set(
         s.topic for day in days for s in day.sessions
     ))
-
     return RevisionPlanResponse(
         student_id=student_id,
         plan=days,
-        generated_at=datetime.utcnow().isoformat(),
+        generated_at=generated_at.isoformat(),
         total_topics_covered=total_topics,
     )
 
 
+def build_plan_days(
+    weighted_topics: List[Dict],
+    today: date,
+    resource_memo: Dict[str, List[Dict[str, str]]],
+) -> List[DayPlan]:
+    """
+    Lay weighted topics out over the 7 days. Pure apart from resource lookups,
+    which go through resource_memo (share it across plans to resolve each topic once).
+    """
+    total_minutes = TOTAL_DAYS * DAILY_MINUTES
+    weakness = {t["topic"]: t["weakness_score"] for t in weighted_topics}
+    allocate = get_allocator(settings.PLANNER_ALLOCATOR)
+    schedule = allocate(
+        [(t["topic"], total_minutes * t["weight"]) for t in weighted_topics],
+        TOTAL_DAYS, DAILY_MINUTES, MAX_TOPICS_PER_DAY,
+        MIN_MINUTES_PER_SESSION, MAX_MINUTES_PER_SESSION,
+    )
+
+    days: List[DayPlan] = []
+    for day_num, slots in enumerate(schedule, start=1):
+        sessions = [
+            StudySession(
+                topic=slot.topic,
+                duration_minutes=slot.minutes,
+                learning_objective=(
+                    f"Review session: {slot.topic}" if slot.review
+                    else _get_objective(weakness[slot.topic], slot.topic)
+                ),
+                resources=_resource_links(slot.topic, 2 if slot.review else 3, resource_memo),
+                weakness_score=round(weakness[slot.topic], 3),
+            )
+            for slot in slots
+        ]
+        day_date = today + timedelta(days=day_num - 1)
+        days.append(DayPlan(
+            day=day_num,
+            date=day_date.isoformat(),
+            sessions=sessions,
+            total_minutes=sum(slot.minutes for slot in slots),
+        ))
+
+    return days
+
+
+def plan_etag(plan: Optional[RevisionPlan]) -> str:
+    """Validator for a served plan: changes whenever a new plan is stored."""
+    if plan is None:
+        return f'"fallback-{plan_today().isoformat()}"'
+    return f'"{plan.id}-{plan.performance_version}"'
+
+
+def get_or_generate_plan(student_id: str, db: Session) -> Tuple[RevisionPlanResponse, str]:
+    """
+    Return the active plan if it is still current, regenerating only when the
+    student's performance version has moved or the plan does not start today.
+    """
+    plan = db.query(RevisionPlan).filter(
+        RevisionPlan.student_id == student_id,
+        RevisionPlan.is_active == True
+    ).first()
+    if (
+        plan is not None
+        and plan.performance_version is not None
+        and plan.performance_version == get_performance_version(db, student_id)
+        and _plan_start(plan) == plan_today()
+    ):
+        days = [DayPlan.model_validate(d) for d in json.loads(plan.plan_data)]
+        return _plan_response(student_id, days, plan.generated_at), plan_etag(plan)
+    return _generate_plan(student_id, db)
+
+
 def _fallback_plan(student_id: str) -> RevisionPlanResponse:
     """Fallback balanced plan when no performance data exists."""
-    today = datetime.utcnow().date()
+    today = plan_today()
     fallback_topics = ["Core Concepts Review", "Problem Solving", "Exam Strategy"]
     days = []
     for day_num in range(1, TOTAL_DAYS + 1):
@@ -0,0 +1,38 @@
+"""
+Question bank cache.
+Holds the answer-stripped question list of each test, pre-serialized to JSON
+bytes, so repeated GET /questions/{test_id} calls skip the ORM and Pydantic.
+Entries carry the content version they were built at (services.content_version);
+anything that writes questions must call catalog_service.notify_content_changed().
+"""
+from typing import Optional
+from config import settings
+from services.cache import LRUCache
+
+_cache = LRUCache(
+    max_size=settings.QUESTION_CACHE_SIZE,
+    ttl_seconds=settings.QUESTION_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_questions(test_id: int, version: int) -> Optional[bytes]:
+    entry = _cache.get(test_id)
+    if entry is None or entry[0] != version:
+        return None
+    return entry[1]
+
+
+def cache_questions(test_id: int, version: int, body: bytes) -> None:
+    _cache.set(test_id, (version, body))
+
+
+def invalidate_questions(test_id: Optional[int] = None) -> None:
+    """Drop one test's cached payload, or every test when test_id is None."""
+    if test_id is None:
+        _cache.clear()
+    else:
+        _cache.invalidate(test_id)
+
+
+def question_cache_stats() -> dict:
+    return _cache.stats()
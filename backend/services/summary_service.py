@@ -0,0 +1,224 @@
+"""
+Student summary service.
+Maintains the per-student analytics rollup (StudentSummary) so the dashboard
+never has to scan the full attempt history.
+"""
+import json
+from datetime import datetime
+from typing import Dict, List
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from database import dialect_insert
+from models import MockTest, StudentAttempt, StudentSummary
+
+RECENT_ATTEMPTS_LIMIT = 10
+
+
+def _recent_entry(attempt, test_name: str) -> Dict:
+    return {
+        "attempt_id": attempt.id,
+        "test_id": attempt.test_id,
+        "test_name": test_name,
+        "score": attempt.score,
+        "total": attempt.total,
+        "percentage": round((attempt.score / attempt.total) * 100, 2) if attempt.total else 0.0,
+        "created_at": attempt.created_at.isoformat(),
+    }
+
+
+def _test_names(db: Session, test_ids) -> Dict[int, str]:
+    if not test_ids:
+        return {}
+    rows = db.query(MockTest.id, MockTest.name).filter(MockTest.id.in_(test_ids)).all()
+    return {row.id: row.name for row in rows}
+
+
+def record_attempts(db: Session, attempts: List[StudentAttempt]) -> None:
+    """
+    Fold newly flushed attempts into their students' summaries.
+    Must run in the same transaction as the attempt inserts; the caller commits.
+    """
+    if not attempts:
+        return
+
+    by_student: Dict[str, List[StudentAttempt]] = {}
+    for a in attempts:
+        by_student.setdefault(a.student_id, []).append(a)
+
+    names = _test_names(db, {a.test_id for a in attempts})
+
+    # Create missing rows with ON CONFLICT DO NOTHING first, so concurrent first
+    # submissions for a student meet on the unique key instead of racing to
+    # INSERT; the rows then exist for FOR UPDATE to lock. A student with attempts
+    # from before summaries existed starts from the log, not from zero.
+    existing = {
+        row.student_id
+        for row in db.query(StudentSummary.student_id).filter(StudentSummary.student_id.in_(by_student.keys()))
+    }
+    new_ids = [a.id for a in attempts]
+    missing = [student_id for student_id in by_student if student_id not in existing]
+    if missing:
+        insert = dialect_insert(db)
+        db.execute(
+            insert(StudentSummary).on_conflict_do_nothing(index_elements=[StudentSummary.student_id]),
+            [_seed_row(db, student_id, new_ids) for student_id in missing],
+        )
+    summaries = {
+        s.student_id: s
+        for s in (
+            db.query(StudentSummary)
+            .filter(StudentSummary.student_id.in_(by_student.keys()))
+            .with_for_update()
+            .all()
+        )
+    }
+
+    for student_id, student_attempts in by_student.items():
+        summary = summaries[student_id]
+        summary.attempt_count += len(student_attempts)
+        summary.performance_version = (summary.performance_version or 0) + 1
+        summary.total_correct += sum(a.score for a in student_attempts)
+        summary.total_questions += sum(a.total for a in student_attempts)
+
+        newest_first = [
+            _recent_entry(a, names.get(a.test_id, "Unknown"))
+            for a in reversed(student_attempts)
+        ]
+        summary.set_recent_attempts(
+            (newest_first + summary.get_recent_attempts())[:RECENT_ATTEMPTS_LIMIT]
+        )
+
+
+def _seed_row(db: Session, student_id: str, exclude_ids: List[int]) -> Dict:
+    """A new summary row holding the student's logged attempts, minus the ones being recorded."""
+    summary = _summary_from_log(db, student_id, exclude_ids)
+    return {
+        "student_id": student_id,
+        "attempt_count": summary["attempt_count"],
+        "total_correct": summary["total_correct"],
+        "total_questions": summary["total_questions"],
+        "recent_attempts": json.dumps(summary["recent_attempts"]),
+        "performance_version": 0,
+    }
+
+
+def _summary_from_log(db: Session, student_id: str, exclude_ids: List[int] = ()) -> Dict:
+    """Bounded fallback for students whose summary has not been built yet."""
+    logged = (StudentAttempt.student_id == student_id, StudentAttempt.id.notin_(exclude_ids))
+    count, correct, questions = (
+        db.query(
+            func.count(StudentAttempt.id),
+            func.coalesce(func.sum(StudentAttempt.score), 0),
+            func.coalesce(func.sum(StudentAttempt.total), 0),
+        )
+        .filter(*logged)
+        .one()
+    )
+    recent = []
+    if count:
+        rows = (
+            db.query(StudentAttempt, MockTest.name)
+            .outerjoin(MockTest, MockTest.id == StudentAttempt.test_id)
+            .filter(*logged)
+            .order_by(StudentAttempt.created_at.desc(), StudentAttempt.id.desc())
+            .limit(RECENT_ATTEMPTS_LIMIT)
+            .all()
+        )
+        recent = [_recent_entry(a, name or "Unknown") for a, name in rows]
+    return {
+        "attempt_count": count,
+        "total_correct": correct,
+        "total_questions": questions,
+        "recent_attempts": recent,
+    }
+
+
+def load_summary(db: Session, student_id: str) -> Dict:
+    """Return the student's rollup with one indexed lookup."""
+    summary = db.query(StudentSummary).filter(StudentSummary.student_id == student_id).first()
+    if summary is None:
+        return _summary_from_log(db, student_id)
+    return {
+        "attempt_count": summary.attempt_count,
+        "total_correct": summary.total_correct,
+        "total_questions": summary.total_questions,
+        "recent_attempts": summary.get_recent_attempts(),
+    }
+
+
+def get_performance_version(db: Session, student_id: str) -> int:
+    """Current performance version of a student (0 before any summary exists)."""
+    version = (
+        db.query(StudentSummary.performance_version)
+        .filter(StudentSummary.student_id == student_id)
+        .scalar()
+    )
+    return version or 0
+
+
+def rebuild_summaries(db: Session) -> int:
+    """
+    Recreate every StudentSummary from the raw attempt log.
+    Returns the number of summaries written; the caller commits.
+    """
+    totals = (
+        db.query(
+            StudentAttempt.student_id,
+            func.count(StudentAttempt.id),
+            func.sum(StudentAttempt.score),
+            func.sum(StudentAttempt.total),
+        )
+        .group_by(StudentAttempt.student_id)
+        .all()
+    )
+
+    rank = func.row_number().over(
+        partition_by=StudentAttempt.student_id,
+        order_by=(StudentAttempt.created_at.desc(), StudentAttempt.id.desc()),
+    ).label("rank")
+    ranked = db.query(StudentAttempt.id, rank).subquery()
+    recent_rows = (
+        db.query(StudentAttempt, MockTest.name)
+        .join(ranked, ranked.c.id == StudentAttempt.id)
+        .outerjoin(MockTest, MockTest.id == StudentAttempt.test_id)
+        .filter(ranked.c.rank <= RECENT_ATTEMPTS_LIMIT)
+        .order_by(StudentAttempt.student_id, ranked.c.rank)
+        .all()
+    )
+    recent: Dict[str, List[Dict]] = {}
+    for attempt, name in recent_rows:
+        recent.setdefault(attempt.student_id, []).append(_recent_entry(attempt, name or "Unknown"))
+
+    # Upsert rather than delete-and-reinsert, so a submission racing the rebuild
+    # cannot hit the unique key; versions keep moving forward so cached plans
+    # built before the rebuild go stale.
+    rows = [
+        {
+            "student_id": student_id,
+            "attempt_count": count,
+            "total_correct": correct or 0,
+            "total_questions": questions or 0,
+            "recent_attempts": json.dumps(recent.get(student_id, [])),
+            "performance_version": 1,
+        }
+        for student_id, count, correct, questions in totals
+    ]
+    db.query(StudentSummary).filter(
+        StudentSummary.student_id.notin_(db.query(StudentAttempt.student_id).distinct())
+    ).delete(synchronize_session=False)
+    if rows:
+        insert = dialect_insert(db)
+        stmt = insert(StudentSummary)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[StudentSummary.student_id],
+            set_={
+                "attempt_count": stmt.excluded.attempt_count,
+                "total_correct": stmt.excluded.total_correct,
+                "total_questions": stmt.excluded.total_questions,
+                "recent_attempts": stmt.excluded.recent_attempts,
+                "performance_version": func.coalesce(StudentSummary.performance_version, 0) + 1,
+                "updated_at": datetime.utcnow(),
+            },
+        )
+        db.execute(stmt, rows)
+    return len(rows)
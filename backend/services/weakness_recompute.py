@@ -0,0 +1,218 @@
+"""
+Bulk weakness recompute job.
+Rebuilds every TopicPerformance row from the raw attempt log: attempts are
+streamed in chunks, re-scored against compiled answer keys and aggregated per
+(student, topic) with NumPy group-bys. Students are split into key-range
+shards that run in a process pool; finished shards are checkpointed so an
+interrupted run resumes where it stopped.
+
+Run it while submissions are paused — each shard's rows are replaced wholesale.
+"""
+import json
+import os
+import time
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+
+from config import settings
+from models import StudentAttempt, StudentSummary, TopicPerformance
+from services.answer_key import get_answer_keys
+from services.batch_runner import BatchTotals, run_batch
+from services.performance_service import DECAY_EPOCH
+
+Bounds = Tuple[Optional[str], Optional[str]]  # half-open [lo, hi) on student_id; None = open
+_PAIR_SHIFT = 32
+
+
+def _in_shard(query, column, lo: Optional[str], hi: Optional[str]):
+    if lo is not None:
+        query = query.filter(column >= lo)
+    if hi is not None:
+        query = query.filter(column < hi)
+    return query
+
+
+def plan_shards(db, n_shards: int) -> List[Bounds]:
+    """Split the distinct student ids into contiguous, roughly equal key ranges."""
+    students = [
+        s for (s,) in db.query(StudentAttempt.student_id).distinct().order_by(StudentAttempt.student_id)
+    ]
+    n_shards = max(1, min(n_shards, len(students)))
+    cuts = [students[len(students) * i // n_shards] for i in range(1, n_shards)]
+    edges = [None] + sorted(set(cuts)) + [None]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _reduce(pairs: np.ndarray, sums: np.ndarray, last_seen: np.ndarray):
+    """Group-by on (student, topic) pair keys: sum the value columns, max the timestamps."""
+    uniq, inverse = np.unique(pairs, return_inverse=True)
+    reduced = np.stack([np.bincount(inverse, weights=col, minlength=len(uniq)) for col in sums])
+    latest = np.full(len(uniq), -np.inf)
+    np.maximum.at(latest, inverse, last_seen)
+    return uniq, reduced, latest
+
+
+def _aggregate_chunk(db, rows, students: Dict[str, int], topics: Dict[str, int]):
+    answer_keys = get_answer_keys(db, {r.test_id for r in rows})
+    student_idx, topic_idx, correct, total, seconds = [], [], [], [], []
+    for r in rows:
+        key = answer_keys.get(r.test_id)
+        if key is None:  # test deleted since the attempt was made
+            continue
+        s = students.setdefault(r.student_id, len(students))
+        at = (r.created_at - DECAY_EPOCH).total_seconds()
+        for topic, stats in key.score(json.loads(r.answers))["topic_breakdown"].items():
+            student_idx.append(s)
+            topic_idx.append(topics.setdefault(topic, len(topics)))
+            correct.append(stats["correct"])
+            total.append(stats["total"])
+            seconds.append(at)
+
+    if not student_idx:
+        return None
+    pairs = (np.asarray(student_idx, dtype=np.int64) << _PAIR_SHIFT) | np.asarray(topic_idx, dtype=np.int64)
+    correct = np.asarray(correct, dtype=np.float64)
+    total = np.asarray(total, dtype=np.float64)
+    seconds = np.asarray(seconds, dtype=np.float64)
+    weight = np.exp2(seconds / (settings.WEAKNESS_HALF_LIFE_DAYS * 86400))
+    return _reduce(pairs, np.stack([correct, total, correct * weight, total * weight]), seconds)
+
+
+def recompute_shard(task: Tuple[int, Optional[str], Optional[str], int]) -> Dict:
+    """Worker entry point: recompute and rewrite all TopicPerformance rows in one shard."""
+    shard_id, lo, hi, chunk_size = task
+    from database import SessionLocal
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        query = db.query(
+            StudentAttempt.student_id, StudentAttempt.test_id,
+            StudentAttempt.answers, StudentAttempt.created_at,
+        )
+        query = _in_shard(query, StudentAttempt.student_id, lo, hi).order_by(StudentAttempt.id)
+
+        students: Dict[str, int] = {}
+        topics: Dict[str, int] = {}
+        partials = []
+        attempts = 0
+        chunk = []
+        for row in query.yield_per(chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                partials.append(_aggregate_chunk(db, chunk, students, topics))
+                attempts += len(chunk)
+                chunk = []
+        if chunk:
+            partials.append(_aggregate_chunk(db, chunk, students, topics))
+            attempts += len(chunk)
+        partials = [p for p in partials if p is not None]
+
+        rows = []
+        if partials:
+            pairs, sums, latest = _reduce(
+                np.concatenate([p[0] for p in partials]),
+                np.concatenate([p[1] for p in partials], axis=1),
+                np.concatenate([p[2] for p in partials]),
+            )
+            student_names = list(students)
+            topic_names = list(topics)
+            mask = (1 << _PAIR_SHIFT) - 1
+            for pair, (c, t, dc, dt), last in zip(pairs.tolist(), sums.T.tolist(), latest.tolist()):
+                rows.append({
+                    "student_id": student_names[pair >> _PAIR_SHIFT],
+                    "topic": topic_names[pair & mask],
+                    "correct": int(c),
+                    "total_attempted": int(t),
+                    "decayed_correct": dc,
+                    "decayed_total": dt,
+                    "weakness_score": round(1.0 - dc / dt, 4) if dt > 0 else 0.0,
+                    "last_updated": DECAY_EPOCH + timedelta(seconds=last),
+                })
+
+        # Replace the shard's rows in one transaction (bulk delete + bulk insert)
+        _in_shard(db.query(TopicPerformance), TopicPerformance.student_id, lo, hi).delete(
+            synchronize_session=False
+        )
+        if rows:
+            db.execute(insert(TopicPerformance), rows)
+        # Weakness changed under any stored plans; mark them stale
+        _in_shard(db.query(StudentSummary), StudentSummary.student_id, lo, hi).update(
+            {StudentSummary.performance_version: StudentSummary.performance_version + 1},
+            synchronize_session=False,
+        )
+        db.commit()
+        return {
+            "shard": shard_id,
+            "attempts": attempts,
+            "rows": len(rows),
+            "seconds": round(time.perf_counter() - started, 2),
+        }
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _load_checkpoint(path: str) -> Optional[Dict]:
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: str, checkpoint: Dict) -> None:
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp, path)
+
+
+def recompute_weakness(
+    workers: int,
+    n_shards: int,
+    chunk_size: int,
+    checkpoint_path: str,
+    restart: bool = False,
+) -> Dict:
+    """Run (or resume) the recompute across a process pool; returns run totals."""
+    from database import SessionLocal
+
+    checkpoint = None if restart else _load_checkpoint(checkpoint_path)
+    if checkpoint is None:
+        db = SessionLocal()
+        try:
+            shards = plan_shards(db, n_shards)
+        finally:
+            db.close()
+        checkpoint = {"shards": shards, "done": []}
+        _save_checkpoint(checkpoint_path, checkpoint)
+    else:
+        print(f"↩️  Resuming: {len(checkpoint['done'])}/{len(checkpoint['shards'])} shards already done")
+
+    done = set(checkpoint["done"])
+    tasks = [
+        (i, lo, hi, chunk_size)
+        for i, (lo, hi) in enumerate(checkpoint["shards"])
+        if i not in done
+    ]
+    totals = BatchTotals("attempts", "rows")
+
+    def _record(result: Dict) -> None:
+        done.add(result["shard"])
+        checkpoint["done"] = sorted(done)
+        _save_checkpoint(checkpoint_path, checkpoint)
+        totals.add(result)
+        print(
+            f"  ✅ shard {result['shard']}: {result['attempts']} attempts → {result['rows']} rows "
+            f"({len(done)}/{len(checkpoint['shards'])} shards, "
+            f"{totals.rate('attempts'):,.0f} attempts/s)"
+        )
+
+    run_batch(recompute_shard, tasks, workers, _record)
+    os.remove(checkpoint_path)
+    return {"shards": len(tasks), **totals.summary()}
@@ -1,6 +1,7 @@
 """
 Weakness scorer service.
-Computes normalized weakness scores per topic for a student.
+Computes normalized weakness scores per topic for a student from the
+time-decayed scores kept on TopicPerformance.
 """
 from sqlalchemy.orm import Session
 from models import TopicPerformance
@@ -11,6 +12,8 @@ def compute_weakness_scores(student_id: str, db: Session) -> List[Dict]:
     """
     Compute and return weakness scores for all topics of a student.
     weakness_score: 0.0 = mastered, 1.0 = completely weak.
+    The stored score is already time-decayed (see services.performance_service),
+    so recent answers dominate and no attempt history is scanned here.
     
     Returns list of dicts sorted by weakness_score descending.
     """
@@ -20,6 +23,14 @@ def compute_weakness_scores(student_id: str, db: Session) -> List[Dict]:
         .all()
     )
 
+    return rank_topic_scores(topic_perfs)
+
+
+def rank_topic_scores(topic_perfs) -> List[Dict]:
+    """
+    Score dicts for already-loaded TopicPerformance rows (ORM objects or
+    rows with the same column names), weakest first.
+    """
     result = []
     for tp in topic_perfs:
         if tp.total_attempted == 0:
@@ -28,7 +39,7 @@ def compute_weakness_scores(student_id: str, db: Session) -> List[Dict]:
             "topic": tp.topic,
             "correct": tp.correct,
             "total_attempted": tp.total_attempted,
-            "accuracy": tp.accuracy,
+            "accuracy": round((tp.correct / tp.total_attempted) * 100, 2),
             "weakness_score": tp.weakness_score,
         })
 
@@ -43,7 +54,11 @@ def get_weighted_topics(student_id: str, db: Session) -> List[Dict]:
     Weight proportional to weakness_score (weak topics get more time).
     Topics not yet attempted get a default medium weight of 0.5.
     """
-    scores = compute_weakness_scores(student_id, db)
+    return weight_topic_scores(compute_weakness_scores(student_id, db))
+
+
+def weight_topic_scores(scores: List[Dict]) -> List[Dict]:
+    """Attach normalized planner weights to score dicts (in place); pure, no DB access."""
     if not scores:
         return []
 
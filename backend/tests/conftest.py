@@ -0,0 +1,80 @@
+"""
+Test setup: point the app at a throwaway SQLite file before anything imports
+config, and put the backend directory on sys.path like the scripts do.
+Run with: python -m pytest backend/tests
+"""
+import os
+import sys
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="learning-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp, 'test.db')}"
+os.environ["EMBEDDING_CACHE_PATH"] = ""
+os.environ["LOCAL_INDEX_DIR"] = os.path.join(_tmp, "resource_index")
+os.environ["DB_ASYNC"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from database import SessionLocal, init_db  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    init_db()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+class FakeChatModel:
+    """Stand-in chat model: answers after `delay` seconds, streaming word by word."""
+
+    def __init__(self, answer: str = "Practice one concept at a time.", delay: float = 0.0, fail_after=None):
+        self.answer = answer
+        self.delay = delay
+        self.fail_after = fail_after  # streamed chunks before the provider errors out
+        self.calls = 0
+        self.open_streams = 0  # astream generators not yet finished or closed
+
+    async def ainvoke(self, messages):
+        import asyncio
+        from langchain_core.messages import AIMessage
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return AIMessage(content=self.answer)
+
+    async def astream(self, messages):
+        import asyncio
+        from langchain_core.messages import AIMessageChunk
+        self.calls += 1
+        self.open_streams += 1
+        try:
+            words = self.answer.split(" ")
+            for i, word in enumerate(words):
+                if self.fail_after is not None and i >= self.fail_after:
+                    raise RuntimeError("provider connection reset")
+                await asyncio.sleep(self.delay / len(words))
+                yield AIMessageChunk(content=word if i == 0 else " " + word)
+        finally:
+            self.open_streams -= 1
+
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Install a FakeChatModel as the shared chat model (needs langchain_core for the messages)."""
+    pytest.importorskip("langchain_core")
+    from services import llm_registry
+    model = FakeChatModel()
+    monkeypatch.setattr(llm_registry._registry, "llm", model)
+    monkeypatch.setattr(llm_registry._registry, "model_name", "fake:chat")
+    monkeypatch.setattr(llm_registry._registry, "ready", True)
+    return model
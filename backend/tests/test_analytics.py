@@ -0,0 +1,93 @@
+"""
+GET /analytics/{student_id}/attempts: keyset pages walk the whole history
+newest first with no gaps or repeats, even when many attempts share one
+created_at or new ones arrive mid-walk, and a malformed cursor is a 400.
+"""
+import asyncio
+import base64
+import json
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from database import SessionLocal
+from main import app
+from models import StudentAttempt
+
+
+def _add_attempts(student_id: str, stamps) -> list:
+    """One attempt per created_at in stamps; returns their ids."""
+    db = SessionLocal()
+    try:
+        attempts = [
+            StudentAttempt(student_id=student_id, test_id=1, answers="{}", score=1, total=2, created_at=stamp)
+            for stamp in stamps
+        ]
+        db.add_all(attempts)
+        db.commit()
+        return [a.id for a in attempts]
+    finally:
+        db.close()
+
+
+def _get(url: str, **params) -> httpx.Response:
+    async def get():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.get(url, params=params)
+    return asyncio.run(get())
+
+
+def _walk(student_id: str, limit: int, between_pages=None) -> list:
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"after": cursor} if cursor else {})}
+        response = _get(f"/analytics/{student_id}/attempts", **params)
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page["items"]) <= limit
+        ids.extend(item["attempt_id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+        if between_pages:
+            between_pages()
+
+
+def test_pages_cover_identical_timestamps_without_gaps_or_repeats():
+    student, other = f"s-{uuid.uuid4().hex[:8]}", f"s-{uuid.uuid4().hex[:8]}"
+    base = datetime(2025, 3, 1, 9, 0, 0)
+    # Runs of identical created_at that straddle page boundaries, plus another student's rows in between
+    stamps = [base] * 7 + [base + timedelta(microseconds=1)] * 4 + [base - timedelta(days=1)] * 6 + [base + timedelta(hours=1)]
+    ids = _add_attempts(student, stamps)
+    _add_attempts(other, [base] * 5)
+
+    expected = [i for _, i in sorted(zip(stamps, ids), key=lambda pair: (pair[0], pair[1]), reverse=True)]
+    for limit in (1, 3, 5, len(ids), 100):
+        assert _walk(student, limit) == expected
+
+
+def test_attempts_added_mid_walk_do_not_shift_pages():
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    base = datetime(2025, 3, 1, 9, 0, 0)
+    ids = _add_attempts(student, [base] * 10)
+
+    def submit_newer():
+        _add_attempts(student, [datetime.utcnow()])
+
+    walked = _walk(student, 3, between_pages=submit_newer)
+    assert walked == sorted(ids, reverse=True)
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor",
+    base64.urlsafe_b64encode(b"plain text").decode(),
+    base64.urlsafe_b64encode(json.dumps({"created_at": "2025-03-01"}).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["yesterday", 5]).encode()).decode(),
+    base64.urlsafe_b64encode(json.dumps(["2025-03-01T09:00:00", "five"]).encode()).decode(),
+])
+def test_malformed_cursor_is_a_400(cursor):
+    response = _get("/analytics/anyone/attempts", after=cursor)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
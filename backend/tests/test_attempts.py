@@ -0,0 +1,125 @@
+"""
+/submit_attempt/batch: unknown tests fail per item without failing the
+batch, repeated attempts in one batch are all recorded and counted, and the
+items come back in submission order.
+"""
+import asyncio
+import uuid
+
+import httpx
+
+from database import SessionLocal
+from main import app
+from models import MockTest, Question, StudentAttempt, StudentSummary, TopicPerformance
+
+TOPICS = ["Algebra", "Algebra", "Geometry", "Geometry"]
+
+
+def _make_test() -> tuple:
+    """A four-question test (correct answer 0 throughout): (test id, question ids)."""
+    db = SessionLocal()
+    try:
+        test = MockTest(name=f"batch-{uuid.uuid4().hex[:6]}", subject_id=1, difficulty="easy")
+        db.add(test)
+        db.flush()
+        questions = []
+        for i, topic in enumerate(TOPICS):
+            q = Question(test_id=test.id, text=f"q{i}", correct_answer=0, topic=topic, order_num=i)
+            q.set_options(["a", "b", "c", "d"])
+            questions.append(q)
+        db.add_all(questions)
+        db.commit()
+        return test.id, [q.id for q in questions]
+    finally:
+        db.close()
+
+
+def _answers(question_ids, correct: int) -> dict:
+    """The first `correct` questions right, the rest wrong."""
+    return {str(qid): 0 if i < correct else 1 for i, qid in enumerate(question_ids)}
+
+
+def _submit_batch(attempts) -> dict:
+    async def post():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/submit_attempt/batch", json={"attempts": attempts})
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    return response.json()
+
+
+def _topics(student_id: str) -> dict:
+    db = SessionLocal()
+    try:
+        return {
+            r.topic: (r.correct, r.total_attempted)
+            for r in db.query(TopicPerformance).filter_by(student_id=student_id)
+        }
+    finally:
+        db.close()
+
+
+def test_unknown_test_fails_only_its_item():
+    test_id, question_ids = _make_test()
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    body = _submit_batch([
+        {"student_id": student, "test_id": test_id, "answers": _answers(question_ids, 4)},
+        {"student_id": student, "test_id": 10**9, "answers": {"1": 0}},
+        {"student_id": student, "test_id": test_id, "answers": _answers(question_ids, 2)},
+    ])
+
+    assert body["submitted"] == 3 and body["succeeded"] == 2
+    ok, missing, partial = body["items"]
+    assert missing == {"index": 1, "result": None, "error": "Test not found"}
+    assert ok["error"] is None and ok["result"]["score"] == 4
+    assert partial["error"] is None and partial["result"]["score"] == 2
+
+    db = SessionLocal()
+    try:
+        stored = db.query(StudentAttempt).filter_by(student_id=student).all()
+        assert sorted(a.id for a in stored) == sorted([ok["result"]["attempt_id"], partial["result"]["attempt_id"]])
+    finally:
+        db.close()
+    assert _topics(student) == {"Algebra": (4, 4), "Geometry": (2, 4)}
+
+
+def test_repeated_attempts_in_one_batch_are_all_counted():
+    test_id, question_ids = _make_test()
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    same = {"student_id": student, "test_id": test_id, "answers": _answers(question_ids, 1)}
+    body = _submit_batch([same, same, same])
+
+    assert body["succeeded"] == 3
+    attempt_ids = [item["result"]["attempt_id"] for item in body["items"]]
+    assert len(set(attempt_ids)) == 3
+    assert _topics(student) == {"Algebra": (3, 6), "Geometry": (0, 6)}
+
+    db = SessionLocal()
+    try:
+        assert db.query(StudentSummary).filter_by(student_id=student).one().attempt_count == 3
+    finally:
+        db.close()
+
+
+def test_items_follow_submission_order():
+    first_test, first_questions = _make_test()
+    second_test, second_questions = _make_test()
+    students = [f"s-{uuid.uuid4().hex[:8]}" for _ in range(3)]
+    attempts = []
+    expected = []
+    for n in range(12):
+        if n % 5 == 4:
+            attempts.append({"student_id": students[n % 3], "test_id": 10**9, "answers": {}})
+            expected.append(None)
+            continue
+        test_id, question_ids = (first_test, first_questions) if n % 2 else (second_test, second_questions)
+        correct = n % 5
+        attempts.append({"student_id": students[n % 3], "test_id": test_id, "answers": _answers(question_ids, correct)})
+        expected.append(correct)
+
+    body = _submit_batch(attempts)
+
+    assert [item["index"] for item in body["items"]] == list(range(len(attempts)))
+    assert [item["result"] and item["result"]["score"] for item in body["items"]] == expected
+    attempt_ids = [item["result"]["attempt_id"] for item in body["items"] if item["result"]]
+    assert attempt_ids == sorted(attempt_ids)  # stored in submission order too
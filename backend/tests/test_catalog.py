@@ -0,0 +1,30 @@
+"""GET /catalog: the ETag follows content written by other processes."""
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from config import settings
+from main import app
+from models import Domain
+from services.content_version import bump_content_version
+
+
+def test_etag_changes_after_another_process_writes(db, monkeypatch):
+    bump_content_version(db)
+    db.commit()
+    client = TestClient(app)
+    first = client.get("/catalog")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert client.get("/catalog", headers={"If-None-Match": etag}).status_code == 304
+
+    # Another process adds a domain and bumps the content version
+    db.add(Domain(name=f"d-{uuid.uuid4().hex[:6]}"))
+    db.execute(text("UPDATE content_version SET version = version + 1"))
+    db.commit()
+    monkeypatch.setattr(settings, "CONTENT_VERSION_CHECK_SECONDS", 0.0)
+
+    second = client.get("/catalog", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
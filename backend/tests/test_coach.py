@@ -0,0 +1,149 @@
+"""
+Coach endpoints against a fake chat model: no database connection is held
+while the model answers, and the SSE stream frames tokens, ends with `done`
+or `error`, and stores only complete answers.
+"""
+import asyncio
+import json
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import database
+from config import settings
+from main import app
+from routers.coach import stream_chat_with_coach
+from schemas import ChatRequest
+from services.conversation_service import load_memory
+
+
+def _client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+def _events(body: str):
+    """(event, data) pairs of an SSE body."""
+    events = []
+    for block in body.split("\n\n"):
+        if block:
+            event, data = block.split("\n")
+            assert event.startswith("event: ") and data.startswith("data: ")
+            events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def _stream(payload: dict):
+    async def post():
+        async with _client() as client:
+            return await client.post("/chat/stream", json=payload)
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    return _events(response.text)
+
+
+@asynccontextmanager
+async def _one_connection(mode: str, monkeypatch):
+    """Serve the app from a pool of a single connection, like the async SQLite pool."""
+    if mode == "sync":
+        engine = create_engine(
+            settings.DATABASE_URL, pool_size=1, max_overflow=0, pool_timeout=10,
+            connect_args={"check_same_thread": False},
+        )
+        monkeypatch.setattr(database, "SessionLocal", sessionmaker(autoflush=False, bind=engine))
+        try:
+            yield engine.pool
+        finally:
+            engine.dispose()
+        return
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    engine = create_async_engine(
+        database._async_url(settings.DATABASE_URL), pool_size=1, max_overflow=0, pool_timeout=10,
+    )
+    monkeypatch.setattr(settings, "DB_ASYNC", True)
+    monkeypatch.setattr(database, "AsyncSessionLocal", async_sessionmaker(engine, autoflush=False))
+    app.dependency_overrides[database.get_db] = database.get_async_db
+    try:
+        yield engine.pool
+    finally:
+        app.dependency_overrides.pop(database.get_db, None)
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("mode", ["sync", "async"])
+@pytest.mark.parametrize("path", ["/chat", "/chat/stream"])
+def test_db_requests_run_while_the_llm_answers(fake_llm, monkeypatch, mode, path):
+    fake_llm.delay = 1.0
+    student = f"s-{uuid.uuid4().hex[:8]}"  # also keeps the message out of the response cache
+
+    async def scenario():
+        async with _one_connection(mode, monkeypatch) as pool, _client() as client:
+            chat = asyncio.create_task(client.post(
+                path, json={"student_id": student, "message": f"explain limits {student}", "session_id": "chat"},
+            ))
+            await asyncio.sleep(0.3)  # the model is answering now
+            checked_out = pool.checkedout()
+            started = time.perf_counter()
+            analytics = await client.get(f"/analytics/{student}")
+            elapsed = time.perf_counter() - started
+            return await chat, analytics, elapsed, checked_out
+
+    chat, analytics, elapsed, checked_out = asyncio.run(scenario())
+    assert chat.status_code == 200 and analytics.status_code == 200
+    assert checked_out == 0
+    assert elapsed < 0.5
+
+
+def test_stream_sends_tokens_then_done(fake_llm, db):
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    message = f"what is a derivative {student}"
+
+    events = _stream({"student_id": student, "message": message, "session_id": "chat"})
+
+    assert [e for e, _ in events] == ["token"] * len(fake_llm.answer.split(" ")) + ["done"]
+    assert "".join(data["token"] for _, data in events[:-1]) == fake_llm.answer
+    assert events[-1][1] == {"student_id": student, "session_id": "chat"}
+    memory = load_memory(db, student, "chat")
+    assert [(m.role, m.content) for m in memory.recent] == [("user", message), ("assistant", fake_llm.answer)]
+
+
+def test_provider_failure_mid_stream_sends_error_and_stores_nothing(fake_llm, db):
+    fake_llm.fail_after = 2
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    message = f"what is an integral {student}"
+
+    events = _stream({"student_id": student, "message": message, "session_id": "chat"})
+
+    assert [e for e, _ in events] == ["token", "token", "error"]
+    assert "provider connection reset" in events[-1][1]["detail"]
+    assert load_memory(db, student, "chat").recent == []
+    # Not in the response cache either: the same first turn goes to the model again
+    _stream({"student_id": student, "message": message})
+    assert fake_llm.calls == 2
+
+
+def test_client_disconnect_closes_the_model_stream(fake_llm, db):
+    fake_llm.delay = 1.0
+    student = f"s-{uuid.uuid4().hex[:8]}"
+
+    class _Request:
+        """Connection that drops after the first event."""
+        async def is_disconnected(self):
+            return True
+
+    async def scenario():
+        payload = ChatRequest(student_id=student, message=f"what is a limit {student}", session_id="chat")
+        response = await stream_chat_with_coach(payload, _Request())
+        return [chunk async for chunk in response.body_iterator]
+
+    sent = asyncio.run(scenario())
+
+    assert [e for e, _ in _events("".join(sent))] == ["token"]
+    assert fake_llm.open_streams == 0
+    assert load_memory(db, student, "chat").recent == []
@@ -0,0 +1,92 @@
+"""
+Coach response cache through /chat: a personalized answer is never served to
+another student asking the same question (exact or near-duplicate), and the
+student's next submission retires it.
+"""
+import asyncio
+import uuid
+
+import httpx
+import pytest
+
+from database import SessionLocal
+from main import app
+from models import MockTest, Question, StudentSummary, TopicPerformance
+from services import coach_cache
+from services.coach_cache import CoachResponseCache
+
+
+@pytest.fixture(params=[False, True], ids=["exact", "semantic"])
+def response_cache(request, monkeypatch):
+    cache = CoachResponseCache(max_size=100, ttl_seconds=None, semantic=request.param, threshold=0.5, dim=1 << 12)
+    monkeypatch.setattr(coach_cache, "_cache", cache)
+    return cache
+
+
+def _student_with_data() -> str:
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    try:
+        db.add_all([
+            TopicPerformance(student_id=student, topic="Algebra", correct=1, total_attempted=4, weakness_score=0.75),
+            StudentSummary(student_id=student, attempt_count=1, performance_version=1),
+        ])
+        db.commit()
+    finally:
+        db.close()
+    return student
+
+
+def _ask(student_id: str, message: str) -> str:
+    async def post():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/chat", json={"student_id": student_id, "message": message})
+    response = asyncio.run(post())
+    assert response.status_code == 200
+    return response.json()["response"]
+
+
+def test_answer_is_not_shared_between_students(fake_llm, response_cache):
+    alice, bob = _student_with_data(), _student_with_data()
+
+    fake_llm.answer = "Alice should revise algebra."
+    assert _ask(alice, "How do I improve my weak topics?") == fake_llm.answer
+    assert _ask(alice, "how do I improve my weak topics") == "Alice should revise algebra."
+    assert fake_llm.calls == 1
+
+    fake_llm.answer = "Bob should revise algebra."
+    assert _ask(bob, "How do I improve my weak topics?") == "Bob should revise algebra."
+    assert _ask(bob, "How can I improve my weak topics?") == "Bob should revise algebra."
+    semantic = response_cache.semantic is not None  # only then is the near-duplicate a hit
+    assert fake_llm.calls == (2 if semantic else 3)
+
+
+def test_submission_retires_the_cached_answer(fake_llm, response_cache):
+    student = _student_with_data()
+    db = SessionLocal()
+    try:
+        test = MockTest(name=f"cache-{uuid.uuid4().hex[:6]}", subject_id=1, difficulty="easy")
+        db.add(test)
+        db.flush()
+        question = Question(test_id=test.id, text="2 + 2?", correct_answer=1, topic="Algebra", order_num=0)
+        question.set_options(["3", "4", "5", "6"])
+        db.add(question)
+        db.commit()
+        test_id, question_id = test.id, question.id
+    finally:
+        db.close()
+
+    message = "What should I study next?"
+    _ask(student, message)
+    _ask(student, message)
+    assert fake_llm.calls == 1
+
+    async def submit():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+            return await client.post("/submit_attempt", json={
+                "student_id": student, "test_id": test_id, "answers": {str(question_id): 0},
+            })
+    assert asyncio.run(submit()).status_code == 200
+
+    _ask(student, message)  # still weak in Algebra, so the rendered context reads the same
+    assert fake_llm.calls == 2
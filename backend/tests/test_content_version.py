@@ -0,0 +1,36 @@
+"""
+Content caches follow the database content version, so a question write made
+by another process (seed, admin tool) reaches this one without waiting for the TTL.
+"""
+import uuid
+
+from sqlalchemy import text
+
+from config import settings
+from models import MockTest, Question
+from services.answer_key import get_answer_key
+from services.catalog_service import notify_content_changed
+
+
+def _write_from_other_process(db, question_id: int, correct_answer: int) -> None:
+    # What another process's notify_content_changed() leaves behind: the row
+    # changed and the version moved, with this process's caches untouched
+    db.execute(text("UPDATE questions SET correct_answer = :a WHERE id = :id"), {"a": correct_answer, "id": question_id})
+    db.execute(text("UPDATE content_version SET version = version + 1"))
+    db.commit()
+
+
+def test_answer_key_picks_up_another_process_write(db, monkeypatch):
+    test = MockTest(name=f"cv-{uuid.uuid4().hex[:6]}", subject_id=1, difficulty="easy")
+    db.add(test)
+    db.flush()
+    question = Question(test_id=test.id, text="q", options='["a", "b"]', correct_answer=0, topic="T")
+    db.add(question)
+    notify_content_changed(db)
+    db.commit()
+
+    assert get_answer_key(db, test.id).score({str(question.id): 0})["score"] == 1
+
+    _write_from_other_process(db, question.id, 1)
+    monkeypatch.setattr(settings, "CONTENT_VERSION_CHECK_SECONDS", 0.0)
+    assert get_answer_key(db, test.id).score({str(question.id): 0})["score"] == 0
@@ -0,0 +1,76 @@
+"""
+Context cache versions come from the database: a write committed by any
+process (another worker, an offline job) makes the cached context stale,
+with no in-process invalidation call.
+"""
+import uuid
+
+import pytest
+
+from database import SessionLocal
+from models import RevisionPlan, StudentSummary, TopicPerformance
+from services import context_cache
+from services.agent_service import _cached_student_context
+from services.cache import LRUCache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(context_cache, "_cache", LRUCache(max_size=100))
+
+
+def _context(student_id: str) -> str:
+    db = SessionLocal()
+    try:
+        return _cached_student_context(db, student_id)[1]
+    finally:
+        db.close()
+
+
+def _write(fn) -> None:
+    """Commit a change from a session of its own, as another worker would."""
+    db = SessionLocal()
+    try:
+        fn(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _student() -> str:
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    _write(lambda db: db.add_all([
+        TopicPerformance(student_id=student, topic="Algebra", correct=1, total_attempted=4, weakness_score=0.75),
+        StudentSummary(student_id=student, attempt_count=1, performance_version=1),
+    ]))
+    return student
+
+
+def _set_weakness(student: str, score: float, bump: bool) -> None:
+    def change(db):
+        db.query(TopicPerformance).filter_by(student_id=student).update({"weakness_score": score})
+        if bump:
+            db.query(StudentSummary).filter_by(student_id=student).update(
+                {"performance_version": StudentSummary.performance_version + 1}
+            )
+    _write(change)
+
+
+def test_context_is_reused_until_the_performance_version_moves():
+    student = _student()
+    assert "Weak topics: Algebra" in _context(student)
+
+    _set_weakness(student, 0.1, bump=False)  # no version bump: still the cached render
+    assert "Weak topics: Algebra" in _context(student)
+
+    _set_weakness(student, 0.1, bump=True)
+    assert "Strong topics: Algebra" in _context(student)
+
+
+def test_a_new_active_plan_makes_the_context_stale():
+    student = _student()
+    assert "Today's plan" not in _context(student)
+
+    plan = '[{"day": 1, "sessions": [{"topic": "Algebra"}]}]'
+    _write(lambda db: db.add(RevisionPlan(student_id=student, plan_data=plan, is_active=True, performance_version=1)))
+    assert "Today's plan: Algebra" in _context(student)
@@ -0,0 +1,62 @@
+"""
+Conversation memory: concurrent exchanges on one session get distinct seqs,
+and turns waiting for the background fold stay in the prompt.
+"""
+import threading
+import uuid
+
+from database import SessionLocal
+from models import Conversation, ConversationTurn
+from services.conversation_service import (
+    _recent_messages, _store_summary, _turns_to_fold, append_exchange, load_memory,
+)
+
+
+def test_concurrent_exchanges_on_a_new_session(db):
+    student, session_id = f"s-{uuid.uuid4().hex[:8]}", "chat"
+    threads, per_thread = 8, 5
+    errors = []
+    start = threading.Barrier(threads)
+
+    def chat(n):
+        session = SessionLocal()
+        try:
+            start.wait()
+            for i in range(per_thread):
+                append_exchange(session, student, session_id, f"q{n}-{i}", f"a{n}-{i}")
+        except Exception as e:  # surfaced below
+            errors.append(e)
+        finally:
+            session.close()
+
+    workers = [threading.Thread(target=chat, args=(n,)) for n in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert errors == []
+    conversation = db.query(Conversation).filter_by(student_id=student, session_id=session_id).one()
+    assert conversation.turn_count == threads * per_thread * 2
+    turns = db.query(ConversationTurn).filter_by(conversation_id=conversation.id).order_by(ConversationTurn.seq).all()
+    assert [t.seq for t in turns] == list(range(threads * per_thread * 2))
+    for user, assistant in zip(turns[::2], turns[1::2]):  # each exchange kept its pair of seqs
+        assert (user.role, assistant.role) == ("user", "assistant")
+        assert assistant.content == "a" + user.content[1:]
+
+
+def test_unfolded_turns_stay_in_memory(db):
+    student, session_id = f"s-{uuid.uuid4().hex[:8]}", "chat"
+    exchanges = _recent_messages() // 2 + 3
+    for i in range(exchanges):
+        append_exchange(db, student, session_id, f"q{i}", f"a{i}")
+
+    memory = load_memory(db, student, session_id)
+    assert [m.content for m in memory.recent[::2]] == [f"q{i}" for i in range(exchanges)]
+
+    conversation_id, summary, through, fold_until, turns = _turns_to_fold(db, student, session_id)
+    _store_summary(db, conversation_id, through, fold_until, "Earlier the student asked: q0; q1; q2.")
+    memory = load_memory(db, student, session_id)
+    assert memory.summary.startswith("Earlier the student asked")
+    assert len(memory.recent) == _recent_messages()
+    assert memory.recent[0].content == f"q{fold_until // 2}"
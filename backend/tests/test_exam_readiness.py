@@ -0,0 +1,41 @@
+"""
+POST /exam-coach/analyze/bulk: bad score values are rejected with 422 before
+the NDJSON stream starts; valid uploads stream one report per student.
+"""
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from main import app
+
+HEADER = "student,subject,topic,accuracy,time_taken_avg,attempted\n"
+
+
+def _upload(rows: str):
+    return TestClient(app).post(
+        "/exam-coach/analyze/bulk",
+        data={"exam_type": "jee_main", "format": "csv"},
+        files={"file": ("scores.csv", HEADER + rows, "text/csv")},
+    )
+
+
+@pytest.mark.parametrize("row, message", [
+    ("b,Physics,Optics,abc,30,10", "must be numeric"),
+    ("b,Physics,Optics,,30,10", "'accuracy' is empty in row 2"),
+    ("b,Physics,Optics,140,30,10", "between 0 and 100"),
+    ("b,Physics,Optics,40,-3,10", "'time_taken_avg' must be at least 0"),
+    ("b,Physics,Optics,40,30,", "'attempted' is empty"),
+    (",Physics,Optics,40,30,10", "'student' is empty"),
+])
+def test_invalid_scores_are_rejected_before_streaming(row, message):
+    response = _upload(f"a,Physics,Optics,55,30,10\n{row}\n")
+    assert response.status_code == 422
+    assert message in response.json()["detail"]
+
+
+def test_valid_upload_streams_json_reports():
+    response = _upload("a,Physics,Optics,55,30,10\na,Chemistry,Bonding,80.5,20,12\nb,Physics,Optics,30,95,4\n")
+    assert response.status_code == 200
+    reports = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["student"] for r in reports] == ["a", "b"]
@@ -0,0 +1,83 @@
+"""
+LLMGate single-flight: cancelling the caller that started a shared call must
+not fail the callers that joined it; the call stops once nobody waits for it.
+"""
+import asyncio
+
+import pytest
+
+from services.llm_gate import LLMGate
+
+
+def _gate() -> LLMGate:
+    return LLMGate(max_concurrency=2, max_queue=4, max_per_student=0, retry_after=1)
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    async def scenario():
+        gate = _gate()
+        release = asyncio.Event()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "answer"
+
+        leader = asyncio.create_task(gate.run("k", None, call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(gate.run("k", None, call))
+        await asyncio.sleep(0)
+        leader.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await follower == "answer"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return gate, calls
+
+    gate, calls = asyncio.run(scenario())
+    assert calls == 1
+    assert gate.coalesced == 1
+    assert gate.active == 0 and gate.stats()["waiting"] == 0
+
+
+def test_call_is_cancelled_with_its_last_waiter():
+    async def scenario():
+        gate = _gate()
+        cancelled = asyncio.Event()
+
+        async def call():
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        waiters = [asyncio.create_task(gate.run("k", None, call)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        for w in waiters:
+            w.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        return gate
+
+    gate = asyncio.run(scenario())
+    assert gate.active == 0
+    assert gate._inflight == {} and gate._waiters == {}
+
+
+def test_errors_reach_every_waiter():
+    async def scenario():
+        gate = _gate()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("provider down")
+
+        return await asyncio.gather(*(gate.run("k", None, call) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert [type(r) for r in results] == [RuntimeError] * 3
@@ -0,0 +1,50 @@
+"""
+Local resource index builds: concurrent rebuilds into one directory each swap
+whole files in, so the result always loads and no temp files are left behind.
+"""
+import json
+import os
+import threading
+
+from services.local_index import LocalResourceIndex, build_index, is_index_current
+
+DIM = 1 << 12
+
+
+def _write_corpus(path, count):
+    with open(path, "w") as f:
+        for i in range(count):
+            f.write(json.dumps({"title": f"Resource {i}", "description": f"notes on topic {i % 7}", "tags": "algebra"}))
+            f.write("\n")
+
+
+def test_concurrent_builds_leave_a_loadable_index(tmp_path):
+    corpus = tmp_path / "resources.jsonl"
+    index_dir = tmp_path / "index"
+    _write_corpus(corpus, 300)
+    errors = []
+    start = threading.Barrier(6)
+
+    def build():
+        try:
+            start.wait()
+            build_index(str(corpus), str(index_dir), DIM)
+        except Exception as e:  # surfaced below
+            errors.append(e)
+
+    threads = [threading.Thread(target=build) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert sorted(os.listdir(index_dir)) == ["idf.npy", "meta.json", "offsets.npy", "vectors.npy"]
+    assert is_index_current(str(corpus), str(index_dir), DIM)
+    index = LocalResourceIndex(str(corpus), str(index_dir))
+    try:
+        assert len(index) == 300
+        row, _ = index.search("Resource 42", top_k=1)[0]
+        assert index.record(row)["title"] == "Resource 42"
+    finally:
+        index.close()
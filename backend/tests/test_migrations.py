@@ -0,0 +1,178 @@
+"""
+init_db on a database created before the newer columns existed: the columns
+are added in place and the decayed weakness figures are backfilled (inline
+only for small attempt logs, and never at the cost of starting up).
+"""
+import json
+from datetime import datetime
+
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+import database
+from config import settings
+from database import Base, create_db_engine, init_db
+from models import MockTest, Question, RevisionPlan, StudentAttempt, TopicPerformance
+from schemas import SubmitAttemptRequest
+from services.answer_key import invalidate_answer_keys
+from services.content_version import _probe
+
+# Columns added after the first release, dropped again to recreate an old database
+_NEWER_COLUMNS = [
+    ("topic_performance", "decayed_correct"),
+    ("topic_performance", "decayed_total"),
+    ("revision_plans", "performance_version"),
+    ("revision_plans", "plan_date"),
+]
+
+
+def _reset_content_caches():
+    invalidate_answer_keys()
+    _probe.reset()
+
+
+@pytest.fixture
+def baseline_db(tmp_path, monkeypatch):
+    """Point the database module at a fresh file holding the old schema."""
+    old_engine = create_db_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    Base.metadata.create_all(bind=old_engine)
+    with old_engine.begin() as conn:
+        for table, column in _NEWER_COLUMNS:
+            conn.execute(text(f"ALTER TABLE {table} DROP COLUMN {column}"))
+    monkeypatch.setattr(database, "engine", old_engine)
+    monkeypatch.setattr(database, "SessionLocal", sessionmaker(autoflush=False, bind=old_engine))
+    _reset_content_caches()
+    yield old_engine
+    _reset_content_caches()  # answer keys cached here would shadow the shared test database's
+    old_engine.dispose()
+
+
+def _seed_old_rows(engine):
+    db = sessionmaker(bind=engine)()
+    try:
+        test = MockTest(name="old", subject_id=1, difficulty="easy")
+        db.add(test)
+        db.flush()
+        questions = []
+        for i, topic in enumerate(["Algebra", "Algebra", "Geometry"]):
+            q = Question(test_id=test.id, text=f"q{i}", correct_answer=0, topic=topic, order_num=i)
+            q.set_options(["a", "b", "c", "d"])
+            questions.append(q)
+        db.add_all(questions)
+        db.flush()
+        answers = {str(questions[0].id): 0, str(questions[1].id): 1, str(questions[2].id): 0}
+        db.add(StudentAttempt(
+            student_id="old-student", test_id=test.id, answers=json.dumps(answers),
+            score=2, total=3, created_at=datetime.utcnow(),
+        ))
+        db.commit()
+        return test.id, answers
+    finally:
+        db.close()
+
+
+def _seed_old_topic_rows(engine):
+    with engine.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO topic_performance (student_id, topic, correct, total_attempted, weakness_score) "
+            "VALUES ('old-student', 'Algebra', 1, 2, 0.5), ('old-student', 'Geometry', 1, 1, 0.0)"
+        ))
+
+
+def _decayed_totals() -> dict:
+    db = database.SessionLocal()
+    try:
+        return {r.topic: r.decayed_total for r in db.query(TopicPerformance).filter_by(student_id="old-student")}
+    finally:
+        db.close()
+
+
+def test_init_db_adds_missing_columns_and_backfills(baseline_db):
+    test_id, answers = _seed_old_rows(baseline_db)
+    _seed_old_topic_rows(baseline_db)
+
+    init_db()
+
+    columns = {c["name"] for c in inspect(baseline_db).get_columns("topic_performance")}
+    assert {"decayed_correct", "decayed_total"} <= columns
+
+    db = database.SessionLocal()
+    try:
+        rows = {r.topic: r for r in db.query(TopicPerformance).filter_by(student_id="old-student")}
+        assert rows["Algebra"].correct == 1 and rows["Algebra"].total_attempted == 2
+        assert rows["Algebra"].decayed_total > 0
+        assert rows["Algebra"].decayed_correct == pytest.approx(rows["Algebra"].decayed_total / 2)
+
+        from routers.attempts import _submit_attempt
+        _submit_attempt(db, SubmitAttemptRequest(student_id="old-student", test_id=test_id, answers=answers))
+        db.expire_all()
+        algebra = db.query(TopicPerformance).filter_by(student_id="old-student", topic="Algebra").one()
+        assert algebra.total_attempted == 4
+    finally:
+        db.close()
+
+
+def test_large_attempt_log_is_left_to_the_batch_job(baseline_db, monkeypatch, capsys):
+    _seed_old_rows(baseline_db)
+    _seed_old_topic_rows(baseline_db)
+    monkeypatch.setattr(settings, "WEAKNESS_BACKFILL_MAX_ATTEMPTS", 0)
+
+    init_db()
+
+    assert "recompute_weakness.py" in capsys.readouterr().out
+    assert _decayed_totals() == {"Algebra": 0.0, "Geometry": 0.0}
+
+
+def test_failed_backfill_does_not_stop_startup(baseline_db, monkeypatch, capsys):
+    _seed_old_rows(baseline_db)
+    _seed_old_topic_rows(baseline_db)
+
+    def broken(task):
+        raise RuntimeError("disk I/O error")
+    monkeypatch.setattr("services.weakness_recompute.recompute_shard", broken)
+
+    init_db()
+
+    assert "Could not backfill decayed weakness (disk I/O error)" in capsys.readouterr().out
+    columns = {c["name"] for c in inspect(baseline_db).get_columns("topic_performance")}
+    assert {"decayed_correct", "decayed_total"} <= columns
+
+
+def test_no_backfill_without_attempts(baseline_db, monkeypatch):
+    def unexpected(task):
+        raise AssertionError("nothing to backfill")
+    monkeypatch.setattr("services.weakness_recompute.recompute_shard", unexpected)
+
+    init_db()
+
+
+def test_init_db_is_a_no_op_on_a_current_schema(baseline_db):
+    init_db()
+    assert database._ensure_columns() == set()
+
+
+def test_plans_stored_before_versioning_are_regenerated(baseline_db):
+    _seed_old_rows(baseline_db)
+    with baseline_db.begin() as conn:
+        conn.execute(text(
+            "INSERT INTO revision_plans (student_id, plan_data, generated_at, is_active) "
+            "VALUES ('old-student', '[]', :now, 1)"
+        ), {"now": datetime.utcnow()})
+
+    init_db()
+
+    from services.planner_service import get_or_generate_plan
+    db = database.SessionLocal()
+    try:
+        old_plan = db.query(RevisionPlan).filter_by(student_id="old-student").one()
+        assert old_plan.performance_version is None
+
+        response, etag = get_or_generate_plan("old-student", db)
+        assert response.plan  # rebuilt from the attempts, not the stored empty plan
+        active = db.query(RevisionPlan).filter_by(student_id="old-student", is_active=True).one()
+        assert active.id != old_plan.id
+        assert active.performance_version is not None
+        assert etag == f'"{active.id}-{active.performance_version}"'
+    finally:
+        db.close()
@@ -0,0 +1,99 @@
+"""
+apply_topic_deltas: concurrent submissions must not lose increments, and a
+submission costs a fixed number of statements however many topics it touches.
+"""
+import threading
+import uuid
+
+from sqlalchemy import event
+
+from database import SessionLocal, engine
+from models import MockTest, Question, TopicPerformance
+from schemas import SubmitAttemptRequest
+from services.performance_service import apply_topic_deltas
+
+
+def _count_statements():
+    statements = []
+
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", _before)
+
+
+def test_parallel_submissions_do_not_lose_updates(db):
+    student, topic = f"s-{uuid.uuid4().hex[:8]}", "Algebra"
+    threads, per_thread = 8, 25
+    errors = []
+    start = threading.Barrier(threads)
+
+    def submit():
+        session = SessionLocal()
+        try:
+            start.wait()
+            for _ in range(per_thread):
+                apply_topic_deltas(session, {(student, topic): {"correct": 1, "total": 2}})
+                session.commit()
+        except Exception as e:  # surfaced below; an assert here would be lost in the thread
+            errors.append(e)
+        finally:
+            session.close()
+
+    workers = [threading.Thread(target=submit) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert errors == []
+    row = db.query(TopicPerformance).filter_by(student_id=student, topic=topic).one()
+    assert row.correct == threads * per_thread
+    assert row.total_attempted == threads * per_thread * 2
+    assert row.weakness_score == 0.5
+
+
+def test_upsert_is_one_statement_per_submission(db):
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    for topics in (1, 40):
+        deltas = {(student, f"topic-{i}"): {"correct": 1, "total": 1} for i in range(topics)}
+        statements, stop = _count_statements()
+        try:
+            apply_topic_deltas(db, deltas)
+        finally:
+            stop()
+        assert len(statements) == 1
+    db.commit()
+    assert db.query(TopicPerformance).filter_by(student_id=student).count() == 40
+
+
+def _make_test(db, topics: int) -> MockTest:
+    test = MockTest(name=f"bench-{uuid.uuid4().hex[:6]}", subject_id=1, difficulty="easy")
+    db.add(test)
+    db.flush()
+    for i in range(topics * 2):
+        q = Question(test_id=test.id, text=f"q{i}", correct_answer=0, topic=f"T{i % topics}", order_num=i)
+        q.set_options(["a", "b", "c", "d"])
+        db.add(q)
+    db.commit()
+    return test
+
+
+def test_submission_query_count_does_not_grow_with_topics(db):
+    from routers.attempts import _submit_attempt
+
+    counts = {}
+    for topics in (1, 25):
+        test = _make_test(db, topics)
+        answers = {str(q.id): 0 for q in test.questions}
+        payload = SubmitAttemptRequest(student_id=f"s-{uuid.uuid4().hex[:8]}", test_id=test.id, answers=answers)
+        _submit_attempt(db, payload)  # warms the compiled answer key
+        statements, stop = _count_statements()
+        try:
+            _submit_attempt(db, payload)
+        finally:
+            stop()
+        counts[topics] = len(statements)
+
+    assert counts[1] == counts[25]
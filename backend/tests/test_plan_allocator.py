@@ -0,0 +1,76 @@
+"""
+Plan allocators on random instances: the optimal engine keeps every planner
+constraint and never schedules less study time or fewer topics than a greedy
+layout within budget, including when many topics share equal, tiny targets.
+"""
+import random
+
+import pytest
+
+from services.plan_allocator import greedy_allocate, optimal_allocate
+
+PLANNER = dict(days=7, daily_minutes=120, max_topics_per_day=3, min_session=20, max_session=60)
+
+
+def _targets(weights, total_minutes):
+    total = sum(weights)
+    return [(f"topic-{i}", total_minutes * w / total) for i, w in enumerate(weights)]
+
+
+def _random_instance(rng: random.Random):
+    days = rng.choice([7, 7, 14, 30])
+    daily = rng.choice([60, 90, 120, 180])
+    limits = dict(
+        days=days, daily_minutes=daily, max_topics_per_day=rng.randint(1, 5),
+        min_session=20, max_session=60,
+    )
+    skew = rng.choice([0, 1, 3])
+    weights = [rng.random() ** skew for _ in range(rng.randint(1, 150))]
+    return _targets(weights, days * daily), limits
+
+
+def _minutes(schedule):
+    return sum(s.minutes for day in schedule for s in day)
+
+
+def _covered(schedule):
+    return len({s.topic for day in schedule for s in day})
+
+
+def _assert_constraints(schedule, days, daily_minutes, max_topics_per_day, min_session, max_session):
+    assert len(schedule) == days
+    for day in schedule:
+        assert sum(s.minutes for s in day) <= daily_minutes
+        assert len(day) <= max_topics_per_day
+        assert len({s.topic for s in day}) == len(day)
+        assert all(min_session <= s.minutes <= max_session for s in day)
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_optimal_keeps_constraints_and_matches_greedy_coverage(seed):
+    targets, limits = _random_instance(random.Random(seed))
+    schedule = optimal_allocate(targets, **limits)
+    greedy = greedy_allocate(targets, **limits)
+
+    _assert_constraints(schedule, **limits)
+    # Greedy overruns a day when min_session does not fit; only compare to valid layouts
+    if all(sum(s.minutes for s in day) <= limits["daily_minutes"] for day in greedy):
+        assert _minutes(schedule) >= _minutes(greedy)
+        assert _covered(schedule) >= _covered(greedy)
+
+
+@pytest.mark.parametrize("topics", [21, 60, 100, 150, 500])
+def test_many_equal_weight_topics_fill_the_week(topics):
+    targets = _targets([1.0] * topics, PLANNER["days"] * PLANNER["daily_minutes"])
+    schedule = optimal_allocate(targets, **PLANNER)
+
+    _assert_constraints(schedule, **PLANNER)
+    assert _covered(schedule) == PLANNER["days"] * PLANNER["max_topics_per_day"]
+    assert all(sum(s.minutes for s in day) == PLANNER["daily_minutes"] for day in schedule)
+
+
+def test_heaviest_topics_are_seated_first():
+    weights = [5.0, 4.0, 3.0] + [0.1] * 100
+    schedule = optimal_allocate(_targets(weights, 840), **PLANNER)
+    covered = {s.topic for day in schedule for s in day}
+    assert {"topic-0", "topic-1", "topic-2"} <= covered
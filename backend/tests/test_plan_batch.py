@@ -0,0 +1,50 @@
+"""
+Nightly batch plans: built for the next plan day and served as current on
+that day, without being regenerated by the first read.
+"""
+import uuid
+from datetime import date
+
+from config import settings
+from models import RevisionPlan, TopicPerformance
+from services.plan_batch import generate_plans, next_plan_day
+from services.planner_service import get_or_generate_plan, plan_today
+
+
+def _student_with_topics(db) -> str:
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    db.add_all([
+        TopicPerformance(student_id=student, topic="Algebra", correct=1, total_attempted=4, weakness_score=0.75),
+        TopicPerformance(student_id=student, topic="Geometry", correct=3, total_attempted=4, weakness_score=0.25),
+    ])
+    db.commit()
+    return student
+
+
+def test_batch_plan_is_served_on_its_plan_day(db, monkeypatch):
+    student = _student_with_topics(db)
+    target = next_plan_day()
+    generate_plans(student_ids=[student])
+
+    stored = db.query(RevisionPlan).filter_by(student_id=student, is_active=True).one()
+    assert stored.plan_date == target
+
+    # The next morning: a new plan day, nothing submitted since the batch
+    monkeypatch.setattr(settings, "PLAN_DAY_UTC_OFFSET_MINUTES", 24 * 60)
+    assert plan_today() == target
+    response, etag = get_or_generate_plan(student, db)
+
+    assert etag == f'"{stored.id}-{stored.performance_version}"'
+    assert response.plan[0].date == target.isoformat()
+    assert db.query(RevisionPlan).filter_by(student_id=student).count() == 1
+
+
+def test_plan_for_another_day_is_rebuilt(db):
+    student = _student_with_topics(db)
+    generate_plans(student_ids=[student], plan_date=date(2020, 1, 6))
+    stored = db.query(RevisionPlan).filter_by(student_id=student, is_active=True).one()
+
+    response, etag = get_or_generate_plan(student, db)
+
+    assert response.plan[0].date == plan_today().isoformat()
+    assert etag != f'"{stored.id}-{stored.performance_version}"'
@@ -0,0 +1,88 @@
+"""
+StudentSummary rows are created with an upsert: parallel first submissions
+for a student all land in one row, and a rebuild keeps versions moving.
+"""
+import threading
+import uuid
+
+from database import SessionLocal
+from models import StudentAttempt, StudentSummary
+from services.summary_service import rebuild_summaries, record_attempts
+
+
+def _attempt(student_id: str) -> StudentAttempt:
+    return StudentAttempt(student_id=student_id, test_id=1, answers="{}", score=3, total=4)
+
+
+def test_parallel_first_submissions_share_one_summary(db):
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    threads = 8
+    errors = []
+    start = threading.Barrier(threads)
+
+    def submit():
+        session = SessionLocal()
+        try:
+            start.wait()
+            attempt = _attempt(student)
+            session.add(attempt)
+            session.flush()
+            record_attempts(session, [attempt])
+            session.commit()
+        except Exception as e:
+            errors.append(e)
+        finally:
+            session.close()
+
+    workers = [threading.Thread(target=submit) for _ in range(threads)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert errors == []
+    summary = db.query(StudentSummary).filter_by(student_id=student).one()
+    assert summary.attempt_count == threads
+    assert summary.total_correct == 3 * threads
+    assert summary.performance_version == threads
+    assert len(summary.get_recent_attempts()) == threads
+
+
+def test_rebuild_matches_log_and_bumps_version(db):
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    attempts = [_attempt(student) for _ in range(2)]
+    db.add_all(attempts)
+    db.flush()
+    record_attempts(db, attempts)
+    db.commit()
+
+    db.query(StudentSummary).filter_by(student_id=student).update({"attempt_count": 99})
+    rebuild_summaries(db)
+    db.commit()
+
+    summary = db.query(StudentSummary).filter_by(student_id=student).one()
+    assert summary.attempt_count == 2
+    assert summary.performance_version == 2
+    assert [r["attempt_id"] for r in summary.get_recent_attempts()] == [a.id for a in reversed(attempts)]
+
+
+def test_first_submission_of_a_legacy_student_keeps_the_logged_attempts(db):
+    student = f"s-{uuid.uuid4().hex[:8]}"
+    legacy = [_attempt(student) for _ in range(5)]  # logged before summaries existed
+    db.add_all(legacy)
+    db.commit()
+
+    attempt = _attempt(student)
+    db.add(attempt)
+    db.flush()
+    record_attempts(db, [attempt])
+    db.commit()
+
+    summary = db.query(StudentSummary).filter_by(student_id=student).one()
+    assert summary.attempt_count == 6
+    assert summary.total_correct == 18
+    assert summary.total_questions == 24
+    assert summary.performance_version == 1
+    assert [r["attempt_id"] for r in summary.get_recent_attempts()] == [
+        a.id for a in reversed(legacy + [attempt])
+    ]
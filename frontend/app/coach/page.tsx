@@ -1,7 +1,7 @@
 'use client';
 
 import { useState, useRef, useEffect } from 'react';
-import { sendChat } from '@/lib/api';
+import { streamChat } from '@/lib/api';
 import type { ChatMessage } from '@/lib/types';
 
 const STUDENT_ID = process.env.NEXT_PUBLIC_STUDENT_ID || 'student_1';
@@ -14,6 +14,38 @@ const QUICK_PROMPTS = [
   "Give me a motivational message",
 ];
 
+const SESSION_KEY = 'learnflow-coach-session';
+
+// crypto.randomUUID only exists in secure contexts (HTTPS or localhost)
+function newSessionId(): string {
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID();
+  }
+  const bytes = new Uint8Array(16);
+  if (typeof crypto !== 'undefined' && typeof crypto.getRandomValues === 'function') {
+    crypto.getRandomValues(bytes);
+  } else {
+    for (let i = 0; i < bytes.length; i++) bytes[i] = Math.floor(Math.random() * 256);
+  }
+  bytes[6] = (bytes[6] & 0x0f) | 0x40; // version 4
+  bytes[8] = (bytes[8] & 0x3f) | 0x80; // RFC 4122 variant
+  const hex = Array.from(bytes, (b) => b.toString(16).padStart(2, '0')).join('');
+  return `${hex.slice(0, 8)}-${hex.slice(8, 12)}-${hex.slice(12, 16)}-${hex.slice(16, 20)}-${hex.slice(20)}`;
+}
+
+// One coach session per tab, kept across reloads so the backend memory still applies
+function coachSessionId(): string {
+  try {
+    const saved = sessionStorage.getItem(SESSION_KEY);
+    if (saved) return saved;
+    const id = newSessionId();
+    sessionStorage.setItem(SESSION_KEY, id);
+    return id;
+  } catch {
+    return newSessionId(); // storage blocked (privacy mode, sandboxed iframe)
+  }
+}
+
 export default function CoachPage() {
   const [messages, setMessages] = useState<ChatMessage[]>([
     {
@@ -23,7 +55,11 @@ export default function CoachPage() {
   ]);
   const [input, setInput] = useState('');
   const [sending, setSending] = useState(false);
+  const [streaming, setStreaming] = useState(false);
   const bottomRef = useRef<HTMLDivElement>(null);
+  // The backend remembers the conversation per session, so only the new message is sent.
+  // Resolved on first send: sessionStorage is not available while prerendering.
+  const sessionIdRef = useRef<string | null>(null);
 
   useEffect(() => {
     bottomRef.current?.scrollIntoView({ behavior: 'smooth' });
@@ -37,14 +73,30 @@ export default function CoachPage() {
     const userMsg: ChatMessage = { role: 'user', content: message };
     setMessages((prev) => [...prev, userMsg]);
     setSending(true);
+    const sessionId = sessionIdRef.current ?? coachSessionId();
+    sessionIdRef.current = sessionId;
 
     try {
-      const res = await sendChat({
-        student_id: STUDENT_ID,
-        message,
-        history: messages.filter((m) => m.role !== 'assistant' || messages.indexOf(m) > 0),
-      });
-      setMessages((prev) => [...prev, { role: 'assistant', content: res.response }]);
+      let started = false;
+      await streamChat(
+        {
+          student_id: STUDENT_ID,
+          message,
+          session_id: sessionId,
+        },
+        (token) => {
+          if (!started) {
+            started = true;
+            setStreaming(true);
+            setMessages((prev) => [...prev, { role: 'assistant', content: token }]);
+            return;
+          }
+          setMessages((prev) => {
+            const last = prev[prev.length - 1];
+            return [...prev.slice(0, -1), { ...last, content: last.content + token }];
+          });
+        },
+      );
     } catch (_e) {
       setMessages((prev) => [...prev, {
         role: 'assistant',
@@ -52,6 +104,7 @@ export default function CoachPage() {
       }]);
     } finally {
       setSending(false);
+      setStreaming(false);
     }
   };
 
@@ -122,7 +175,7 @@ export default function CoachPage() {
           </div>
         ))}
 
-        {sending && (
+        {sending && !streaming && (
           <div className="flex gap-3 justify-start">
             <div
               className="w-8 h-8 rounded-xl flex items-center justify-center text-sm shrink-0"
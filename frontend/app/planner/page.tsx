@@ -1,7 +1,7 @@
 'use client';
 
 import { useEffect, useState } from 'react';
-import { generatePlan, getAnalytics } from '@/lib/api';
+import { getPlan, getAnalytics } from '@/lib/api';
 import type { RevisionPlan, DayPlan, StudySession } from '@/lib/types';
 
 const STUDENT_ID = process.env.NEXT_PUBLIC_STUDENT_ID || 'student_1';
@@ -95,7 +95,7 @@ export default function PlannerPage() {
   const handleGenerate = async () => {
     setGenerating(true);
     try {
-      const p = await generatePlan(STUDENT_ID);
+      const p = await getPlan(STUDENT_ID);
       setPlan(p);
       setSelectedDay(0);
     } catch (e) {
@@ -5,12 +5,14 @@ import type {
   Domain,
   Subject,
   MockTest,
+  Catalog,
   Question,
   SubmitAttemptRequest,
   AttemptResult,
   Analytics,
   RevisionPlan,
   ResourcesResponse,
+  ResourcesBatchResponse,
   ChatRequest,
   ChatResponse,
   LoginRequest,
@@ -50,6 +52,10 @@ export const getSubjects = (domainId: number) =>
 export const getTests = (subjectId: number) =>
   fetchAPI<MockTest[]>(`/tests/${subjectId}`);
 
+// ─── Catalog ─────────────────────────────────────────────
+// Whole domain → subject → test tree in a single request
+export const getCatalog = () => fetchAPI<Catalog>('/catalog');
+
 // ─── Questions ───────────────────────────────────────────
 export const getQuestions = (testId: number) =>
   fetchAPI<Question[]>(`/questions/${testId}`);
@@ -66,6 +72,9 @@ export const getAnalytics = (studentId: string) =>
   fetchAPI<Analytics>(`/analytics/${studentId}`);
 
 // ─── Planner ─────────────────────────────────────────────
+export const getPlan = (studentId: string) =>
+  fetchAPI<RevisionPlan>(`/generate_plan/${studentId}`);
+
 export const generatePlan = (studentId: string) =>
   fetchAPI<RevisionPlan>(`/generate_plan/${studentId}`, { method: 'POST' });
 
@@ -73,6 +82,12 @@ export const generatePlan = (studentId: string) =>
 export const getResources = (topic: string, topK = 5) =>
   fetchAPI<ResourcesResponse>(`/resources/${encodeURIComponent(topic)}?top_k=${topK}`);
 
+export const getResourcesBatch = (topics: string[], topK = 5) =>
+  fetchAPI<ResourcesBatchResponse>('/resources/batch', {
+    method: 'POST',
+    body: JSON.stringify({ topics, top_k: topK }),
+  });
+
 // ─── Chat ────────────────────────────────────────────────
 export const sendChat = (payload: ChatRequest) =>
   fetchAPI<ChatResponse>('/chat', {
@@ -80,6 +95,48 @@ export const sendChat = (payload: ChatRequest) =>
     body: JSON.stringify(payload),
   });
 
+/**
+ * Stream a coach answer over Server-Sent Events; onToken receives each text
+ * chunk as it arrives. Aborting `signal` stops the upstream LLM call too.
+ */
+export async function streamChat(
+  payload: ChatRequest,
+  onToken: (token: string) => void,
+  signal?: AbortSignal,
+): Promise<void> {
+  const res = await fetch(`${API_URL}/chat/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(payload),
+    signal,
+  });
+  if (!res.ok || !res.body) {
+    const error = await res.json().catch(() => ({ detail: 'Unknown error' }));
+    throw new Error(error.detail || `API error: ${res.status}`);
+  }
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) return;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const raw = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const event = raw.match(/^event: (.*)$/m)?.[1];
+      const data = raw.match(/^data: (.*)$/m)?.[1];
+      if (!data) continue;
+      const parsed = JSON.parse(data);
+      if (event === 'token') onToken(parsed.token);
+      else if (event === 'error') throw new Error(parsed.detail);
+      else if (event === 'done') return;
+    }
+  }
+}
+
 // ─── Auth ────────────────────────────────────────────────
 export const loginUser = (payload: LoginRequest) =>
   fetchAPI<AuthResponse>('/auth/login', {
@@ -99,8 +156,9 @@ export const getUserProfile = (studentId: number) =>
 // Re-export types for convenience
 export type {
   Domain, Subject, MockTest, Question,
+  Catalog, CatalogDomain, CatalogSubject, CatalogTest,
   SubmitAttemptRequest, AttemptResult, Analytics,
-  RevisionPlan, ResourcesResponse, ChatRequest, ChatResponse,
+  RevisionPlan, ResourcesResponse, ResourcesBatchResponse, ChatRequest, ChatResponse,
   TopicPerformance, DayPlan, StudySession, ResourceItem, ChatMessage,
   User, LoginRequest, SignupRequest, AuthResponse, ExamType,
 } from './types';
@@ -29,6 +29,35 @@ export interface MockTest {
   created_at: string;
 }
 
+export interface CatalogTest {
+  id: number;
+  name: string;
+  description: string | null;
+  difficulty: 'easy' | 'medium' | 'hard';
+  duration_minutes: number;
+  question_count: number;
+}
+
+export interface CatalogSubject {
+  id: number;
+  name: string;
+  description: string | null;
+  tests: CatalogTest[];
+}
+
+export interface CatalogDomain {
+  id: number;
+  name: string;
+  description: string | null;
+  icon: string | null;
+  subjects: CatalogSubject[];
+}
+
+export interface Catalog {
+  version: string;
+  domains: CatalogDomain[];
+}
+
 export interface Question {
   id: number;
   test_id: number;
@@ -118,6 +147,10 @@ export interface ResourcesResponse {
   resources: ResourceItem[];
 }
 
+export interface ResourcesBatchResponse {
+  resources: Record<string, ResourceItem[]>;
+}
+
 export interface ChatMessage {
   role: 'user' | 'assistant';
   content: string;
@@ -126,12 +159,14 @@ export interface ChatMessage {
 export interface ChatRequest {
   student_id: string;
   message: string;
-  history: ChatMessage[];
+  history?: ChatMessage[];  // ignored when session_id is set
+  session_id?: string;      // server keeps the conversation memory
 }
 
 export interface ChatResponse {
   response: string;
   student_id: string;
+  session_id?: string | null;
 }
 
 // ─── Auth ────────────────────────────────────────────────